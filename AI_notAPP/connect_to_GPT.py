@@ -1,8 +1,30 @@
+import json
+
+import openai
 from openai import OpenAI
 
+from MVP.outbound import call_timeout, outbound
+
+
+# Errors of the gateway (connection, timeout, 4xx/5xx) counted by the "llm" circuit breaker
+GATEWAY_ERRORS = (openai.APIError,)
+
+_client = None
+
 
+def get_client():
+    # One client per process: it keeps its HTTP connections open between calls.
+    # No client retries: each call is bounded by the "llm" timeout, callers retry
+    global _client
+    if _client is None:
+        _client = OpenAI(api_key="", base_url="https://api.gapgpt.app/v1", max_retries=0)
+    return _client
+
+
+# Raises DependencyUnavailable when the gateway fails: an unjudged comment is never accepted
+@outbound("llm", failures=GATEWAY_ERRORS)
 def comment_ban_GPT(request):
-    client = OpenAI(api_key="", base_url="https://api.gapgpt.app/v1")
+    client = get_client()
     response = client.chat.completions.create(
         model="gpt-4o",
         messages=[
@@ -11,6 +33,7 @@ def comment_ban_GPT(request):
                 "content": f"درصورتی عبارت نامناسب است تنها بگو: ban در غیر این صورت بگو noban {str(request)}",
             }
         ],
+        timeout=call_timeout("llm"),
     )
     finall_respone = response.choices[0].message.content
     if str(finall_respone) == "ban":
@@ -19,3 +42,39 @@ def comment_ban_GPT(request):
         return True
     else:
         return True
+
+
+@outbound("llm", failures=GATEWAY_ERRORS)
+def comment_ban_GPT_batch(comments):
+    """
+    Judges several comments with one call. Returns one boolean per comment,
+    True if it is acceptable. Raises ValueError if the answer cannot be matched
+    to the comments, and DependencyUnavailable if the gateway fails or its circuit
+    is open (the caller retries later).
+    """
+    numbered = "\n".join(
+        f"{number}. {json.dumps(str(comment), ensure_ascii=False)}"
+        for number, comment in enumerate(comments, start=1)
+    )
+    client = get_client()
+    response = client.chat.completions.create(
+        model="gpt-4o",
+        messages=[
+            {
+                "role": "user",
+                "content": (
+                    "برای هر عبارت شماره‌دار زیر، اگر نامناسب است ban و در غیر این صورت noban بگو. "
+                    "تنها یک آرایه JSON به همان ترتیب برگردان، مانند "
+                    '["noban", "ban"]\n' + numbered
+                ),
+            }
+        ],
+        timeout=call_timeout("llm"),
+    )
+    answer = response.choices[0].message.content.strip()
+    # Models sometimes wrap the array in a ```json block
+    answer = answer.removeprefix("```json").removeprefix("```").removesuffix("```")
+    verdicts = json.loads(answer)
+    if not isinstance(verdicts, list) or len(verdicts) != len(comments):
+        raise ValueError("Moderation answer does not match the comments")
+    return [str(verdict).strip().lower() != "ban" for verdict in verdicts]
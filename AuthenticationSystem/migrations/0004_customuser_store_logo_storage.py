@@ -0,0 +1,21 @@
+# Generated by Django 5.1.7 on 2026-10-17 01:10
+
+import AuthenticationSystem.models
+import Product.services.blob_storage
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AuthenticationSystem', '0003_customuser_industry_delete_store_industry'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='store_logo',
+            field=models.ImageField(blank=True, null=True, storage=Product.services.blob_storage.content_addressed_storage, upload_to='store_logos/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['jpg', 'png', 'jpeg']), AuthenticationSystem.models.validate_file_size]),
+        ),
+    ]
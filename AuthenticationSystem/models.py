@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import (
     BaseUserManager,
     PermissionsMixin,
@@ -10,8 +10,8 @@ import re
 from django.core.exceptions import ValidationError
 from django.core.validators import FileExtensionValidator
 from django.core.validators import RegexValidator
-import random, string
-from .services.sms_service import send_temporary_code
+from .tasks import send_temporary_code_sms
+from Product.services.blob_storage import content_addressed_storage
 
 
 # Custom manager for CustomUser model
@@ -137,10 +137,6 @@ class CustomUserManager(BaseUserManager):
         if self.model.objects.filter(username=username).exists():
             raise ValueError(f"The 'username' {username} is already taken.")
 
-        temporary_password = "".join(
-            random.choices(string.ascii_letters + string.digits, k=6)
-        )
-
         user = self.model(
             first_name=first_name,
             last_name=last_name,
@@ -151,9 +147,12 @@ class CustomUserManager(BaseUserManager):
             **extra_fields,
         )
 
-        user.set_password(temporary_password)
-        send_temporary_code(phone_number=phone_number, code=temporary_password)
-        user.save(using=self._db)
+        # The temporary password is made and sent by a worker (manage.py runworker),
+        # only if the user was saved; it never appears in the task arguments
+        user.set_unusable_password()
+        with transaction.atomic(using=self._db):
+            user.save(using=self._db)
+            send_temporary_code_sms.enqueue(user_id=user.pk)
         return user
 
 
@@ -196,6 +195,7 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     )
     store_logo = models.ImageField(
         upload_to="store_logos/",
+        storage=content_addressed_storage,  # Identical logos share one file
         validators=[
             FileExtensionValidator(allowed_extensions=["jpg", "png", "jpeg"]),
             validate_file_size,
@@ -1,14 +1,22 @@
 import kavenegar
 
+from MVP.outbound import outbound
 
+
+# Network errors count against Kavenegar and raise DependencyUnavailable (the SMS task
+# is retried); the client has no timeout, the "sms" dependency enforces one
+@outbound("sms", failures=(kavenegar.HTTPException,))
 def send_temporary_code(phone_number, code):
     api = kavenegar.KavenegarAPI("API_KEY")
 
     try:
         response = api.sms_send(
-            sender="YOUR_SENDER_NUMBER",
-            receptor=phone_number,
-            message=f"Your temporary password is: {code}",
+            {
+                "sender": "YOUR_SENDER_NUMBER",
+                "receptor": phone_number,
+                "message": f"Your temporary password is: {code}",
+            }
         )
-    except kavenegar.exceptions.KavenegarAPIException as e:
+    except kavenegar.APIException as e:
+        # Refused by Kavenegar (e.g. invalid number): sending again would not help
         print(f"Error: {e}")
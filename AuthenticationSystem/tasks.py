@@ -0,0 +1,28 @@
+import random
+import string
+
+from TaskQueue.queue import task
+
+from .services.sms_service import send_temporary_code
+
+
+def make_temporary_password():
+    return "".join(random.choices(string.ascii_letters + string.digits, k=6))
+
+
+@task(priority=10)  # Someone is waiting for this code
+def send_temporary_code_sms(user_id):
+    """
+    Gives the user a new temporary password and sends it by SMS. The password is
+    made here, so only its hash is ever stored, never the task arguments.
+    A retry sends a new password.
+    """
+    from .models import CustomUser  # The models module imports this one
+
+    user = CustomUser.objects.filter(pk=user_id).first()
+    if user is None:
+        return  # Deleted meanwhile
+    code = make_temporary_password()
+    user.set_password(code)
+    user.save(update_fields=["password"])
+    send_temporary_code(phone_number=user.phone_number, code=code)
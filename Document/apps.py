@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.core import checks
 
 
 class DocumentConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Document'
+
+    def ready(self):
+        from . import signals  # noqa: F401  Registers the cache invalidation receivers
+        from .services.comment_classifier import check_numpy
+
+        checks.register(check_numpy)
@@ -0,0 +1,78 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from Document.services import comment_classifier
+from Document.services.moderation import labeled_examples
+from Document.services.text_normalization import content_hash
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the local comment classifier: throughput, and the share of remote "
+        "moderation calls it avoids on the comments held out when it was trained."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20000, help="Comments evaluated.")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs (best kept).")
+        parser.add_argument("--batch-size", type=int, default=20, help="Comments per call.")
+
+    def handle(self, *args, **options):
+        classifier = comment_classifier.load_classifier()
+        if classifier is None:
+            raise CommandError(
+                "No classifier: install NumPy and run manage.py train_comment_classifier"
+            )
+        np = comment_classifier.np
+
+        trained_at = datetime.datetime.fromtimestamp(
+            classifier.trained_at, tz=datetime.timezone.utc
+        )
+
+        # Not the comments moderated since training: the remote model only judged
+        # those the classifier left undecided. The held-out split is unbiased.
+        examples = [
+            example
+            for example in labeled_examples()
+            if content_hash(example[0]) in classifier.holdout
+        ][: options["limit"]]
+        if not examples:
+            raise CommandError(
+                "No held-out comments to evaluate: run manage.py train_comment_classifier"
+            )
+        texts = [text for text, _, _ in examples]
+        rejected = np.array([rejected for _, rejected, _ in examples])
+
+        # Throughput, in moderation-sized batches as the worker calls it
+        batch_size = max(options["batch_size"], 1)
+        best = None
+        for _ in range(max(options["repeat"], 1)):
+            started = time.perf_counter()
+            decisions = []
+            for start in range(0, len(texts), batch_size):
+                decisions.extend(classifier.decide(texts[start : start + batch_size]))
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+
+        decided = np.array([decision is not None for decision in decisions])
+        approved = np.array([decision is True for decision in decisions])
+        agreed = (approved & ~rejected) | (decided & ~approved & rejected)
+
+        self.stdout.write(f"{len(texts)} held-out comments, batches of {batch_size}")
+        self.stdout.write(
+            f"Throughput: {len(texts) / best:,.0f} comments/s, "
+            f"{best / len(texts) * 1e6:.1f} us per comment"
+        )
+        self.stdout.write(
+            f"Remote calls avoided: {decided.mean():.1%} of the comments "
+            f"({approved.mean():.1%} approved, {(decided & ~approved).mean():.1%} rejected locally)"
+        )
+        self.stdout.write(
+            f"Agreement with the recorded verdicts: {agreed.sum() / max(decided.sum(), 1):.1%}"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Model trained {timezone.localtime(trained_at):%Y-%m-%d %H:%M}")
+        )
@@ -0,0 +1,99 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from Document.services import comment_classifier
+from Document.services.moderation import labeled_examples
+from Document.services.text_normalization import content_hash
+
+
+class Command(BaseCommand):
+    help = (
+        "Trains the local comment classifier (hashed n-grams, logistic regression) on the "
+        "verdicts of the remote model and of the admins, and chooses its confidence thresholds "
+        "on held-out comments."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--epochs", type=int, default=8)
+        parser.add_argument(
+            "--precision",
+            type=float,
+            default=0.99,
+            help="Share of local decisions that must agree with the recorded verdicts.",
+        )
+        parser.add_argument(
+            "--holdout",
+            type=float,
+            default=0.2,
+            help="Share of the examples kept out of training to choose the thresholds.",
+        )
+        parser.add_argument("--min-examples", type=int, default=200)
+        parser.add_argument("--output", help="Model file (default: COMMENT_CLASSIFIER_PATH).")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        if comment_classifier.np is None:
+            raise CommandError("NumPy is required: pip install numpy")
+        np = comment_classifier.np
+
+        examples = labeled_examples()
+        if len(examples) < options["min_examples"]:
+            raise CommandError(
+                f"{len(examples)} distinct moderated comments, at least "
+                f"{options['min_examples']} are needed"
+            )
+
+        random.Random(options["seed"]).shuffle(examples)
+        held = max(int(len(examples) * options["holdout"]), 1)
+        train_set, holdout_set = examples[held:], examples[:held]
+
+        started = time.perf_counter()
+        matrix = comment_classifier.FeatureMatrix.from_texts([text for text, _, _ in train_set])
+        weights = comment_classifier.train(
+            matrix,
+            [rejected for _, rejected, _ in train_set],
+            sample_weight=[weight for _, _, weight in train_set],
+            epochs=options["epochs"],
+            seed=options["seed"],
+        )
+        training_time = time.perf_counter() - started
+
+        # Thresholds from comments the model has not seen
+        probabilities = comment_classifier.sigmoid(
+            comment_classifier.FeatureMatrix.from_texts(
+                [text for text, _, _ in holdout_set]
+            ).scores(weights)
+        )
+        rejected = np.array([rejected for _, rejected, _ in holdout_set])
+        approve_below, reject_above = comment_classifier.choose_thresholds(
+            probabilities, rejected, precision=options["precision"]
+        )
+
+        approve = probabilities <= approve_below
+        reject = probabilities >= reject_above
+        decided = approve | reject
+        agreed = (approve & ~rejected) | (reject & rejected)
+        path = comment_classifier.save_model(
+            weights,
+            approve_below,
+            reject_above,
+            path=options["output"],
+            holdout=[content_hash(text) for text, _, _ in holdout_set],
+        )
+
+        self.stdout.write(
+            f"{len(train_set)} training / {len(holdout_set)} held-out comments, "
+            f"trained in {training_time:.1f}s"
+        )
+        self.stdout.write(
+            f"Thresholds: approve if P(reject) <= {approve_below:.3f}, "
+            f"reject if >= {reject_above:.3f}"
+        )
+        self.stdout.write(
+            f"Held-out: {decided.mean():.1%} decided locally "
+            f"({approve.mean():.1%} approved, {reject.mean():.1%} rejected), "
+            f"{agreed.sum() / max(decided.sum(), 1):.1%} agreeing with the recorded verdict"
+        )
+        self.stdout.write(self.style.SUCCESS(f"Model saved to {path}"))
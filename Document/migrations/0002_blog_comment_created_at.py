@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-17 00:38
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AuthenticationSystem', '0003_customuser_industry_delete_store_industry'),
+        ('Document', '0001_initial'),
+        ('Product', '0002_product_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['active', '-created_at', '-id'], name='blog_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['product', '-created_at', '-id'], name='blog_product_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['blog', '-created_at', '-id'], name='comment_blog_created_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-17 01:12
+
+import Product.services.media_paths
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Document', '0002_blog_comment_created_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='blog',
+            name='content_file',
+            field=models.FileField(upload_to=Product.services.media_paths.ShardedUploadTo('blog_content')),
+        ),
+    ]
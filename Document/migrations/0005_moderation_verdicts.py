@@ -0,0 +1,52 @@
+# Generated by Django 5.1.7 on 2026-10-17 01:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from Document.services.text_normalization import content_hash
+
+
+def hash_existing_comments(apps, schema_editor):
+    """
+    Fills content_hash for the comments written before it existed, in batches.
+    """
+    Comment = apps.get_model("Document", "Comment")
+    last_id = 0
+    while True:
+        comments = list(
+            Comment.objects.filter(id__gt=last_id).order_by("id").only("id", "content")[:1000]
+        )
+        if not comments:
+            break
+        for comment in comments:
+            comment.content_hash = content_hash(comment.content)
+        Comment.objects.bulk_update(comments, ["content_hash"])
+        last_id = comments[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AuthenticationSystem', '0004_customuser_store_logo_storage'),
+        ('Document', '0004_comment_moderation_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.CreateModel(
+            name='ModerationOverride',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('content', models.TextField()),
+                ('approved', models.BooleanField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='AuthenticationSystem.customuser')),
+            ],
+        ),
+        migrations.RunPython(hash_existing_comments, migrations.RunPython.noop),
+    ]
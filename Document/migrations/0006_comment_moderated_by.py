@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-17 01:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Document', '0005_moderation_verdicts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='moderated_by',
+            field=models.CharField(blank=True, choices=[('model', 'Model'), ('cache', 'Cache'), ('classifier', 'Classifier'), ('admin', 'Admin')], max_length=10),
+        ),
+    ]
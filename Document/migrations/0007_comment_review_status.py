@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-17 01:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Document', '0006_comment_moderated_by'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('review', 'Needs review')], default='pending', max_length=10),
+        ),
+    ]
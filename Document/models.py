@@ -1,5 +1,6 @@
 from django.db import models
 from Product.models import Product
+from Product.services.media_paths import ShardedUploadTo
 from AuthenticationSystem.models import CustomUser
 
 
@@ -10,12 +11,28 @@ class Blog(models.Model):
     product = models.ForeignKey(
         Product, on_delete=models.CASCADE, related_name="blogs"
     )  # Related product
-    content_file = models.FileField(upload_to="blog_content/")  # File for blog content
+    content_file = models.FileField(
+        upload_to=ShardedUploadTo("blog_content")
+    )  # File for blog content, in hashed subdirectories of blog_content/
     active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )  # Timestamp of when the blog was created
 
     def __str__(self):
         return f"{self.title} for {self.product.title}"
 
+    class Meta:
+        # Keyset pagination indexes: newest first within each listing
+        indexes = [
+            models.Index(
+                fields=["active", "-created_at", "-id"], name="blog_active_created_idx"
+            ),
+            models.Index(
+                fields=["product", "-created_at", "-id"], name="blog_product_created_idx"
+            ),
+        ]
+
 
 # Comment model to store comments on blog posts
 class Comment(models.Model):
@@ -26,10 +43,79 @@ class Comment(models.Model):
     blog = models.ForeignKey(
         Blog, on_delete=models.CASCADE, related_name="comments"
     )  # Related blog post
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )  # Timestamp of when the comment was written
+
+    # Comments are published once moderated in the background (Document/services/moderation.py)
+    PENDING = "pending"
+    APPROVED = "approved"
+    REJECTED = "rejected"
+    REVIEW = "review"  # The model could not judge it: an admin decides (ModerationOverride)
+    status = models.CharField(
+        max_length=10,
+        choices=[
+            (PENDING, "Pending"),
+            (APPROVED, "Approved"),
+            (REJECTED, "Rejected"),
+            (REVIEW, "Needs review"),
+        ],
+        default=PENDING,
+    )
+    moderated_at = models.DateTimeField(null=True, blank=True)
+
+    # Where the verdict came from; the local classifier learns from the others only
+    BY_MODEL = "model"  # Remote model (COMMENT_MODERATION_BACKEND)
+    BY_CACHE = "cache"  # Model verdict cached for the same content
+    BY_CLASSIFIER = "classifier"  # Local pre-filter (Document/services/comment_classifier.py)
+    BY_ADMIN = "admin"  # ModerationOverride
+    moderated_by = models.CharField(
+        max_length=10,
+        choices=[
+            (BY_MODEL, "Model"),
+            (BY_CACHE, "Cache"),
+            (BY_CLASSIFIER, "Classifier"),
+            (BY_ADMIN, "Admin"),
+        ],
+        blank=True,
+    )
+    content_hash = models.CharField(
+        max_length=64, blank=True, db_index=True
+    )  # Hash of the normalized content, set by the Comment signals
 
     def __str__(self):
         return f"Comment on {self.blog.title}"
 
+    class Meta:
+        indexes = [
+            # Keyset pagination index: newest published comments of a blog first
+            models.Index(
+                fields=["blog", "status", "-created_at", "-id"],
+                name="comment_blog_status_idx",
+            ),
+            # Moderation queue: only the pending rows are indexed
+            models.Index(
+                fields=["id"],
+                condition=models.Q(status="pending"),
+                name="comment_pending_idx",
+            ),
+        ]
+
+
+# Verdict set by an admin for one content (normalized, see
+# Document/services/text_normalization.py). It wins over the model and the verdict cache.
+class ModerationOverride(models.Model):
+    content_hash = models.CharField(max_length=64, unique=True)
+    content = models.TextField()  # Normalized text the verdict was given for
+    approved = models.BooleanField()
+    created_by = models.ForeignKey(
+        CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{'Approved' if self.approved else 'Rejected'}: {self.content[:50]}"
+
 
 class Card(models.Model):
     """
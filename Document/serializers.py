@@ -20,7 +20,9 @@ class BlogSerializerShow(serializers.ModelSerializer):
 class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment  # Fixed: Changed from Blog to Comment
-        fields = "__all__"  # Includes all fields from the Comment model
+        # Public fields only: the moderation fields (status, moderated_by,
+        # moderated_at, content_hash) stay internal
+        fields = ["id", "user", "content", "blog", "created_at"]
 
 
 class OrderCardSerializer(serializers.ModelSerializer):
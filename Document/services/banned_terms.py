@@ -0,0 +1,162 @@
+import os
+import threading
+from collections import deque
+
+from django.conf import settings
+
+from Document.services.text_normalization import normalize_text
+
+
+# A term ending with PREFIX_MARK also matches the longer words starting with it
+# ("spam*" matches "spammer"); the others match whole words only
+PREFIX_MARK = "*"
+
+COMMENT_CHARACTER = "#"
+
+
+def terms_path():
+    return getattr(
+        settings,
+        "BANNED_TERMS_PATH",
+        os.path.join(settings.BASE_DIR, "banned_terms.txt"),
+    )
+
+
+def _is_word_character(character):
+    return character.isalnum() or character == "_"
+
+
+class TermMatcher:
+    """
+    Aho–Corasick automaton over the normalized banned terms.
+
+    Building it costs O(total length of the terms); a scan reads each character of
+    the text once (plus the matches found), whatever the number of terms.
+    """
+
+    def __init__(self, terms):
+        # State 0 is the root; goto[state] maps a character to the next state
+        self.goto = [{}]
+        self.fail = [0]
+        # Term ending at a state as (term, length, whole_word), and the nearest state
+        # on the failure chain that ends a term (so a scan never walks empty states)
+        self.output = [None]
+        self.output_link = [0]
+
+        for term in terms:
+            self._add(term)
+        self._link()
+
+    def __len__(self):
+        return sum(1 for output in self.output if output is not None)
+
+    def _add(self, term):
+        whole_word = not term.endswith(PREFIX_MARK)
+        term = normalize_text(term.rstrip(PREFIX_MARK))
+        if not term:
+            return
+        state = 0
+        for character in term:
+            next_state = self.goto[state].get(character)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][character] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(None)
+                self.output_link.append(0)
+            state = next_state
+        if self.output[state] is None or not whole_word:
+            # The same term as a whole word and as a prefix: the prefix one wins
+            self.output[state] = (term, len(term), whole_word)
+
+    def _link(self):
+        # Breadth-first, so the failure state of a node is always computed first
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, child in self.goto[state].items():
+                queue.append(child)
+                if state:
+                    # Longest proper suffix of the child that is also a trie path
+                    # (the children of the root fail to the root)
+                    fallback = self.fail[state]
+                    while fallback and character not in self.goto[fallback]:
+                        fallback = self.fail[fallback]
+                    self.fail[child] = self.goto[fallback].get(character, 0)
+                link = self.fail[child]
+                self.output_link[child] = (
+                    link if self.output[link] is not None else self.output_link[link]
+                )
+
+    def find(self, text):
+        """
+        Returns the banned terms (normalized) found in the text, in order of first
+        appearance. A whole-word term only matches between non-word characters.
+        """
+        text = normalize_text(text)
+        found = []
+        goto, fail, output, output_link = self.goto, self.fail, self.output, self.output_link
+        state = 0
+        for end, character in enumerate(text, start=1):
+            while state and character not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(character, 0)
+
+            match = state if output[state] is not None else output_link[state]
+            while match:
+                term, length, whole_word = output[match]
+                start = end - length
+                if (start == 0 or not _is_word_character(text[start - 1])) and (
+                    not whole_word or end == len(text) or not _is_word_character(text[end])
+                ):
+                    if term not in found:
+                        found.append(term)
+                match = output_link[match]
+        return found
+
+
+def read_terms(path):
+    """
+    Reads a term list: UTF-8, one term per line, blank lines and '#' comments ignored.
+    """
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            term = line.split(COMMENT_CHARACTER, 1)[0].strip()
+            if term:
+                yield term
+
+
+_loaded = {}  # Path -> (modification time, TermMatcher)
+_load_lock = threading.Lock()
+
+_EMPTY = TermMatcher(())
+
+
+def load_matcher():
+    """
+    Returns the matcher of the term list, built once per process and rebuilt when the
+    file changes. Without a file, the matcher is empty and matches nothing.
+    """
+    path = terms_path()
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return _EMPTY
+    with _load_lock:
+        cached = _loaded.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = _loaded[path] = (mtime, TermMatcher(read_terms(path)))
+        return cached[1]
+
+
+def find_banned_terms(*texts):
+    """
+    Returns the banned terms found in any of the texts (empty texts are skipped).
+    """
+    matcher = load_matcher()
+    found = []
+    for text in texts:
+        if text:
+            found.extend(term for term in matcher.find(text) if term not in found)
+    return found
@@ -0,0 +1,245 @@
+import os
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from django.core import checks
+
+from Document.services.text_normalization import normalize_text
+
+try:
+    import numpy as np
+except ImportError:  # In requirements.txt; without it every comment goes to the remote model
+    np = None
+
+
+# Hashed feature space: word unigrams, word bigrams and character 3-grams of the
+# normalized text, each mapped to one of N_FEATURES weights by CRC32 (stable across
+# processes, unlike hash()). The extra last weight is the bias.
+N_FEATURES = 2**18
+FEATURES_VERSION = 1
+
+
+def check_numpy(app_configs, **kwargs):
+    """
+    System check: warns at startup when the classifier is enabled but NumPy is missing,
+    instead of silently sending every comment to the remote model.
+    """
+    if np is None and getattr(settings, "COMMENT_CLASSIFIER_ENABLED", True):
+        return [
+            checks.Warning(
+                "COMMENT_CLASSIFIER_ENABLED is set but NumPy is not installed: "
+                "the local pre-filter decides nothing.",
+                hint="pip install -r requirements.txt, or set COMMENT_CLASSIFIER_ENABLED = False.",
+                id="Document.W001",
+            )
+        ]
+    return []
+
+
+def classifier_path():
+    return getattr(
+        settings,
+        "COMMENT_CLASSIFIER_PATH",
+        os.path.join(settings.BASE_DIR, "comment_classifier.npz"),
+    )
+
+
+def text_features(text):
+    """
+    Returns the sorted distinct feature indices of a text (bias excluded).
+    """
+    words = normalize_text(text).split()
+    grams = set(words)
+    grams.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+    for word in words:
+        padded = f"<{word}>"
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return sorted({zlib.crc32(gram.encode("utf-8")) % N_FEATURES for gram in grams})
+
+
+class FeatureMatrix:
+    """
+    Sparse binary rows of several texts, flattened for vectorized scoring: the
+    features of row i are indices[offsets[i]:offsets[i + 1]], with values that give
+    every row the same norm (long comments do not get larger scores), plus the bias.
+    """
+
+    def __init__(self, rows):
+        rows = [np.append(np.asarray(row, dtype=np.int64), N_FEATURES) for row in rows]
+        lengths = np.array([len(row) for row in rows], dtype=np.int64)
+        self.size = len(rows)
+        self.indices = np.concatenate(rows)
+        self.offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        self.row_of = np.repeat(np.arange(self.size), lengths)
+        values = np.repeat(1.0 / np.sqrt(np.maximum(lengths - 1, 1)), lengths)
+        values[np.cumsum(lengths) - 1] = 1.0  # Bias
+        self.values = values
+
+    @classmethod
+    def from_texts(cls, texts):
+        return cls([text_features(text) for text in texts])
+
+    def scores(self, weights):
+        return np.add.reduceat(weights[self.indices] * self.values, self.offsets)
+
+    def subset(self, positions):
+        starts = self.offsets[positions]
+        ends = np.append(self.offsets, len(self.indices))[np.asarray(positions) + 1]
+        return FeatureMatrix(
+            [self.indices[start : end - 1] for start, end in zip(starts, ends)]
+        )
+
+
+def sigmoid(scores):
+    return 1.0 / (1.0 + np.exp(-np.clip(scores, -30, 30)))
+
+
+def train(
+    matrix,
+    rejected,
+    sample_weight=None,
+    epochs=8,
+    batch_size=256,
+    learning_rate=0.5,
+    l2=1e-6,
+    seed=0,
+):
+    """
+    Fits a logistic regression predicting P(rejected) with mini-batch AdaGrad.
+    Returns the weights (N_FEATURES + 1 floats).
+    """
+    rng = np.random.default_rng(seed)
+    labels = np.asarray(rejected, dtype=np.float64)
+    if sample_weight is None:
+        sample_weight = np.ones(matrix.size)
+    sample_weight = np.asarray(sample_weight, dtype=np.float64)
+    weights = np.zeros(N_FEATURES + 1)
+    squared = np.full(N_FEATURES + 1, 1e-8)
+
+    for _ in range(epochs):
+        order = rng.permutation(matrix.size)
+        for start in range(0, matrix.size, batch_size):
+            rows = order[start : start + batch_size]
+            batch = matrix.subset(rows)
+            errors = (sigmoid(batch.scores(weights)) - labels[rows]) * sample_weight[rows]
+            gradient = np.bincount(
+                batch.indices,
+                weights=errors[batch.row_of] * batch.values,
+                minlength=N_FEATURES + 1,
+            ) / len(rows)
+            gradient += l2 * weights
+            squared += gradient**2
+            weights -= learning_rate * gradient / np.sqrt(squared)
+    return weights
+
+
+def choose_thresholds(probabilities, rejected, precision=0.99, min_decided=20):
+    """
+    Returns (approve_below, reject_above): the widest probability ranges where the
+    local decision agrees with the recorded verdicts at least `precision` of the time,
+    measured on held-out comments. A side without such a range decides nothing.
+    """
+    probabilities = np.asarray(probabilities)
+    rejected = np.asarray(rejected, dtype=bool)
+    order = np.argsort(probabilities)
+    sorted_p, sorted_rejected = probabilities[order], rejected[order]
+    count = np.arange(1, len(sorted_p) + 1)
+
+    # Approve locally: the lowest probabilities, mostly approved comments
+    approved_share = np.cumsum(~sorted_rejected) / count
+    good = np.nonzero((approved_share >= precision) & (count >= min_decided))[0]
+    approve_below = float(sorted_p[good[-1]]) if len(good) else -1.0
+
+    # Reject locally: the highest probabilities, mostly rejected comments
+    rejected_share = np.cumsum(sorted_rejected[::-1]) / count
+    good = np.nonzero((rejected_share >= precision) & (count >= min_decided))[0]
+    reject_above = float(sorted_p[::-1][good[-1]]) if len(good) else 2.0
+
+    return approve_below, reject_above
+
+
+def save_model(weights, approve_below, reject_above, path=None, holdout=()):
+    """
+    holdout: content hashes of the comments kept out of training, for the benchmark.
+    """
+    path = path or classifier_path()
+    np.savez_compressed(
+        path,
+        weights=weights,
+        approve_below=approve_below,
+        reject_above=reject_above,
+        version=FEATURES_VERSION,
+        trained_at=time.time(),
+        holdout=np.array(list(holdout), dtype=str),
+    )
+    return path
+
+
+class Classifier:
+    def __init__(self, weights, approve_below, reject_above, trained_at=0.0, holdout=()):
+        self.weights = weights
+        self.approve_below = approve_below
+        self.reject_above = reject_above
+        self.trained_at = trained_at
+        self.holdout = frozenset(holdout)  # Content hashes never trained on
+
+    def probabilities(self, texts):
+        """
+        P(rejected) of each text.
+        """
+        return sigmoid(FeatureMatrix.from_texts(texts).scores(self.weights))
+
+    def decide(self, texts):
+        """
+        True (approve) / False (reject) for the confident texts, None for the others.
+        """
+        return [
+            True if p <= self.approve_below else False if p >= self.reject_above else None
+            for p in self.probabilities(texts)
+        ]
+
+
+_loaded = {}  # Path -> (modification time, Classifier)
+_load_lock = threading.Lock()
+
+
+def load_classifier():
+    """
+    Returns the trained classifier, loaded once per process and reloaded when the
+    file changes (retraining), or None if NumPy or the model file is missing.
+    """
+    if np is None or not getattr(settings, "COMMENT_CLASSIFIER_ENABLED", True):
+        return None
+    path = classifier_path()
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    with _load_lock:
+        cached = _loaded.get(path)
+        if cached is None or cached[0] != mtime:
+            with np.load(path) as data:
+                if int(data["version"]) != FEATURES_VERSION:
+                    return None
+                classifier = Classifier(
+                    data["weights"],
+                    float(data["approve_below"]),
+                    float(data["reject_above"]),
+                    float(data["trained_at"]),
+                    data["holdout"].tolist() if "holdout" in data.files else (),
+                )
+            cached = _loaded[path] = (mtime, classifier)
+        return cached[1]
+
+
+def prefilter(texts):
+    """
+    Local first stage of moderation: a verdict for each confident text, None for the
+    texts (or all of them, without a trained model) left to the remote model.
+    """
+    classifier = load_classifier()
+    if classifier is None or not texts:
+        return [None] * len(texts)
+    return classifier.decide(texts)
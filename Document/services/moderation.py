@@ -0,0 +1,297 @@
+import logging
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from AI_notAPP.connect_to_GPT import comment_ban_GPT_batch
+from Document.models import Comment, ModerationOverride
+from Document.services.comment_classifier import prefilter
+from Document.services.text_normalization import content_hash, normalize_text
+from Product.services.cache_service import BLOG_COMMENTS, invalidate
+from TaskQueue.models import Task
+from TaskQueue.queue import enqueue
+
+
+logger = logging.getLogger(__name__)
+
+# Cached model verdict (True = approved) of one normalized content
+VERDICT_KEY = "moderation_verdict_{digest}"
+
+# Weight of an admin verdict in the training of the local classifier
+ADMIN_WEIGHT = 3.0
+
+
+def batch_size():
+    # Comments judged by one model call
+    return getattr(settings, "COMMENT_MODERATION_BATCH_SIZE", 20)
+
+
+def moderation_delay():
+    # Seconds a moderation run waits after a new comment, so that the comments
+    # written meanwhile are judged by the same calls
+    return getattr(settings, "COMMENT_MODERATION_DELAY", 2)
+
+
+class GPTModerationBackend:
+    """
+    Judges comments with the LLM, one call per batch.
+    """
+
+    def judge(self, texts):
+        return comment_ban_GPT_batch(texts)
+
+
+class StubModerationBackend:
+    """
+    Local backend for tests and development: rejects the comments containing one of
+    COMMENT_MODERATION_STUB_BANNED (case insensitive), accepts the others.
+    """
+
+    def judge(self, texts):
+        banned = [
+            word.lower() for word in getattr(settings, "COMMENT_MODERATION_STUB_BANNED", ())
+        ]
+        return [not any(word in text.lower() for word in banned) for text in texts]
+
+
+def get_backend():
+    return import_string(
+        getattr(
+            settings,
+            "COMMENT_MODERATION_BACKEND",
+            "Document.services.moderation.GPTModerationBackend",
+        )
+    )()
+
+
+def request_moderation():
+    """
+    Makes sure a moderation run is queued, in the current transaction.
+    Pending comments are picked up by the next run, so one run serves a burst of comments.
+    """
+    from Document.tasks import moderate_comments
+
+    queued = Task.objects.filter(
+        name=moderate_comments.task_name, status=Task.QUEUED
+    ).exists()
+    if not queued:
+        enqueue(moderate_comments.task_name, priority=5, delay=moderation_delay())
+
+
+def apply_verdicts(comments, verdicts):
+    """
+    Publishes or rejects judged comments, one UPDATE per (outcome, source), and
+    invalidates the comment lists of their blogs (bulk updates do not send the
+    Comment signals). verdicts: one (approved, source) pair per comment; approved is
+    None for a comment the model could not judge, which is left to the admins.
+    Returns the (approved, rejected) counts.
+    """
+    now = timezone.now()
+    groups = defaultdict(list)
+    for comment, verdict in zip(comments, verdicts):
+        groups[verdict].append(comment.id)
+    with transaction.atomic():
+        # status=PENDING: a comment judged twice (two runs at once) is only applied once
+        pending = Comment.objects.filter(status=Comment.PENDING)
+        for (ok, source), ids in groups.items():
+            pending.filter(id__in=ids).update(
+                status=Comment.REVIEW
+                if ok is None
+                else Comment.APPROVED if ok else Comment.REJECTED,
+                moderated_at=now,
+                moderated_by=source,
+            )
+    invalidate(*[(BLOG_COMMENTS, blog_id) for blog_id in {c.blog_id for c in comments}])
+    approved = sum(len(ids) for (ok, _), ids in groups.items() if ok)
+    rejected = sum(len(ids) for (ok, _), ids in groups.items() if ok is False)
+    return approved, rejected
+
+
+def verdict_cache_timeout():
+    # Seconds a model verdict is reused for the same normalized content
+    return getattr(settings, "COMMENT_VERDICT_CACHE_TIMEOUT", 60 * 60 * 24 * 7)
+
+
+def verdict_key(digest):
+    return VERDICT_KEY.format(digest=digest)
+
+
+def known_verdicts(digests):
+    """
+    Returns {content hash: (approved, source)} for the hashes with an admin override
+    or a cached model verdict (one query and one cache round trip); overrides win.
+    """
+    digests = set(digests)
+    verdicts = {
+        digest: (approved, Comment.BY_ADMIN)
+        for digest, approved in ModerationOverride.objects.filter(
+            content_hash__in=digests
+        ).values_list("content_hash", "approved")
+    }
+    missing = digests - set(verdicts)
+    if missing:
+        cached = cache.get_many([verdict_key(digest) for digest in missing])
+        for digest in missing:
+            if verdict_key(digest) in cached:
+                verdicts[digest] = (cached[verdict_key(digest)], Comment.BY_CACHE)
+    return verdicts
+
+
+class OutOfTime(Exception):
+    """
+    Raised instead of calling the backend past the deadline of a moderation run.
+    """
+
+
+def judge_texts(backend, texts, deadline=None):
+    """
+    Returns one verdict per text from the backend: True / False, or None for a text
+    it cannot judge. An answer that does not match the texts (ValueError, e.g. for a
+    comment injecting instructions into the prompt) is asked again for each half of
+    the batch, down to single texts, so one such comment does not block the others.
+    Raises OutOfTime instead of starting a call after `deadline` (time.monotonic()).
+    """
+    if deadline is not None and time.monotonic() >= deadline:
+        raise OutOfTime
+    try:
+        verdicts = list(backend.judge(texts))
+        if len(verdicts) != len(texts):
+            raise ValueError("Moderation answer does not match the comments")
+        return verdicts
+    except ValueError as e:
+        if len(texts) == 1:
+            logger.warning("The moderation model cannot judge a comment: %r", e)
+            return [None]
+    middle = len(texts) // 2
+    return judge_texts(backend, texts[:middle], deadline) + judge_texts(
+        backend, texts[middle:], deadline
+    )
+
+
+def judge_comments(comments, backend, deadline=None):
+    """
+    Returns one (approved, source) verdict per comment. Known contents are answered
+    without the backend, the local classifier decides the confident new ones, and each
+    distinct remaining content is sent to the backend once, whatever its number of copies.
+    A content the backend cannot judge gets (None, "") and is not cached.
+    """
+    digests = [comment.content_hash or content_hash(comment.content) for comment in comments]
+    verdicts = known_verdicts(digests)
+
+    unknown = {}  # Content hash -> text of its first comment
+    for comment, digest in zip(comments, digests):
+        if digest not in verdicts:
+            unknown.setdefault(digest, comment.content)
+
+    if unknown:
+        for digest, ok in zip(list(unknown), prefilter(list(unknown.values()))):
+            if ok is not None:
+                verdicts[digest] = (ok, Comment.BY_CLASSIFIER)
+                del unknown[digest]
+
+    if unknown:
+        results = dict(zip(unknown, judge_texts(backend, list(unknown.values()), deadline)))
+        cache.set_many(
+            {verdict_key(digest): ok for digest, ok in results.items() if ok is not None},
+            timeout=verdict_cache_timeout(),
+        )
+        verdicts.update(
+            {
+                digest: (ok, "" if ok is None else Comment.BY_MODEL)
+                for digest, ok in results.items()
+            }
+        )
+
+    return [verdicts[digest] for digest in digests]
+
+
+def moderate_pending(limit=1000, backend=None, time_budget=None):
+    """
+    Judges up to `limit` pending comments, oldest first, batch_size() per backend call.
+    Comments the model cannot judge are set to REVIEW. No backend call is started
+    after `time_budget` seconds: the batch in progress stays pending.
+    Returns (approved, rejected) counts. Backend errors propagate: the comments stay
+    pending and the task is retried with backoff.
+    """
+    backend = backend or get_backend()
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    approved = rejected = judged = 0
+    last_id = 0
+    while judged < limit:
+        comments = list(
+            Comment.objects.filter(status=Comment.PENDING, id__gt=last_id)
+            .order_by("id")
+            .only("id", "blog_id", "content", "content_hash")[
+                : min(batch_size(), limit - judged)
+            ]
+        )
+        if not comments:
+            break
+        try:
+            verdicts = judge_comments(comments, backend, deadline)
+        except OutOfTime:
+            break
+        batch_approved, batch_rejected = apply_verdicts(comments, verdicts)
+        approved += batch_approved
+        rejected += batch_rejected
+        judged += len(comments)
+        last_id = comments[-1].id
+    return approved, rejected
+
+
+def labeled_examples():
+    """
+    Returns [(text, rejected, weight)], one per distinct content, for the local
+    classifier: the latest verdict of the remote model, or the admin override.
+    The classifier's own verdicts are never used (it would learn its own mistakes).
+    """
+    comments = Comment.objects.filter(moderated_by__in=[Comment.BY_MODEL, Comment.BY_CACHE])
+    examples = {}
+    rows = comments.order_by("moderated_at").values_list("content_hash", "content", "status")
+    for digest, content, status in rows.iterator(chunk_size=2000):
+        examples[digest] = (content, status == Comment.REJECTED, 1.0)
+    # An admin corrected the model here: these count more
+    for digest, content, approved in ModerationOverride.objects.values_list(
+        "content_hash", "content", "approved"
+    ):
+        examples[digest] = (content, not approved, ADMIN_WEIGHT)
+    return list(examples.values())
+
+
+def set_override(text, approved, user=None):
+    """
+    Records an admin verdict for a content and applies it to every comment with the
+    same normalized content. Returns the number of comments updated.
+    """
+    digest = content_hash(text)
+    with transaction.atomic():
+        ModerationOverride.objects.update_or_create(
+            content_hash=digest,
+            defaults={"content": normalize_text(text), "approved": approved, "created_by": user},
+        )
+        comments = Comment.objects.filter(content_hash=digest)
+        blog_ids = set(comments.values_list("blog_id", flat=True))
+        updated = comments.update(
+            status=Comment.APPROVED if approved else Comment.REJECTED,
+            moderated_at=timezone.now(),
+            moderated_by=Comment.BY_ADMIN,
+        )
+    invalidate(*[(BLOG_COMMENTS, blog_id) for blog_id in blog_ids])
+    return updated
+
+
+def remove_override(text):
+    """
+    Deletes the admin verdict of a content, and its cached model verdict:
+    the next copy of the content is judged by the model again.
+    Returns True if there was an override.
+    """
+    digest = content_hash(text)
+    cache.delete(verdict_key(digest))
+    deleted, _ = ModerationOverride.objects.filter(content_hash=digest).delete()
+    return bool(deleted)
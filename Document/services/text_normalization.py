@@ -0,0 +1,49 @@
+import hashlib
+import re
+import unicodedata
+
+
+# Arabic letters and their Persian equivalents (keyboards produce both), and variants
+# of alef / waw written with hamza or madda
+CHARACTER_MAP = str.maketrans(
+    {
+        "ي": "ی",  # Arabic yeh -> Persian yeh
+        "ى": "ی",  # Alef maksura -> Persian yeh
+        "ئ": "ی",  # Yeh with hamza -> Persian yeh
+        "ك": "ک",  # Arabic kaf -> Persian keheh
+        "ة": "ه",  # Teh marbuta -> heh
+        "ۀ": "ه",  # Heh with yeh -> heh
+        "أ": "ا",  # Alef with hamza above -> alef
+        "إ": "ا",  # Alef with hamza below -> alef
+        "آ": "ا",  # Alef with madda -> alef
+        "ٱ": "ا",  # Alef wasla -> alef
+        "ؤ": "و",  # Waw with hamza -> waw
+        # Persian and Arabic-Indic digits -> ASCII digits
+        **{chr(0x06F0 + digit): str(digit) for digit in range(10)},
+        **{chr(0x0660 + digit): str(digit) for digit in range(10)},
+    }
+)
+
+# Harakat, superscript alef, tatweel, zero-width (non-)joiners, direction marks, BOM
+IGNORED = re.compile("[\u064b-\u065f\u0670\u0640\u200c-\u200f\ufeff]")
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    """
+    Returns the form under which two texts count as the same for moderation:
+    Unicode compatibility forms folded (NFKC), Arabic letters written as their Persian
+    equivalents, diacritics and zero-width characters removed, case folded and
+    whitespace collapsed. "Great  Product!" and "great product!" are the same.
+    """
+    text = unicodedata.normalize("NFKC", str(text))
+    text = IGNORED.sub("", text.translate(CHARACTER_MAP))
+    return WHITESPACE.sub(" ", text.casefold()).strip()
+
+
+def content_hash(text):
+    """
+    SHA-256 (hex) of the normalized text.
+    """
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
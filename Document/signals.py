@@ -0,0 +1,50 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from Product.services.cache_service import (
+    BLOG_COMMENTS,
+    BLOGS,
+    CART,
+    PRODUCT_BLOGS,
+    invalidate,
+)
+from .models import Blog, Card, Comment, OrderCard
+from .services.text_normalization import content_hash
+
+
+@receiver(post_save, sender=Blog)
+@receiver(post_delete, sender=Blog)
+def invalidate_blog_caches(sender, instance, **kwargs):
+    """
+    Invalidates the blog lists and the comments of the blog (hidden when inactive).
+    """
+    invalidate(
+        (BLOGS, "all"),
+        (PRODUCT_BLOGS, instance.product_id),
+        (BLOG_COMMENTS, instance.pk),
+    )
+
+
+@receiver(pre_save, sender=Comment)
+def set_comment_content_hash(sender, instance, **kwargs):
+    # Identical comments share their moderation verdict (Document/services/moderation.py)
+    instance.content_hash = content_hash(instance.content)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_caches(sender, instance, **kwargs):
+    invalidate((BLOG_COMMENTS, instance.blog_id))
+
+
+@receiver(post_save, sender=Card)
+@receiver(post_delete, sender=Card)
+def invalidate_card_caches(sender, instance, **kwargs):
+    invalidate((CART, instance.user_id))
+
+
+@receiver(post_save, sender=OrderCard)
+@receiver(post_delete, sender=OrderCard)
+def invalidate_order_caches(sender, instance, **kwargs):
+    user_id = Card.objects.filter(pk=instance.card_id).values_list("user_id", flat=True).first()
+    invalidate((CART, user_id))
@@ -0,0 +1,17 @@
+from MVP.outbound import call_timeout
+from TaskQueue.queue import lock_timeout, task
+
+from .models import Comment
+from .services.moderation import moderate_pending, request_moderation
+
+
+@task(max_attempts=8)
+def moderate_comments(limit=1000):
+    """
+    Judges the pending comments in batches; queues another run if some are left.
+    No model call starts once the run could outlast its lock: the last call must
+    end (it is bounded by the "llm" timeout) before another worker gets the task.
+    """
+    moderate_pending(limit, time_budget=lock_timeout() - call_timeout("llm") - 5)
+    if Comment.objects.filter(status=Comment.PENDING).exists():
+        request_moderation()
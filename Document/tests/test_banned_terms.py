@@ -0,0 +1,162 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from MVP.testing import TemporaryMediaMixin
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+from Product.models import Product
+from Document.models import Blog, Comment
+from Document.services.banned_terms import TermMatcher, find_banned_terms, load_matcher
+from Document.views import create_blog, create_comment
+from TaskQueue.models import Task
+from AuthenticationSystem.models import CustomUser
+
+
+class TermMatcherTest(SimpleTestCase):
+    def test_finds_every_term_in_one_pass(self):
+        """
+        Test that overlapping terms and terms inside others are all found.
+        """
+        matcher = TermMatcher(["he", "she", "his", "hers", "ushers"])
+        self.assertEqual(matcher.find("he she hers his"), ["he", "she", "hers", "his"])
+        self.assertEqual(matcher.find("nothing here"), [])
+
+    def test_whole_words_and_prefixes(self):
+        """
+        Test that terms match whole words only, unless they end with '*'.
+        """
+        matcher = TermMatcher(["ass", "spam*"])
+        self.assertEqual(matcher.find("first class"), [])
+        self.assertEqual(matcher.find("what an ass!"), ["ass"])
+        self.assertEqual(matcher.find("Spammers everywhere"), ["spam"])
+        self.assertEqual(matcher.find("antispam"), [])
+
+    def test_text_and_terms_are_normalized(self):
+        """
+        Test that Arabic letters, zero-width characters and case do not hide a term.
+        """
+        matcher = TermMatcher(["کثیف", "BAD  word"])
+        self.assertEqual(matcher.find("خیلی كثيف بود"), ["کثیف"])
+        self.assertEqual(matcher.find("a b\u200cad word"), ["bad word"])
+        self.assertEqual(matcher.find("a Bad Word"), ["bad word"])
+
+
+class BannedTermsFileTest(SimpleTestCase):
+    def setUp(self):
+        """
+        Write a term list to a temporary file.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "banned_terms.txt")
+        self.write("# Banned terms\nidiot\n\nاحمق  # Persian\n")
+        self.settings = override_settings(BANNED_TERMS_PATH=self.path)
+        self.settings.enable()
+
+    def tearDown(self):
+        self.settings.disable()
+        shutil.rmtree(self.directory)
+
+    def write(self, content, mtime=None):
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write(content)
+        if mtime is not None:
+            os.utime(self.path, (mtime, mtime))
+
+    def test_matcher_is_built_once_and_rebuilt_on_change(self):
+        """
+        Test that the matcher is reused until the file changes.
+        """
+        matcher = load_matcher()
+        self.assertEqual(len(matcher), 2)
+        self.assertIs(load_matcher(), matcher)
+        self.assertEqual(find_banned_terms("You idiot", "", "تو احمقی؟ احمق"), ["idiot", "احمق"])
+
+        self.write("spam*\n", mtime=os.stat(self.path).st_mtime + 10)
+        self.assertEqual(find_banned_terms("You idiot", "spammy"), ["spam"])
+
+    def test_missing_file_matches_nothing(self):
+        """
+        Test that without a term list nothing is banned.
+        """
+        os.remove(self.path)
+        self.assertEqual(find_banned_terms("You idiot"), [])
+
+
+class BannedTermsViewTest(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        """
+        Set up a term list, a store owner, a product and a blog.
+        """
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, "banned_terms.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("idiot\nاحمق\n")
+        self.settings = override_settings(BANNED_TERMS_PATH=path)
+        self.settings.enable()
+
+        self.factory = APIRequestFactory()
+        self.store_owner = CustomUser.objects.create(
+            username="store_owner", phone_number="+989123456789", user_type="store_owner"
+        )
+        self.product = Product.objects.create(title="Phone", store_owner=self.store_owner)
+        self.blog = Blog.objects.create(
+            title="Review",
+            description="Test",
+            product=self.product,
+            content_file=SimpleUploadedFile("review.html", b"<p>x</p>"),
+        )
+
+    def tearDown(self):
+        self.settings.disable()
+        shutil.rmtree(self.directory)
+
+    def call(self, view, data, format):
+        request = self.factory.post("/", data, format=format)
+        force_authenticate(request, user=self.store_owner)
+        with mock.patch(
+            "Document.views.get_user_from_token", return_value=(self.store_owner, None)
+        ):
+            return view(request)
+
+    def test_comment_with_banned_term_is_refused(self):
+        """
+        Test that such a comment is neither saved nor queued for moderation.
+        """
+        response = self.call(
+            create_comment, {"blog_id": self.blog.id, "content": "You IDIOT"}, "json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+        self.assertEqual(response.data["terms"], ["idiot"])
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(Task.objects.exists())
+
+        response = self.call(
+            create_comment, {"blog_id": self.blog.id, "content": "Idiotically good"}, "json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_blog_with_banned_term_is_refused(self):
+        """
+        Test that banned terms in the text of the HTML content are found too.
+        """
+        response = self.call(
+            create_blog,
+            {
+                "product_id": self.product.id,
+                "title": "New Blog",
+                "description": "New Description",
+                "content_file": SimpleUploadedFile(
+                    "blog.html",
+                    "<html><body><p>یک <strong>احمق</strong></p></body></html>".encode("utf-8"),
+                    content_type="text/html",
+                ),
+            },
+            "multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+        self.assertEqual(response.data["terms"], ["احمق"])
+        self.assertEqual(Blog.objects.count(), 1)
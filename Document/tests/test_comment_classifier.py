@@ -0,0 +1,157 @@
+import os
+import random
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock, skipIf
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from MVP.testing import TemporaryMediaMixin
+from django.utils import timezone
+from Product.models import Product
+from Document.models import Blog, Comment
+from Document.services import comment_classifier
+from Document.services.moderation import StubModerationBackend, moderate_pending
+from AuthenticationSystem.models import CustomUser
+
+
+GOOD = ["great", "nice", "love", "quality", "fast", "shipping", "thanks", "عالی", "خوب"]
+BAD = ["idiot", "stupid", "scam", "garbage", "احمق", "کلاهبردار", "trash", "hate"]
+NEUTRAL = ["phone", "the", "this", "is", "product", "گوشی", "very", "and"]
+
+
+def synthetic_comment(rng, bad):
+    words = rng.sample(BAD if bad else GOOD, 2) + rng.sample(NEUTRAL, 3)
+    rng.shuffle(words)
+    return " ".join(words)
+
+
+@skipIf(comment_classifier.np is None, "NumPy is not installed")
+class CommentClassifierTest(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        """
+        Set up a blog with 400 comments judged by the remote model, and a model path.
+        """
+        cache.clear()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "classifier.npz")
+        settings = override_settings(
+            COMMENT_CLASSIFIER_PATH=self.path,
+            COMMENT_MODERATION_BACKEND="Document.services.moderation.StubModerationBackend",
+            COMMENT_MODERATION_STUB_BANNED=BAD,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        self.customer = CustomUser.objects.create(
+            username="customer", phone_number="+989123456780"
+        )
+        self.blog = Blog.objects.create(
+            title="Review",
+            description="Test",
+            product=Product.objects.create(title="Phone", store_owner=self.customer),
+            content_file=SimpleUploadedFile("review.html", b"<p>x</p>"),
+        )
+        rng = random.Random(1)
+        for number in range(400):
+            bad = number % 3 == 0
+            Comment.objects.create(
+                user=self.customer,
+                blog=self.blog,
+                content=f"{synthetic_comment(rng, bad)} {number}",
+                status=Comment.REJECTED if bad else Comment.APPROVED,
+                moderated_at=timezone.now(),
+                moderated_by=Comment.BY_MODEL,
+            )
+
+    def train(self):
+        out = StringIO()
+        call_command("train_comment_classifier", precision=0.98, stdout=out)
+        return out.getvalue()
+
+    def test_feature_hashing_is_stable(self):
+        """
+        Test that features only depend on the normalized text.
+        """
+        features = comment_classifier.text_features("Great  PHONE")
+        self.assertEqual(features, comment_classifier.text_features("great phone"))
+        self.assertTrue(all(0 <= index < comment_classifier.N_FEATURES for index in features))
+
+    def test_thresholds_keep_the_precision(self):
+        """
+        Test that the thresholds only cover ranges where local decisions are right.
+        """
+        probabilities = [0.01, 0.02, 0.03, 0.4, 0.5, 0.6, 0.97, 0.98, 0.99]
+        rejected = [False, False, False, True, False, True, True, True, True]
+        self.assertEqual(
+            comment_classifier.choose_thresholds(
+                probabilities, rejected, precision=1.0, min_decided=2
+            ),
+            (0.03, 0.6),
+        )
+        self.assertEqual(
+            comment_classifier.choose_thresholds(probabilities, rejected, min_decided=20),
+            (-1.0, 2.0),
+        )
+
+    def test_train_and_prefilter(self):
+        """
+        Test that the trained classifier decides clear comments locally and
+        leaves the remote model out for them.
+        """
+        self.assertEqual(comment_classifier.prefilter(["great phone"]), [None])
+        output = self.train()
+        self.assertIn("Model saved", output)
+        self.assertTrue(os.path.exists(self.path))
+
+        decisions = comment_classifier.prefilter(
+            ["great quality phone, thanks", "this stupid scam is garbage"]
+        )
+        self.assertEqual(decisions, [True, False])
+
+        Comment.objects.create(
+            user=self.customer, blog=self.blog, content="love it, fast shipping"
+        )
+        Comment.objects.create(user=self.customer, blog=self.blog, content="you idiot, trash")
+        with mock.patch.object(StubModerationBackend, "judge") as judge:
+            self.assertEqual(moderate_pending(), (1, 1))
+        judge.assert_not_called()
+        self.assertEqual(
+            set(
+                Comment.objects.filter(moderated_by=Comment.BY_CLASSIFIER).values_list(
+                    "status", flat=True
+                )
+            ),
+            {Comment.APPROVED, Comment.REJECTED},
+        )
+
+    def test_benchmark_command(self):
+        """
+        Test that the benchmark evaluates the comments held out of training and
+        reports throughput and the share of avoided calls.
+        """
+        self.train()
+        held_out = len(comment_classifier.load_classifier().holdout)
+        out = StringIO()
+        call_command("benchmark_comment_classifier", repeat=1, stdout=out)
+        self.assertTrue(out.getvalue().startswith(f"{held_out} held-out comments"))
+        self.assertIn("comments/s", out.getvalue())
+        self.assertIn("Remote calls avoided", out.getvalue())
+
+
+class NumpyCheckTest(SimpleTestCase):
+    def test_warns_when_numpy_is_missing(self):
+        """
+        Test that an enabled classifier without NumPy is reported by the system checks.
+        """
+        with mock.patch.object(comment_classifier, "np", None):
+            self.assertEqual(
+                [warning.id for warning in comment_classifier.check_numpy(None)],
+                ["Document.W001"],
+            )
+            with override_settings(COMMENT_CLASSIFIER_ENABLED=False):
+                self.assertEqual(comment_classifier.check_numpy(None), [])
@@ -0,0 +1,136 @@
+from unittest import mock
+
+from django.test import TestCase, RequestFactory
+from MVP.testing import TemporaryMediaMixin
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework import status
+from rest_framework.test import force_authenticate
+from Product.models import Product
+from Document.models import Blog, Card, Comment, OrderCard
+from Document.views import (
+    blog_dependent_on_product,
+    get_cart,
+    show_all_blogs,
+    show_comments_dependent_on_blog,
+)
+from AuthenticationSystem.models import CustomUser
+
+
+# Number of queries each endpoint may run on a cache miss, whatever the number of rows.
+# Raising one of them must be a deliberate change: a per-row query (N+1) fails these tests.
+QUERY_BUDGETS = {
+    "blog_dependent_on_product": 2,  # Product, blogs
+    "show_all_blogs": 1,  # Blogs
+    "show_comments_dependent_on_blog": 2,  # Blog, comments
+    "get_cart": 2,  # Cart, cart items (the token user is resolved before)
+}
+
+
+class DocumentQueryBudgetTest(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        """
+        Set up a product with a blog, and a customer with a cart.
+        """
+        self.factory = RequestFactory()
+        self.store_owner = CustomUser.objects.create(
+            username="store_owner", phone_number="+989123456789", user_type="store_owner"
+        )
+        self.customer = CustomUser.objects.create(
+            username="customer", phone_number="+989123456780"
+        )
+        self.product = Product.objects.create(
+            title="Phone", descriptions="Test", store_owner=self.store_owner
+        )
+        self.blog = self.add_blog()
+        self.cart = Card.objects.create(user=self.customer)
+
+    def add_blog(self):
+        return Blog.objects.create(
+            title="Review",
+            description="Test",
+            product=self.product,
+            content_file=SimpleUploadedFile("review.html", b"<p>x</p>"),
+        )
+
+    def add_rows(self, name, count):
+        """
+        Adds `count` rows of the kind listed by the endpoint.
+        """
+        for number in range(count):
+            if name in ("blog_dependent_on_product", "show_all_blogs"):
+                self.add_blog()
+            elif name == "show_comments_dependent_on_blog":
+                Comment.objects.create(
+                    user=self.customer, content="Nice", blog=self.blog, status=Comment.APPROVED
+                )
+            else:
+                product = Product.objects.create(
+                    title=f"Item {number}", descriptions="Test", store_owner=self.store_owner
+                )
+                OrderCard.objects.create(card=self.cart, product=product)
+
+    def check_constant(self, name, view, path, results, user=None):
+        """
+        Calls the view with an empty cache, with few and with many rows,
+        and checks that the query count stays within the budget.
+        """
+        for added in (1, 9):
+            self.add_rows(name, added)
+            cache.clear()
+            with self.assertNumQueries(QUERY_BUDGETS[name]):
+                request = self.factory.get(path)
+                if user:
+                    force_authenticate(request, user=user)
+                response = view(request)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertGreaterEqual(len(results(response.data)), added)
+
+    def test_blog_dependent_on_product(self):
+        self.check_constant(
+            "blog_dependent_on_product",
+            blog_dependent_on_product,
+            f"/?product_id={self.product.id}",
+            lambda data: data["product_blogs"],
+        )
+
+    def test_show_all_blogs(self):
+        self.check_constant(
+            "show_all_blogs", show_all_blogs, "/", lambda data: data["blogs_list"]
+        )
+
+    def test_show_comments_dependent_on_blog(self):
+        self.check_constant(
+            "show_comments_dependent_on_blog",
+            show_comments_dependent_on_blog,
+            f"/?blog_id={self.blog.id}",
+            lambda data: data["comments"],
+        )
+
+    @mock.patch("Document.views.get_user_from_token")
+    def test_get_cart(self, get_user_from_token):
+        get_user_from_token.return_value = (self.customer, None)
+        self.check_constant(
+            "get_cart", get_cart, "/", lambda data: data["cart"], user=self.customer
+        )
+
+    @mock.patch("Document.views.get_user_from_token")
+    def test_get_cart_not_modified(self, get_user_from_token):
+        """
+        Test that a repeated cart read with its ETag costs no query, until the cart changes.
+        """
+        get_user_from_token.return_value = (self.customer, None)
+
+        def read(**headers):
+            request = self.factory.get("/", **headers)
+            force_authenticate(request, user=self.customer)
+            return get_cart(request)
+
+        etag = read()["ETag"]
+        with self.assertNumQueries(0):
+            self.assertEqual(read(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        OrderCard.objects.create(card=self.cart, product=self.product)
+        response = read(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["cart"]), 1)
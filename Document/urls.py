@@ -14,7 +14,13 @@ urlpatterns = [
     ),
     path("comments/create/", views.create_comment, name="create_comment"),
     path("comments/delete/", views.delete_comment, name="delete_comment"),
+    path(
+        "comments/moderation-override/",
+        views.moderation_override,
+        name="moderation_override",
+    ),
     # Cart URLs
+    path("cart/", views.get_cart, name="get_cart"),
     path("cart/add/", views.add_product_to_cart, name="add_to_cart"),
     path("cart/remove/", views.remove_product_from_cart, name="remove_from_cart"),
 ]
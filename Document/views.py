@@ -3,11 +3,23 @@ from rest_framework.decorators import (
     authentication_classes,
     permission_classes,
 )
-from django.core.cache import cache
+from django.db import transaction
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from Product.views import get_user_from_token
+from Product.pagination import paginate_keyset
+from Product.services.cache_service import (
+    BLOG_COMMENTS,
+    BLOGS,
+    CART,
+    PRODUCT_BLOGS,
+    cached_view,
+    catalog_stale_ttl,
+    invalidate,
+    list_cache_timeout,
+    query_id,
+)
 from .models import Product, Blog, OrderCard, Card, Comment
 from .serializers import (
     BlogFullSerializer,
@@ -15,11 +27,27 @@ from .serializers import (
     CardSerializer,
     OrderCardSerializer,
 )
-from AI_notAPP.connect_to_GPT import comment_ban_GPT
+from .services.banned_terms import find_banned_terms
+from .services.moderation import remove_override, request_moderation, set_override
+import html
 import magic
 import bleach
 
 
+def banned_terms_response(*texts):
+    """
+    Returns a 406 response naming the banned terms found in the texts, or None.
+    Runs in-process before anything is saved or sent to the moderation model.
+    """
+    terms = find_banned_terms(*texts)
+    if terms:
+        return Response(
+            {"error": "The text contains banned terms", "terms": terms},
+            status=status.HTTP_406_NOT_ACCEPTABLE,
+        )
+    return None
+
+
 def sanitize_html_file(
     uploaded_file, allowed_tags=None, allowed_attributes=None, strip=True
 ):
@@ -115,6 +143,15 @@ def create_blog(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        # Reject banned terms in the title, description or text of the content
+        banned_response = banned_terms_response(
+            title,
+            description,
+            html.unescape(bleach.clean(sanitized_content, tags=[], strip=True)),
+        )
+        if banned_response:
+            return banned_response
+
         # Check if the product exists
         try:
             product = Product.objects.get(id=product_id)
@@ -134,9 +171,7 @@ def create_blog(request):
             ),  # Save the sanitized content
         )
 
-        # Clear the cache for related views
-        cache.delete("all_blogs_cache")
-        cache.delete(f"product_blogs_cache_{product_id}")
+        # Cached blog lists are invalidated by the Blog signals
 
         # Serialize the created blog post and return it in the response
         serialized_blog = BlogFullSerializer(blog)
@@ -182,9 +217,7 @@ def delete_blog(request):
         # Delete the blog post
         blog = target_blog.delete()
 
-        # Clear the cache for related views
-        cache.delete("all_blogs_cache")
-        cache.delete(f"product_blogs_cache_{blog_id}")
+        # Cached blog lists are invalidated by the Blog signals
 
         # Serialize the deleted blog post (optional, depending on your use case)
         serialized_blog = BlogFullSerializer(blog)
@@ -194,6 +227,13 @@ def delete_blog(request):
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@cached_view(
+    "user_cart",
+    tags=lambda request: [(CART, request.user.pk)],
+    params=[],
+    vary_on_user=True,
+    etag=True,
+)
 def get_cart(request):
     """
     Retrieve the products in the user's shopping cart.
@@ -207,15 +247,7 @@ def get_cart(request):
     # Get the user from the token
     user, response_error = get_user_from_token(request)
     if response_error:
-        return Response(response_error)
-
-    # Define cache key
-    cache_key = f"user_cart_{user.id}"
-
-    # Check if data exists in the cache
-    cached_data = cache.get(cache_key)
-    if cached_data:
-        return Response({"cart": cached_data}, status=status.HTTP_200_OK)
+        return response_error
 
     # Get the user's cart
     try:
@@ -227,9 +259,6 @@ def get_cart(request):
     order_items = OrderCard.objects.filter(card=cart)
     serialized_order_items = OrderCardSerializer(order_items, many=True)
 
-    # Cache the serialized data for 10 minutes (600 seconds)
-    cache.set(cache_key, serialized_order_items.data, timeout=600)
-
     return Response({"cart": serialized_order_items.data}, status=status.HTTP_200_OK)
 
 
@@ -295,12 +324,15 @@ def update_blog(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Clear the cache for related views
-        cache.delete("all_blogs_cache")
-        cache.delete(f"product_blogs_cache_{product_id}")
+        # The 'product_id' parameter is the id of the blog to update
+        blog = Blog.objects.filter(id=product_id).only("id", "product_id").first()
+        if not blog:
+            return Response(
+                {"error": "Blog does not exist"}, status=status.HTTP_404_NOT_FOUND
+            )
 
         # Update the blog post with the new data
-        Blog.objects.filter(id=product_id).update(
+        Blog.objects.filter(id=blog.id).update(
             active=active,
             description=description,
             title=title,
@@ -309,11 +341,27 @@ def update_blog(request):
             ),  # Encode the sanitized content to UTF-8
         )
 
+        # Clear the cache for related views once the update is written
+        # (queryset.update() does not send the signals that usually do it)
+        invalidate(
+            (BLOGS, "all"),
+            (PRODUCT_BLOGS, blog.product_id),
+            (BLOG_COMMENTS, blog.id),
+        )
+
 
 @api_view(["GET"])
+@cached_view(
+    "product_blogs",
+    timeout=list_cache_timeout(),
+    tags=lambda request: [(PRODUCT_BLOGS, query_id(request, "product_id"))],
+    params=["product_id", "cursor", "page_size"],
+    etag=True,
+)
 def blog_dependent_on_product(request):
     """
     Retrieve all blogs related to a specific product with caching.
+    Results are paginated by keyset ('cursor' and 'page_size' query parameters).
 
     Args:
         request (HttpRequest): The request object containing query parameters.
@@ -328,35 +376,38 @@ def blog_dependent_on_product(request):
             {"error": "product id is required"}, status=status.HTTP_400_BAD_REQUEST
         )
 
-    cache_key = f"product_blogs_{product_id}"
-    cached_data = cache.get(cache_key)
-
-    if cached_data:
-        return Response({"product_blogs": cached_data}, status=status.HTTP_200_OK)
-
-    product = Product.objects.filter(id=product_id).first()
+    # Only the id is needed to list the blogs
+    product = Product.objects.filter(id=product_id).only("id").first()
 
     if not product:
         return Response(
             {"error": "Product does not exist"}, status=status.HTTP_404_NOT_FOUND
         )
 
-    product_blogs = product.blogs.all()
-    product_blogs_serialized = BlogFullSerializer(product_blogs, many=True)
+    page, error_response = paginate_keyset(product.blogs.all(), request)
+    if error_response:
+        return error_response
 
-    cache.set(
-        cache_key, product_blogs_serialized.data, timeout=600
-    )  # Cache for 10 minutes
+    product_blogs_serialized = BlogFullSerializer(page.items, many=True)
 
     return Response(
-        {"product_blogs": product_blogs_serialized.data}, status=status.HTTP_200_OK
+        {"product_blogs": product_blogs_serialized.data, "next": page.next},
+        status=status.HTTP_200_OK,
     )
 
 
 @api_view(["GET"])  # Specifies that this view only accepts GET requests
+@cached_view(
+    "blogs_list",
+    timeout=list_cache_timeout(),
+    stale_while_revalidate=catalog_stale_ttl(),
+    tags=lambda request: [(BLOGS, "all")],
+    params=["cursor", "page_size"],
+)
 def show_all_blogs(request):
     """
     Retrieve a list of all active blog posts, utilizing caching for optimization.
+    Results are paginated by keyset ('cursor' and 'page_size' query parameters).
 
     Args:
         request (HttpRequest): The request object.
@@ -364,33 +415,32 @@ def show_all_blogs(request):
     Returns:
         Response: A JSON response containing the list of all blogs.
     """
-    # Define cache key
-    cache_key = "blogs_list"
-
-    # Check if data exists in the cache
-    cached_data = cache.get(cache_key)
-    if cached_data:
-        return Response({"blogs_list": cached_data}, status=status.HTTP_200_OK)
-
-    # Retrieve all active blog posts from the database
-    blogs_list = Blog.objects.filter(active=True)
+    # Retrieve one page of active blog posts from the database
+    page, error_response = paginate_keyset(Blog.objects.filter(active=True), request)
+    if error_response:
+        return error_response
 
     # Serialize the list of blog posts
-    blogs_list_serialized = BlogFullSerializer(blogs_list, many=True)
-
-    # Store serialized data in cache with a timeout of 10 minutes (600 seconds)
-    cache.set(cache_key, blogs_list_serialized.data, timeout=600)
+    blogs_list_serialized = BlogFullSerializer(page.items, many=True)
 
     # Return the serialized data with a 200 OK status
     return Response(
-        {"blogs_list": blogs_list_serialized.data}, status=status.HTTP_200_OK
+        {"blogs_list": blogs_list_serialized.data, "next": page.next},
+        status=status.HTTP_200_OK,
     )
 
 
 @api_view(["GET"])  # Specifies that this view only accepts GET requests
+@cached_view(
+    "blog_comments",
+    timeout=list_cache_timeout(),
+    tags=lambda request: [(BLOG_COMMENTS, query_id(request, "blog_id"))],
+    params=["blog_id", "cursor", "page_size"],
+)
 def show_comments_dependent_on_blog(request):
     """
     Retrieve all comments related to a specific blog post with caching.
+    Results are paginated by keyset ('cursor' and 'page_size' query parameters).
 
     Args:
         request (HttpRequest): The request object containing query parameters.
@@ -410,33 +460,30 @@ def show_comments_dependent_on_blog(request):
             {"error": "blog_id is required"}, status=status.HTTP_400_BAD_REQUEST
         )
 
-    # Define cache key
-    cache_key = f"blog_comments_{blog_id}"
-    cached_comments = cache.get(cache_key)
-
-    if cached_comments:
-        return Response({"comments": cached_comments}, status=status.HTTP_200_OK)
-
     # Retrieve the blog post with the given ID and ensure it is active
     try:
-        blog = Blog.objects.get(active=True, id=blog_id)
+        blog = Blog.objects.only("id").get(active=True, id=blog_id)
     except Blog.DoesNotExist:
         # If the blog does not exist, return a 404 Not Found response
         return Response(
             {"error": "Blog does not exist"}, status=status.HTTP_404_NOT_FOUND
         )
 
-    # Retrieve all comments related to the blog post
-    comments = blog.comments.all()
+    # Retrieve one page of the published comments of the blog post
+    page, error_response = paginate_keyset(
+        blog.comments.filter(status=Comment.APPROVED), request
+    )
+    if error_response:
+        return error_response
 
     # Serialize the comments
-    comments_serialized = CommentSerializer(comments, many=True)
-
-    # Cache the serialized data for 10 minutes (600 seconds)
-    cache.set(cache_key, comments_serialized.data, timeout=600)
+    comments_serialized = CommentSerializer(page.items, many=True)
 
     # Return the serialized data with a 200 OK status
-    return Response({"comments": comments_serialized.data}, status=status.HTTP_200_OK)
+    return Response(
+        {"comments": comments_serialized.data, "next": page.next},
+        status=status.HTTP_200_OK,
+    )
 
 
 @api_view(["POST"])
@@ -466,25 +513,30 @@ def create_comment(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    # Comments with a banned term are refused at once, without a model call
+    banned_response = banned_terms_response(content)
+    if banned_response:
+        return banned_response
+
     try:
         blog = Blog.objects.get(id=blog_id)
     except Blog.DoesNotExist:
         return Response({"error": "Blog not found"}, status=status.HTTP_404_NOT_FOUND)
 
-    # Create the comment
-    Comment.objects.create(content=content, blog=blog, user=user)
-
-    # Clear related comments cache
-    cache.delete(f"blog_comments_{blog_id}")  # Added cache invalidation
+    # Save the comment as pending; a worker moderates the pending comments in batches
+    # and publishes the accepted ones, so the response does not wait for the model
+    with transaction.atomic():
+        comment = Comment.objects.create(content=content, blog=blog, user=user)
+        request_moderation()
 
-    is_comment_ok = comment_ban_GPT(request=content)
-    if is_comment_ok == True:
-        return Response({"message": "Comment created"}, status=status.HTTP_201_CREATED)
-    else:
-        return Response(
-            {"message": "Your Comment was not ok"},
-            status=status.HTTP_406_NOT_ACCEPTABLE,
-        )
+    return Response(
+        {
+            "message": "Comment created, it will be visible once moderated",
+            "id": comment.id,
+            "status": comment.status,
+        },
+        status=status.HTTP_201_CREATED,
+    )
 
 
 @api_view(["DELETE"])
@@ -513,11 +565,9 @@ def delete_comment(request):
         return Response({"error": "Blog not found"}, status=status.HTTP_404_NOT_FOUND)
 
     if (user == blog.user) or (user.user_type == "admin"):
+        # The Blog signals invalidate the cached blog and comment lists
         blog.delete()
 
-        # Clear related comments cache
-        cache.delete(f"blog_comments_{blog_id}")  # Added line
-
         return Response(
             {"message": "Comment deleted"}, status=status.HTTP_204_NO_CONTENT
         )
@@ -528,6 +578,50 @@ def delete_comment(request):
         )
 
 
+@api_view(["POST", "DELETE"])
+@permission_classes([IsAuthenticated])
+def moderation_override(request):
+    """
+    Sets (POST) or removes (DELETE) the admin verdict of a comment content.
+    Comments count as the same content when they only differ in whitespace, case or
+    Arabic/Persian letter forms. POST also applies the verdict to the existing comments.
+    Only admins can use it.
+    """
+    user, error_response = get_user_from_token(request)
+    if error_response:
+        return error_response
+
+    if user.user_type != "admin":
+        return Response(
+            {"error": "Only admins can override moderation"},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    content = request.data.get("content")
+    if not content:
+        return Response({"error": "content is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+    if request.method == "DELETE":
+        if not remove_override(content):
+            return Response(
+                {"error": "No override for this content"}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response({"message": "Override removed"}, status=status.HTTP_200_OK)
+
+    # JSON booleans, or "true" / "false" from form data
+    approved = str(request.data.get("approved")).lower()
+    if approved not in ("true", "false"):
+        return Response(
+            {"error": "approved must be true or false"}, status=status.HTTP_400_BAD_REQUEST
+        )
+    approved = approved == "true"
+
+    updated = set_override(content, approved, user=user)
+    return Response(
+        {"message": "Override saved", "comments_updated": updated}, status=status.HTTP_200_OK
+    )
+
+
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def add_product_to_cart(request):
@@ -575,8 +669,7 @@ def add_product_to_cart(request):
         OrderCard.objects.create(card=cart, product=product, order_time=order_time)
         message = "Product added to the cart."
 
-    # Clear user's cart cache
-    cache.delete(f"user_cart_{user.id}")  # Added cache invalidation
+    # The cached cart is invalidated by the OrderCard signals
 
     return Response({"message": message}, status=status.HTTP_200_OK)
 
@@ -637,7 +730,6 @@ def remove_product_from_cart(request):
             {"error": "Product not found in the cart"}, status=status.HTTP_404_NOT_FOUND
         )
 
-    # Clear user's cart cache
-    cache.delete(f"user_cart_{user.id}")  # Added cache invalidation
+    # The cached cart is invalidated by the OrderCard signals
 
     return Response({"message": message}, status=status.HTTP_200_OK)
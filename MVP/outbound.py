@@ -0,0 +1,343 @@
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+logger = logging.getLogger(__name__)
+
+# Settings of a dependency missing from OUTBOUND_DEPENDENCIES
+DEFAULTS = {
+    "timeout": 10,  # Seconds a caller waits for the answer
+    "max_concurrency": 4,  # Calls in flight at once, per process
+    "max_wait": 1.0,  # Seconds a call waits for a free slot before being refused
+    "failure_threshold": 5,  # Consecutive failures that open the circuit
+    "reset_timeout": 30,  # Seconds the circuit stays open before a trial call
+    "flush_interval": 5,  # Seconds a process keeps its counters before adding them to the cache
+}
+
+# Circuit states
+CLOSED = "closed"  # Calls go through
+OPEN = "open"  # Calls are refused at once
+HALF_OPEN = "half_open"  # One trial call decides between closed and open
+
+# Fallback policy: raise DependencyUnavailable (the caller, e.g. a task, retries later)
+RAISE = object()
+
+# Shared counters of every process, see dependency_stats()
+STATS_KEY = "outbound_{name}_{metric}"
+COUNTERS = (
+    "calls",  # Every call, including the refused ones
+    "success",
+    "failure",  # Failures counted by the circuit breaker (timeouts included)
+    "timeout",
+    "error",  # Other exceptions: the dependency answered, the caller failed
+    "rejected",  # Refused because the circuit was open
+    "busy",  # Refused because every slot stayed taken for max_wait seconds
+    "fallback",  # Answered by the fallback policy
+)
+# Upper bounds (ms) of the latency histogram; slower calls go to the "inf" bucket
+LATENCY_BUCKETS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+METRICS = (
+    COUNTERS
+    + ("latency_ms",)  # Total time of the calls that ran
+    + tuple(f"le_{bound}" for bound in LATENCY_BUCKETS + ("inf",))
+)
+
+
+class DependencyUnavailable(Exception):
+    """
+    Raised instead of calling a dependency that failed, timed out, or refused
+    the call (open circuit, no free slot), when no fallback is given.
+    """
+
+    def __init__(self, name, reason):
+        super().__init__(f"{name} is unavailable ({reason})")
+        self.name = name
+        self.reason = reason
+
+
+def dependency_config(name):
+    return {**DEFAULTS, **getattr(settings, "OUTBOUND_DEPENDENCIES", {}).get(name, {})}
+
+
+def call_timeout(name):
+    """
+    Timeout of a dependency, for the clients that accept one (the wrapper enforces it
+    too, but a client timeout also frees the slot of a call given up on).
+    """
+    return dependency_config(name)["timeout"]
+
+
+def _bucket(milliseconds):
+    return next((bound for bound in LATENCY_BUCKETS if milliseconds <= bound), "inf")
+
+
+class Metrics:
+    """
+    Counters of a dependency in this process, added to the shared counters at most
+    every `flush_interval` seconds (and when the circuit changes state), so a call
+    costs no cache round trip. Up to `flush_interval` seconds of counts are lost if
+    the process dies.
+    """
+
+    def __init__(self, name, flush_interval):
+        self.name = name
+        self.flush_interval = flush_interval
+        self.pending = Counter()
+        self.flushed_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def add(self, *metrics, latency=None):
+        with self.lock:
+            self.pending.update(metrics)
+            if latency is not None:
+                milliseconds = int(latency * 1000)
+                self.pending["latency_ms"] += milliseconds
+                self.pending[f"le_{_bucket(milliseconds)}"] += 1
+            due = time.monotonic() - self.flushed_at >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, Counter()
+            self.flushed_at = time.monotonic()
+        for metric, amount in pending.items():
+            key = STATS_KEY.format(name=self.name, metric=metric)
+            try:
+                cache.incr(key, amount)
+            except ValueError:
+                # The counter does not exist (yet or anymore)
+                cache.add(key, 0, timeout=None)
+                cache.incr(key, amount)
+
+    def clear(self):
+        with self.lock:
+            self.pending.clear()
+
+
+class CircuitBreaker:
+    """
+    Stops calling a dependency after `failure_threshold` consecutive failures, for
+    `reset_timeout` seconds; then lets one trial call through, which closes the
+    circuit if it succeeds and opens it again otherwise. State is per process.
+    """
+
+    def __init__(self, name, failure_threshold, reset_timeout, on_change=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_change = on_change  # Called after each state change
+        self.state = CLOSED
+        self.failures = 0  # Consecutive failures
+        self.opened_at = 0.0
+        self.trial = False  # Whether the trial call of the half-open state is running
+        self.lock = threading.Lock()
+
+    def _move(self, state):
+        if state != self.state:
+            logger.warning("Circuit of %s: %s -> %s", self.name, self.state, state)
+            self.state = state
+            if self.on_change is not None:
+                self.on_change()
+
+    def allow(self):
+        with self.lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self._move(HALF_OPEN)
+                self.trial = False
+            if self.state == HALF_OPEN and not self.trial:
+                self.trial = True
+                return True
+            return self.state == CLOSED
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.trial = False
+            self._move(CLOSED)
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self.trial = False
+                self._move(OPEN)
+
+
+class Dependency:
+    """
+    Calls of one remote service: bounded concurrency, a deadline, a circuit breaker,
+    a fallback policy, and latency / outcome counters.
+
+    Calls run on a pool of `max_concurrency` threads so the caller can stop waiting
+    after `timeout` seconds even if the client has no timeout. A call given up on
+    keeps its slot until it really ends, so hung calls can never pile up beyond
+    `max_concurrency`. The functions must not use the database (another thread).
+    """
+
+    def __init__(self, name, config):
+        self.name = name
+        self.config = config
+        self.metrics = Metrics(name, config["flush_interval"])
+        self.breaker = CircuitBreaker(
+            name,
+            config["failure_threshold"],
+            config["reset_timeout"],
+            # Failures show up in the shared counters without waiting for the interval
+            on_change=self.metrics.flush,
+        )
+        self.slots = threading.BoundedSemaphore(config["max_concurrency"])
+        self.executor = ThreadPoolExecutor(
+            max_workers=config["max_concurrency"], thread_name_prefix=f"outbound-{name}"
+        )
+
+    def _run(self, function, args, kwargs):
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self.slots.release()
+
+    def _fallback(self, fallback, reason, args, kwargs, cause=None):
+        if fallback is RAISE:
+            raise DependencyUnavailable(self.name, reason) from cause
+        self.metrics.add("fallback")
+        return fallback(*args, **kwargs) if callable(fallback) else fallback
+
+    def call(self, function, args=(), kwargs=None, fallback=RAISE, failures=(Exception,)):
+        """
+        Calls function(*args, **kwargs). The exceptions listed in `failures` and the
+        timeouts count against the dependency and are answered by the fallback:
+        RAISE, a callable taking the same arguments, or a value to return.
+        Other exceptions are raised as they are.
+        """
+        kwargs = kwargs or {}
+
+        # Take a slot first so a refused call never uses up the half-open trial
+        if not self.slots.acquire(timeout=self.config["max_wait"]):
+            self.metrics.add("calls", "busy")
+            return self._fallback(fallback, "busy", args, kwargs)
+        if not self.breaker.allow():
+            self.slots.release()
+            self.metrics.add("calls", "rejected")
+            return self._fallback(fallback, "circuit open", args, kwargs)
+
+        started = time.monotonic()
+        try:
+            future = self.executor.submit(self._run, function, args, kwargs)
+        except BaseException:
+            self.slots.release()
+            raise
+        try:
+            result = future.result(timeout=self.config["timeout"])
+        except (FutureTimeoutError, TimeoutError) as e:
+            # Also the client's own timeouts (socket.timeout is TimeoutError)
+            outcome, cause = "timeout", e
+        except failures as e:
+            outcome, cause = "failure", e
+        except Exception:
+            # The dependency answered: the error is the caller's
+            self.metrics.add("calls", "error", latency=time.monotonic() - started)
+            self.breaker.record_success()
+            raise
+        else:
+            self.metrics.add("calls", "success", latency=time.monotonic() - started)
+            self.breaker.record_success()
+            return result
+
+        failed = ("failure", "timeout") if outcome == "timeout" else ("failure",)
+        self.metrics.add("calls", *failed, latency=time.monotonic() - started)
+        self.breaker.record_failure()
+        logger.warning("Call to %s failed: %r", self.name, cause)
+        return self._fallback(fallback, outcome, args, kwargs, cause)
+
+
+_dependencies = {}
+_dependencies_lock = threading.Lock()
+
+
+def get_dependency(name):
+    """
+    Returns the Dependency of this process, rebuilt if its settings changed.
+    """
+    config = dependency_config(name)
+    with _dependencies_lock:
+        dependency = _dependencies.get(name)
+        if dependency is None or dependency.config != config:
+            if dependency is not None:
+                dependency.executor.shutdown(wait=False)
+                dependency.metrics.flush()
+            dependency = _dependencies[name] = Dependency(name, config)
+        return dependency
+
+
+def outbound(name, fallback=RAISE, failures=(Exception,)):
+    """
+    Routes every call of the decorated function through the dependency `name`:
+
+        @outbound("sms", failures=(kavenegar.HTTPException,))
+        def send_sms(phone_number, text): ...
+
+    See Dependency.call() for `fallback` and `failures`.
+    """
+
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            return get_dependency(name).call(
+                function, args, kwargs, fallback=fallback, failures=failures
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def _percentile(histogram, total, share):
+    # Upper bound (ms) of the bucket holding the given share of the calls
+    seen = 0
+    for bound, count in histogram:
+        seen += count
+        if seen >= share * total:
+            return bound
+    return None
+
+
+def dependency_stats(name):
+    """
+    Counters of a dependency, summed over every process since the last reset, with
+    the failure rate, the mean latency and latency percentiles (bucket upper bounds,
+    float('inf') above the last bucket). Rates and latencies are None without calls.
+    The other processes' counts of the last `flush_interval` seconds are not in yet.
+    """
+    if name in _dependencies:
+        _dependencies[name].metrics.flush()
+    keys = [STATS_KEY.format(name=name, metric=metric) for metric in METRICS]
+    found = cache.get_many(keys)
+    values = {metric: found.get(key, 0) for metric, key in zip(METRICS, keys)}
+
+    stats = {metric: values[metric] for metric in COUNTERS}
+    completed = stats["success"] + stats["failure"] + stats["error"]
+    histogram = [(bound, values[f"le_{bound}"]) for bound in LATENCY_BUCKETS]
+    histogram.append((float("inf"), values["le_inf"]))
+    measured = sum(count for _, count in histogram)
+    stats["failure_rate"] = stats["failure"] / completed if completed else None
+    stats["mean_ms"] = values["latency_ms"] / measured if measured else None
+    for percentile in (50, 95, 99):
+        stats[f"p{percentile}_ms"] = (
+            _percentile(histogram, measured, percentile / 100) if measured else None
+        )
+    return stats
+
+
+def reset_stats(name):
+    if name in _dependencies:
+        _dependencies[name].metrics.clear()
+    cache.delete_many([STATS_KEY.format(name=name, metric=metric) for metric in METRICS])
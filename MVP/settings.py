@@ -36,6 +36,7 @@ INSTALLED_APPS = [
     "rest_framework_simplejwt",
     "Product",
     "Document",
+    "TaskQueue",
 ]
 
 REST_FRAMEWORK = {
@@ -44,6 +45,10 @@ REST_FRAMEWORK = {
     ),
 }
 
+# Keyset (cursor) pagination for list endpoints, see Product/pagination.py
+KEYSET_PAGE_SIZE = 20  # Default number of items per page
+KEYSET_MAX_PAGE_SIZE = 100  # Upper bound for the 'page_size' query parameter
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=7),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=30),
@@ -85,9 +90,79 @@ CACHES = {
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
         },
-    }
+    },
+    # Small, hot, rarely-changing reference data (industries, colors, file types):
+    # in-process LRU in front of the shared cache, see Product/services/tiered_cache.py
+    "reference": {
+        "BACKEND": "Product.services.tiered_cache.TwoTierCache",
+        "LOCATION": "reference",
+        "TIMEOUT": 60 * 60 * 24,
+        "OPTIONS": {
+            "L2": "default",
+            "MAX_ENTRIES": 1024,
+            "L1_TIMEOUT": 60,
+            "VERSION_CHECK_INTERVAL": 1.0,
+        },
+    },
 }
 
+# Product list caches are invalidated through generation counters
+# (Product/services/cache_service.py), so they can live for hours
+PRODUCT_LIST_CACHE_TIMEOUT = 60 * 60 * 6
+
+# Catalog reads (product detail, product lists, blog list) past their TTL are still
+# served for this many seconds while a background thread refreshes them
+CATALOG_STALE_WHILE_REVALIDATE = 60 * 10
+
+# Background tasks stored in the database (TaskQueue/queue.py), run by manage.py runworker
+TASK_WORKER_CONCURRENCY = 4  # Tasks run at the same time by one worker process
+TASK_POLL_INTERVAL = 1.0  # Seconds between two looks at an empty queue
+TASK_LOCK_TIMEOUT = 60 * 5  # Seconds after which the task of a dead worker is run again
+TASK_RETRY_BASE_DELAY = 5  # Seconds before the first retry, doubled at each failure
+TASK_RETRY_MAX_DELAY = 60 * 60
+
+# Comment moderation (Document/services/moderation.py): new comments are pending until
+# a worker judges them, COMMENT_MODERATION_BATCH_SIZE comments per model call
+COMMENT_MODERATION_BACKEND = "Document.services.moderation.GPTModerationBackend"
+COMMENT_MODERATION_BATCH_SIZE = 20
+COMMENT_MODERATION_DELAY = 2  # Seconds new comments are gathered before a run
+COMMENT_VERDICT_CACHE_TIMEOUT = 60 * 60 * 24 * 7  # Model verdicts reused for the same content
+
+# Local pre-filter deciding the clear comments before the remote model (needs NumPy and
+# a model trained by manage.py train_comment_classifier; without them it decides nothing)
+COMMENT_CLASSIFIER_ENABLED = True
+COMMENT_CLASSIFIER_PATH = os.path.join(BASE_DIR, "comment_classifier.npz")
+
+# Remote services called through MVP/outbound.py: per-process timeout (s),
+# concurrent calls, wait for a free slot (s), consecutive failures opening the circuit,
+# and seconds before a trial call. Counters (written every "flush_interval" s, default 5):
+# manage.py outbound_stats
+OUTBOUND_DEPENDENCIES = {
+    "llm": {  # Comment moderation gateway (AI_notAPP/connect_to_GPT.py)
+        "timeout": 30,
+        "max_concurrency": 4,
+        "max_wait": 5,
+        "failure_threshold": 5,
+        "reset_timeout": 30,
+    },
+    "sms": {  # Kavenegar (AuthenticationSystem/services/sms_service.py)
+        "timeout": 10,
+        "max_concurrency": 8,
+        "max_wait": 2,
+        "failure_threshold": 5,
+        "reset_timeout": 60,
+    },
+}
+
+# Banned terms (Document/services/banned_terms.py): UTF-8, one term per line, '#' starts a
+# comment, a trailing '*' also matches longer words; comments and blogs containing one are
+# refused before moderation. Workers rebuild the matcher when the file changes
+BANNED_TERMS_PATH = os.path.join(BASE_DIR, "banned_terms.txt")
+
+# Processes resizing product images into thumbnails / WebP variants
+# (Product/services/image_derivatives.py), None = one per CPU
+IMAGE_DERIVATIVE_WORKERS = None
+
 
 WSGI_APPLICATION = "MVP.wsgi.application"
 
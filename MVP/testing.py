@@ -0,0 +1,23 @@
+import shutil
+import tempfile
+
+from django.test import override_settings
+
+
+class TemporaryMediaMixin:
+    """
+    Gives a test class its own MEDIA_ROOT, deleted after the class, so the files the
+    tests save never reach the project's media/ (where leftovers from a previous run
+    would make storage pick other names).
+
+        class ImageTest(TemporaryMediaMixin, TestCase): ...
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        cls.addClassCleanup(media_override.disable)
+        super().setUpClass()
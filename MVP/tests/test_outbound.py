@@ -0,0 +1,207 @@
+import threading
+from io import StringIO
+from unittest import mock
+
+import kavenegar
+import openai
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from MVP import outbound
+from MVP.outbound import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    DEFAULTS,
+    Dependency,
+    DependencyUnavailable,
+    dependency_stats,
+)
+from AI_notAPP.connect_to_GPT import comment_ban_GPT, comment_ban_GPT_batch
+from AuthenticationSystem.services.sms_service import send_temporary_code
+
+
+def dependency(**config):
+    # Counters written at once, unless a test sets flush_interval
+    return Dependency("test", {**DEFAULTS, "flush_interval": 0, **config})
+
+
+def fail():
+    raise ConnectionError("down")
+
+
+class DependencyTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(outbound.logger, "warning")
+        self.warning = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_success_is_counted(self):
+        """
+        Test that a call returns its result and is counted with its latency.
+        """
+        self.assertEqual(dependency().call(lambda a, b: a + b, (1,), {"b": 2}), 3)
+        stats = dependency_stats("test")
+        self.assertEqual((stats["calls"], stats["success"], stats["failure"]), (1, 1, 0))
+        self.assertEqual(stats["failure_rate"], 0)
+        self.assertEqual(stats["p50_ms"], 50)
+
+    def test_counters_are_written_in_batches(self):
+        """
+        Test that counters stay in the process until the interval, or a circuit change.
+        """
+        test = dependency(flush_interval=60, failure_threshold=2)
+        test.call(lambda: "ok")
+        test.call(fail, fallback=None)
+        self.assertEqual(dependency_stats("test")["calls"], 0)
+
+        test.call(fail, fallback=None)  # Opens the circuit
+        stats = dependency_stats("test")
+        self.assertEqual((stats["calls"], stats["success"], stats["failure"]), (3, 1, 2))
+
+    def test_circuit_opens_after_consecutive_failures(self):
+        """
+        Test that the circuit opens at the threshold, refuses calls, then lets one trial through.
+        """
+        test = dependency(failure_threshold=2, reset_timeout=30)
+        for _ in range(2):
+            with self.assertRaises(DependencyUnavailable) as raised:
+                test.call(fail)
+            self.assertIsInstance(raised.exception.__cause__, ConnectionError)
+        self.assertEqual(test.breaker.state, OPEN)
+        self.warning.assert_any_call("Circuit of %s: %s -> %s", "test", CLOSED, OPEN)
+
+        called = mock.Mock(return_value="ok")
+        self.assertEqual(test.call(called, fallback="fallback"), "fallback")
+        called.assert_not_called()
+
+        # After reset_timeout: one trial call, which closes the circuit
+        test.breaker.opened_at -= 30
+        self.assertEqual(test.call(called), "ok")
+        self.assertEqual(test.breaker.state, CLOSED)
+
+        stats = dependency_stats("test")
+        self.assertEqual(
+            (stats["calls"], stats["failure"], stats["rejected"], stats["fallback"]),
+            (4, 2, 1, 1),
+        )
+
+    def test_failed_trial_opens_the_circuit_again(self):
+        """
+        Test that a failing trial call reopens the circuit at once.
+        """
+        test = dependency(failure_threshold=1)
+        test.call(fail, fallback=None)
+        test.breaker.opened_at -= DEFAULTS["reset_timeout"]
+        self.assertTrue(test.breaker.allow())
+        self.assertEqual(test.breaker.state, HALF_OPEN)
+        self.assertFalse(test.breaker.allow())  # Only one trial at a time
+
+        test.breaker.trial = False
+        test.call(fail, fallback=None)
+        self.assertEqual(test.breaker.state, OPEN)
+
+    def test_other_exceptions_do_not_count(self):
+        """
+        Test that exceptions outside `failures` are raised and keep the circuit closed.
+        """
+        test = dependency(failure_threshold=1)
+        with self.assertRaises(ValueError):
+            test.call(mock.Mock(side_effect=ValueError), failures=(ConnectionError,))
+        self.assertEqual(test.breaker.state, CLOSED)
+        self.assertEqual(dependency_stats("test")["error"], 1)
+
+    def test_slow_call_times_out(self):
+        """
+        Test that the caller stops waiting after the timeout, and the fallback answers.
+        """
+        release = threading.Event()
+        test = dependency(timeout=0.05)
+        fallback = mock.Mock(return_value="late")
+        self.assertEqual(test.call(release.wait, (5,), fallback=fallback), "late")
+        fallback.assert_called_once_with(5)
+        release.set()
+
+        stats = dependency_stats("test")
+        self.assertEqual((stats["failure"], stats["timeout"]), (1, 1))
+
+    def test_concurrency_is_bounded(self):
+        """
+        Test that a call is refused when every slot is held, also by a call given up on.
+        """
+        release = threading.Event()
+        test = dependency(timeout=0.05, max_concurrency=1, max_wait=0.05)
+        test.call(release.wait, (5,), fallback=None)  # Gives up, the call keeps its slot
+
+        with self.assertRaises(DependencyUnavailable) as raised:
+            test.call(lambda: "ok")
+        self.assertEqual(raised.exception.reason, "busy")
+
+        release.set()
+        self.assertEqual(test.call(lambda: "ok"), "ok")
+        self.assertEqual(dependency_stats("test")["busy"], 1)
+
+
+@override_settings(
+    OUTBOUND_DEPENDENCIES={
+        "llm": {"timeout": 1, "failure_threshold": 2, "reset_timeout": 60},
+        "sms": {"timeout": 1, "failure_threshold": 2, "reset_timeout": 60},
+    }
+)
+class IntegrationTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        outbound._dependencies.clear()
+        patcher = mock.patch.object(outbound.logger, "warning")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_gateway_failures_keep_comments_pending(self):
+        """
+        Test that a failing LLM gateway raises DependencyUnavailable, then is not called.
+        """
+        client = mock.Mock()
+        client.chat.completions.create.side_effect = openai.APIConnectionError(
+            request=mock.Mock()
+        )
+        with mock.patch("AI_notAPP.connect_to_GPT.get_client", return_value=client):
+            for _ in range(3):
+                with self.assertRaises(DependencyUnavailable):
+                    comment_ban_GPT_batch(["Nice"])
+            # The single-comment check does not accept the comment either
+            with self.assertRaises(DependencyUnavailable):
+                comment_ban_GPT("Nice")
+        self.assertEqual(client.chat.completions.create.call_count, 2)
+        self.assertEqual(client.chat.completions.create.call_args.kwargs["timeout"], 1)
+
+        stats = dependency_stats("llm")
+        self.assertEqual((stats["failure"], stats["rejected"], stats["fallback"]), (2, 2, 0))
+
+    def test_sms_network_errors_are_raised(self):
+        """
+        Test that network errors are raised (the task retries), refused numbers are not.
+        """
+        with mock.patch("kavenegar.KavenegarAPI") as api:
+            api.return_value.sms_send.side_effect = kavenegar.HTTPException("timeout")
+            with self.assertRaises(DependencyUnavailable):
+                send_temporary_code(phone_number="+989123456789", code="1234")
+
+            api.return_value.sms_send.side_effect = kavenegar.APIException("invalid")
+            with mock.patch("builtins.print"):
+                send_temporary_code(phone_number="+989123456789", code="1234")
+        self.assertEqual(api.return_value.sms_send.call_args.args[0]["receptor"], "+989123456789")
+        self.assertEqual(dependency_stats("sms")["failure"], 1)
+
+    def test_stats_command(self):
+        """
+        Test that the command shows each dependency and can reset the counters.
+        """
+        with mock.patch("kavenegar.KavenegarAPI"):
+            send_temporary_code(phone_number="+989123456789", code="1234")
+        out = StringIO()
+        call_command("outbound_stats", "--reset", stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual([line.split()[0] for line in lines], ["dependency", "llm", "sms"])
+        self.assertEqual(lines[2].split()[1:3], ["1", "1"])
+        self.assertEqual(dependency_stats("sms")["calls"], 0)
@@ -1,6 +1,22 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def ensure_search_index(sender, using, **kwargs):
+    """
+    Re-creates the full-text index triggers after migrations that remade the Product table.
+    """
+    from django.db import connections
+    from .services.search_service import install_search_index
+
+    install_search_index(connections[using])
 
 
 class ProductConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Product'
+
+    def ready(self):
+        from . import signals  # noqa: F401  Registers the cache invalidation receivers
+
+        post_migrate.connect(ensure_search_index, sender=self)
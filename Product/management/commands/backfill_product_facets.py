@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from Product.services.facet_service import rebuild_facet_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the ProductFacetCount aggregate from the products. "
+        "Product writes keep it up to date afterwards."
+    )
+
+    def handle(self, *args, **options):
+        combinations = rebuild_facet_counts()
+        self.stdout.write(self.style.SUCCESS(f"{combinations} facet combinations written"))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from Product.models import Product, ProductListing
+from Product.services.listing_service import products_for_listing, save_listings
+
+
+class Command(BaseCommand):
+    help = (
+        "Builds (or rebuilds) the ProductListing read model from Product, "
+        "MainImage and the related names, in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Products loaded and upserted per query.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options["batch_size"], 1)
+        written = 0
+        last_id = 0
+
+        # Walk the products by id (keyset, no OFFSET), one transaction per batch
+        while True:
+            products = list(
+                products_for_listing().filter(pk__gt=last_id).order_by("pk")[:batch_size]
+            )
+            if not products:
+                break
+            with transaction.atomic():
+                written += save_listings(products)
+            last_id = products[-1].pk
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{written} listings written")
+
+        # Rows left behind by products deleted while the signals were not connected
+        deleted, _ = ProductListing.objects.exclude(
+            id__in=Product.objects.values("id")
+        ).delete()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{written} listings written, {deleted} stale listings deleted")
+        )
@@ -0,0 +1,132 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from Product.models import ProductListing
+from Product.queries import SORT_ORDERINGS, sorted_products_queryset
+
+
+class Rollback(Exception):
+    """
+    Raised to roll the synthetic rows back at the end of the benchmark.
+    """
+
+
+class Command(BaseCommand):
+    help = (
+        "Times the first page of products_sort_show for every sort, with and without "
+        "a price range, while the listing table grows to --products rows. "
+        "The rows are synthetic and rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--products",
+            type=int,
+            default=1_000_000,
+            help="Number of listing rows at the end of the benchmark.",
+        )
+        parser.add_argument(
+            "--steps",
+            type=int,
+            default=3,
+            help="Number of table sizes measured (each 10x the previous one).",
+        )
+        parser.add_argument(
+            "--industries",
+            type=int,
+            default=10,
+            help="Rows are spread evenly over this many industries.",
+        )
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def cases(self):
+        """
+        Returns (name, queryset) pairs for the first page of each request shape.
+        """
+        cases = []
+        for sort, ordering in SORT_ORDERINGS.items():
+            for prices in ({}, {"min_price": 100, "max_price": 500}):
+                name = f"sort={sort}" + (" price=100..500" if prices else "")
+                queryset = sorted_products_queryset("Physical", 1, sort=sort, **prices)
+                cases.append((name, queryset.order_by(*ordering)))
+        return cases
+
+    def insert_rows(self, start, stop, options):
+        """
+        Inserts listing rows with ids in [start, stop): random prices and dates.
+        """
+        now = timezone.now()
+        industries = options["industries"]
+        for batch_start in range(start, stop, options["batch_size"]):
+            batch_stop = min(batch_start + options["batch_size"], stop)
+            ProductListing.objects.bulk_create(
+                ProductListing(
+                    id=row_id,
+                    title=f"Product {row_id}",
+                    descriptions="",
+                    price=Decimal(random.randint(0, 100_000)) / 100,
+                    active=True,
+                    product_type="Physical",
+                    created_at=now - timedelta(seconds=random.randint(0, 10**8)),
+                    industry_id=row_id % industries + 1,
+                    store_owner_id=row_id % 1000 + 1,
+                )
+                for row_id in range(batch_start, batch_stop)
+            )
+
+    def time_first_page(self, queryset, options):
+        """
+        Returns the median time in milliseconds to read the first page.
+        """
+        durations = []
+        for _ in range(options["repeat"]):
+            started = time.perf_counter()
+            list(queryset[: options["page_size"] + 1])
+            durations.append((time.perf_counter() - started) * 1000)
+        return statistics.median(durations)
+
+    def handle(self, *args, **options):
+        if ProductListing.objects.exists():
+            raise CommandError(
+                "The listing table is not empty: run the benchmark on an empty database."
+            )
+
+        sizes = [
+            max(options["products"] // 10**step, 1)
+            for step in reversed(range(options["steps"]))
+        ]
+        results = {}
+        try:
+            with transaction.atomic():
+                inserted = 0
+                for size in sizes:
+                    self.insert_rows(inserted + 1, size + 1, options)
+                    inserted = size
+                    with connection.cursor() as cursor:
+                        cursor.execute("ANALYZE")
+                    for name, queryset in self.cases():
+                        results.setdefault(name, []).append(
+                            self.time_first_page(queryset, options)
+                        )
+                    self.stdout.write(f"{size} rows measured")
+                raise Rollback
+        except Rollback:
+            pass
+
+        header = f"{'first page (ms, median)':<32}" + "".join(
+            f"{size:>12}" for size in sizes
+        )
+        self.stdout.write(header)
+        for name, timings in results.items():
+            self.stdout.write(
+                f"{name:<32}" + "".join(f"{timing:>12.3f}" for timing in timings)
+            )
@@ -0,0 +1,171 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from AuthenticationSystem.models import CustomUser
+from Product.models import Product
+from Product.queries import (
+    SORT_ORDERINGS,
+    sorted_products_queryset,
+    store_products_queryset,
+)
+
+
+# SQLite: "SCAN <table>" without an index is a full table scan
+# ("SCAN <table> USING INDEX ..." and virtual tables such as FTS5 are fine)
+SQLITE_FULL_SCAN = re.compile(r"\bSCAN (\S+)(?!.*\b(USING|VIRTUAL TABLE)\b)")
+# PostgreSQL: a sequential scan reads the whole table
+POSTGRES_FULL_SCAN = re.compile(r"Seq Scan on (\S+)")
+
+# A sort step means the whole filtered set is read and sorted before LIMIT applies,
+# instead of the first rows being read in index order
+SQLITE_SORT = re.compile(r"USE TEMP B-TREE FOR ORDER BY")
+POSTGRES_SORT = re.compile(r"^\s*(?:->\s*)?Sort\b", re.MULTILINE)
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs EXPLAIN QUERY PLAN (SQLite) / EXPLAIN (PostgreSQL) on the querysets "
+        "used by the Product views and fails if any of them needs a full table scan "
+        "or sorts its whole result to return one page."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="PostgreSQL only: use EXPLAIN ANALYZE (executes the queries).",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=20,
+            help="LIMIT applied to the list querysets, like one page of the API.",
+        )
+
+    def view_querysets(self, page_size):
+        """
+        Returns (name, queryset) pairs shaped like the queries the views run.
+        Filter values only have to be of the right type, they do not need to exist.
+        """
+        store_owner = CustomUser(id=1, user_type="store_owner")
+
+        def page(queryset, sort="newest"):
+            return queryset.order_by(*SORT_ORDERINGS[sort])[: page_size + 1]
+
+        return [
+            (
+                "products_sort_show (physical)",
+                page(sorted_products_queryset("Physical", 1)),
+            ),
+            (
+                "products_sort_show (physical, title)",
+                page(sorted_products_queryset("Physical", 1, title="phone")),
+            ),
+            (
+                "products_sort_show (digital)",
+                page(sorted_products_queryset("Digital", 1, type_of_file=1)),
+            ),
+            (
+                "products_sort_show (digital, title)",
+                page(
+                    sorted_products_queryset(
+                        "Digital", 1, title="phone", type_of_file=1
+                    )
+                ),
+            ),
+            (
+                "products_sort_show (physical, sort=price)",
+                page(sorted_products_queryset("Physical", 1), "price"),
+            ),
+            (
+                "products_sort_show (physical, sort=-price, price range)",
+                page(
+                    sorted_products_queryset(
+                        "Physical", 1, min_price=10, max_price=100, sort="-price"
+                    ),
+                    "-price",
+                ),
+            ),
+            (
+                "products_sort_show (physical, newest, price range)",
+                page(
+                    sorted_products_queryset("Physical", 1, min_price=10, max_price=100)
+                ),
+            ),
+            (
+                "products_sort_show (physical, title, sort=price)",
+                page(
+                    sorted_products_queryset("Physical", 1, title="phone", sort="price"),
+                    "price",
+                ),
+            ),
+            (
+                "products_sort_show (digital, sort=price)",
+                page(
+                    sorted_products_queryset("Digital", 1, type_of_file=1, sort="price"),
+                    "price",
+                ),
+            ),
+            (
+                "show_products_by_store (public)",
+                page(store_products_queryset(store_owner)),
+            ),
+            (
+                "show_products_by_store (owner)",
+                page(store_products_queryset(store_owner, is_owner=True)),
+            ),
+            ("product_detail", Product.objects.filter(id=1)),
+        ]
+
+    def full_scans(self, plan):
+        """
+        Returns the names of the tables read with a full scan in an EXPLAIN output.
+        """
+        if connection.vendor == "sqlite":
+            return [match.group(1) for match in SQLITE_FULL_SCAN.finditer(plan)]
+        return [match.group(1) for match in POSTGRES_FULL_SCAN.finditer(plan)]
+
+    def sorts(self, plan):
+        """
+        Tells whether an EXPLAIN output sorts the rows instead of reading them in index order.
+        """
+        pattern = SQLITE_SORT if connection.vendor == "sqlite" else POSTGRES_SORT
+        return bool(pattern.search(plan))
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ("sqlite", "postgresql"):
+            raise CommandError(f"Unsupported database vendor: {connection.vendor}")
+
+        explain_options = {}
+        if connection.vendor == "postgresql" and options["analyze"]:
+            explain_options["analyze"] = True
+
+        failures = []
+        for name, queryset in self.view_querysets(options["page_size"]):
+            with transaction.atomic():
+                if connection.vendor == "postgresql":
+                    # On small tables Postgres prefers a sequential scan even when
+                    # an index exists; disable it so the plan shows whether one is usable.
+                    with connection.cursor() as cursor:
+                        cursor.execute("SET LOCAL enable_seqscan = off")
+                plan = queryset.explain(**explain_options)
+
+            scans = self.full_scans(plan)
+            if scans:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"FULL SCAN  {name}: {', '.join(scans)}"))
+            elif self.sorts(plan):
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"SORT       {name}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"OK         {name}"))
+            if options["verbosity"] > 1:
+                self.stdout.write(plan)
+
+        if failures:
+            raise CommandError(
+                f"{len(failures)} queryset(s) fall back to a full table scan or a sort: "
+                + "; ".join(failures)
+            )
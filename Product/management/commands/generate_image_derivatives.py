@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from Product.models import ProductImage
+from Product.services.image_derivatives import (
+    generate_derivatives,
+    image_pool,
+    worker_count,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates the thumbnails and WebP variants of product images that do not "
+        "have them yet (images uploaded before the pipeline, or failed), in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Images loaded per query.",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Regenerate every image, e.g. after DERIVATIVES changed.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options["batch_size"], 1)
+        images = ProductImage.objects.all()
+        if not options["all"]:
+            images = images.exclude(derivatives_status=ProductImage.DERIVATIVES_DONE)
+
+        pool = image_pool()
+        done = failed = 0
+        last_id = 0
+
+        def generate(product_image_id):
+            try:
+                return generate_derivatives(product_image_id, pool=pool)
+            finally:
+                connections.close_all()
+
+        # Walk the images by id (keyset, no OFFSET); each thread reads one file and
+        # waits for the process pool, so every worker process is kept busy
+        workers = worker_count()
+        with ThreadPoolExecutor(max_workers=workers) as threads:
+            run = threads.map if workers > 1 else map
+            while True:
+                ids = list(
+                    images.filter(pk__gt=last_id)
+                    .order_by("pk")
+                    .values_list("pk", flat=True)[:batch_size]
+                )
+                if not ids:
+                    break
+                for product_image in run(generate, ids):
+                    if product_image is None:
+                        continue
+                    if product_image.derivatives_status == ProductImage.DERIVATIVES_DONE:
+                        done += 1
+                    else:
+                        failed += 1
+                last_id = ids[-1]
+                if options["verbosity"] > 1:
+                    self.stdout.write(f"{done} images done, {failed} failed")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{done} images processed, {failed} could not be read")
+        )
@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from AuthenticationSystem.models import CustomUser
+from Product.services.import_service import (
+    DEFAULT_BATCH_SIZE,
+    FORMATS,
+    detect_format,
+    import_products,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports products of one store owner from a CSV or JSONL file "
+        "(same columns as the products/import/ endpoint)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSONL file.")
+        parser.add_argument(
+            "--store-owner", type=int, required=True, help="ID of the store owner."
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="File format (default: from the file extension).",
+        )
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        store_owner = CustomUser.objects.filter(
+            id=options["store_owner"], user_type="store_owner"
+        ).first()
+        if not store_owner:
+            raise CommandError("No store owner found with the given ID.")
+
+        file_format = options["format"] or detect_format(options["path"])
+        started = time.perf_counter()
+        try:
+            with open(options["path"], "rb") as stream:
+                result = import_products(
+                    stream,
+                    file_format,
+                    store_owner=store_owner,
+                    batch_size=max(options["batch_size"], 1),
+                )
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for error in result.errors:
+            self.stderr.write(f"row {error['row']}: {error['error']}")
+        if result.file_error:
+            raise CommandError(
+                f"row {result.file_error['row']}: {result.file_error['error']} "
+                f"(import stopped, {result.created} products created before it)"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result.created} products created, {len(result.errors)} rows rejected "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+        )
@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from MVP.outbound import dependency_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Shows the calls, failures and latency of each remote service since the last "
+        "reset, summed over every web and worker process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "dependencies",
+            nargs="*",
+            help="Dependencies to show (default: every one of OUTBOUND_DEPENDENCIES).",
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Set the counters back to zero after showing them.",
+        )
+
+    def handle(self, *args, **options):
+        names = options["dependencies"] or sorted(
+            getattr(settings, "OUTBOUND_DEPENDENCIES", {})
+        )
+        columns = (
+            "calls", "success", "failure", "timeout", "error", "rejected", "busy", "fallback"
+        )
+
+        def show(value, unit=""):
+            if value is None:
+                return "-"
+            if isinstance(value, float):
+                return f"{value:.1%}" if unit == "%" else f"{value:.0f}"
+            return str(value)
+
+        self.stdout.write(
+            f"{'dependency':<12}"
+            + "".join(f"{column:>9}" for column in columns)
+            + f"{'fail %':>9}{'mean ms':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        )
+        for name in names:
+            stats = dependency_stats(name)
+            self.stdout.write(
+                f"{name:<12}"
+                + "".join(f"{stats[column]:>9}" for column in columns)
+                + f"{show(stats['failure_rate'], '%'):>9}"
+                + "".join(
+                    f"{show(stats[key]):>9}"
+                    for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms")
+                )
+            )
+            if options["reset"]:
+                reset_stats(name)
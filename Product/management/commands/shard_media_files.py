@@ -0,0 +1,112 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from AuthenticationSystem.models import CustomUser
+from Document.models import Blog
+from Product.models import ProductImage
+from Product.services.cache_service import (
+    BLOGS,
+    PRODUCT_BLOGS,
+    bump_product_generations,
+    invalidate,
+)
+from Product.services.listing_service import products_for_listing, save_listings
+from Product.services.media_paths import is_sharded, shard
+
+
+def refresh_products(product_images):
+    # Listing rows and cached product pages hold the image URLs
+    products = list(
+        products_for_listing().filter(
+            pk__in={product_image.product_id for product_image in product_images}
+        )
+    )
+    save_listings(products)
+    for product in products:
+        bump_product_generations(product)
+
+
+def refresh_blogs(blogs):
+    invalidate((BLOGS, "all"), *[(PRODUCT_BLOGS, blog.product_id) for blog in blogs])
+
+
+# (model, file field, what to refresh once rows point at their new paths)
+MEDIA_FIELDS = (
+    (ProductImage, "image", refresh_products),
+    (Blog, "content_file", refresh_blogs),
+    (CustomUser, "store_logo", None),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves the files of product images, blog contents and store logos from their "
+        "flat upload directories into hashed two-level subdirectories, in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows moved per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options["batch_size"], 1)
+        for model, field_name, refresh in MEDIA_FIELDS:
+            moved, skipped = self.move_field(model, field_name, refresh, batch_size, options)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{model.__name__}.{field_name}: {moved} files moved, {skipped} skipped"
+                )
+            )
+
+    def move_field(self, model, field_name, refresh, batch_size, options):
+        """
+        The site keeps running during the move: each file is first copied to its new
+        path, then its row is switched with an UPDATE that only matches if the row still
+        holds the old path, and the old file is released only after that commit.
+        A row changed meanwhile keeps its new value and the copy is released instead.
+        """
+        storage = model._meta.get_field(field_name).storage
+        rows = model.objects.exclude(**{field_name: ""}).exclude(
+            **{f"{field_name}__isnull": True}
+        )
+        moved = skipped = 0
+        last_id = 0
+
+        # Walk the rows by id (keyset, no OFFSET)
+        while True:
+            batch = list(rows.filter(pk__gt=last_id).order_by("pk")[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].pk
+
+            changed = []
+            with transaction.atomic():
+                for instance in batch:
+                    old_name = getattr(instance, field_name).name
+                    if is_sharded(old_name) or not storage.exists(old_name):
+                        skipped += 1
+                        continue
+                    with storage.open(old_name, "rb") as old_file:
+                        new_name = storage.save(shard(old_name), old_file)
+                    updated = model.objects.filter(
+                        pk=instance.pk, **{field_name: old_name}
+                    ).update(**{field_name: new_name})
+                    if updated:
+                        transaction.on_commit(
+                            lambda name=old_name: storage.delete(name)
+                        )
+                        changed.append(instance)
+                        moved += 1
+                    else:
+                        storage.delete(new_name)
+                        skipped += 1
+                if changed and refresh:
+                    refresh(changed)
+
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{model.__name__}: {moved} files moved")
+        return moved, skipped
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.7 on 2026-10-17 00:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AuthenticationSystem', '0003_customuser_industry_delete_store_industry'),
+        ('Product', '0002_product_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['product_type', 'industry', '-created_at', '-id'], name='product_type_industry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['product_type', 'industry', 'active', '-created_at', '-id'], name='product_type_ind_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['product_type', 'industry', 'type_of_file', '-created_at', '-id'], name='product_type_ind_file_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['store_owner', 'active', '-created_at', '-id'], name='product_store_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['store_owner', '-created_at', '-id'], name='product_store_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('active', True)), fields=['-created_at', '-id'], name='product_active_created_idx'),
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 5.1.7 on 2026-10-17 00:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Columns copied from Product as they are (listing_service.PRODUCT_FIELDS)
+PRODUCT_FIELDS = (
+    "title",
+    "descriptions",
+    "price",
+    "active",
+    "product_type",
+    "created_at",
+    "size",
+    "industry_id",
+    "type_of_file_id",
+    "store_owner_id",
+)
+
+
+def fill_listings(apps, schema_editor, batch_size=1000):
+    """
+    Builds the listing row of every existing product, like backfill_product_listings;
+    the signals keep the table up to date afterwards.
+    """
+    Product = apps.get_model("Product", "Product")
+    ProductListing = apps.get_model("Product", "ProductListing")
+    MainImage = apps.get_model("Product", "MainImage")
+    last_id = 0
+    while True:
+        products = list(
+            Product.objects.select_related("industry", "type_of_file", "store_owner")
+            .filter(pk__gt=last_id)
+            .order_by("pk")[:batch_size]
+        )
+        if not products:
+            break
+        images = {
+            main.product_id: main.product_image.image
+            for main in MainImage.objects.select_related("product_image").filter(
+                product__in=products
+            )
+        }
+        listings = []
+        for product in products:
+            listing = ProductListing(id=product.pk)
+            for field in PRODUCT_FIELDS:
+                setattr(listing, field, getattr(product, field))
+            listing.industry_name = product.industry.name if product.industry else ""
+            listing.type_of_file_name = (
+                product.type_of_file.name_of_type if product.type_of_file else ""
+            )
+            listing.store_name = product.store_owner.username
+            image = images.get(product.pk)
+            listing.main_image_url = image.url if image else ""
+            listings.append(listing)
+        ProductListing.objects.bulk_create(listings)
+        last_id = products[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AuthenticationSystem', '0003_customuser_industry_delete_store_industry'),
+        ('Product', '0003_product_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductListing',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=150)),
+                ('descriptions', models.TextField()),
+                ('price', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('active', models.BooleanField(default=True)),
+                ('product_type', models.CharField(max_length=10)),
+                ('created_at', models.DateTimeField()),
+                ('size', models.IntegerField(blank=True, null=True)),
+                ('industry_name', models.CharField(blank=True, max_length=50)),
+                ('type_of_file_name', models.CharField(blank=True, max_length=12)),
+                ('store_name', models.CharField(blank=True, max_length=50)),
+                ('main_image_url', models.CharField(blank=True, max_length=255)),
+                ('industry', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='Product.industry')),
+                ('store_owner', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='AuthenticationSystem.customuser')),
+                ('type_of_file', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='Product.typeoffile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['product_type', 'industry', '-created_at', '-id'], name='listing_type_industry_idx'), models.Index(fields=['product_type', 'industry', 'active', '-created_at', '-id'], name='listing_type_ind_active_idx'), models.Index(fields=['product_type', 'industry', 'type_of_file', '-created_at', '-id'], name='listing_type_ind_file_idx'), models.Index(fields=['store_owner', 'active', '-created_at', '-id'], name='listing_store_active_idx'), models.Index(fields=['store_owner', '-created_at', '-id'], name='listing_store_created_idx')],
+            },
+        ),
+        migrations.RunPython(fill_listings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.1.7 on 2026-10-17 00:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+from Product.services.facet_service import price_bucket
+
+
+def fill_facet_counts(apps, schema_editor):
+    """
+    Counts the existing active products, like rebuild_facet_counts(); product writes
+    keep the table up to date afterwards.
+    """
+    Product = apps.get_model("Product", "Product")
+    ProductFacetCount = apps.get_model("Product", "ProductFacetCount")
+    totals = {}
+    rows = (
+        Product.objects.filter(active=True)
+        .values("product_type", "industry_id", "type_of_file_id", "color_id", "price")
+        .annotate(products=Count("id"))
+    )
+    for row in rows:
+        key = (
+            row["product_type"],
+            row["industry_id"],
+            row["type_of_file_id"],
+            row["color_id"],
+            price_bucket(row["price"]),
+        )
+        totals[key] = totals.get(key, 0) + row["products"]
+    fields = ("product_type", "industry_id", "type_of_file_id", "color_id", "price_bucket")
+    ProductFacetCount.objects.bulk_create(
+        ProductFacetCount(count=count, **dict(zip(fields, key))) for key, count in totals.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Product', '0004_product_listing'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product_type', models.CharField(max_length=10)),
+                ('price_bucket', models.PositiveSmallIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('color', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='Product.productcolor')),
+                ('industry', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='Product.industry')),
+                ('type_of_file', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='Product.typeoffile')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('product_type', 'industry', 'type_of_file', 'color', 'price_bucket'), name='product_facet_count_unique')],
+            },
+        ),
+        migrations.RunPython(fill_facet_counts, migrations.RunPython.noop),
+    ]
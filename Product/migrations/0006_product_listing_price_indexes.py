@@ -0,0 +1,26 @@
+# Generated by Django 5.1.7 on 2026-10-17 00:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AuthenticationSystem', '0003_customuser_industry_delete_store_industry'),
+        ('Product', '0005_product_facet_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='productlisting',
+            index=models.Index(fields=['product_type', 'industry', 'price', 'id'], name='listing_ind_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productlisting',
+            index=models.Index(fields=['product_type', 'industry', 'active', 'price', 'id'], name='listing_ind_active_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productlisting',
+            index=models.Index(fields=['product_type', 'industry', 'type_of_file', 'price', 'id'], name='listing_ind_file_price_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.1.7 on 2026-10-17 01:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F, Q
+
+
+KEY = ("product_type", "industry_id", "type_of_file_id", "color_id", "price_bucket")
+ID_COLUMNS = ("industry_id", "type_of_file_id", "color_id")
+
+
+def merge_null_rows(apps, schema_editor):
+    """
+    Moves the rows with a NULL id to the combination with 0 instead, merging the
+    duplicates NULLs allowed (their counts are summed).
+    """
+    ProductFacetCount = apps.get_model("Product", "ProductFacetCount")
+    null_rows = ProductFacetCount.objects.filter(
+        Q(industry_id__isnull=True) | Q(type_of_file_id__isnull=True) | Q(color_id__isnull=True)
+    )
+    totals = {}
+    for row in null_rows.values(*KEY, "count"):
+        key = tuple(row[field] or 0 if field in ID_COLUMNS else row[field] for field in KEY)
+        totals[key] = totals.get(key, 0) + row["count"]
+    null_rows.delete()
+    for key, count in totals.items():
+        lookup = dict(zip(KEY, key))
+        if not ProductFacetCount.objects.filter(**lookup).update(count=F("count") + count):
+            ProductFacetCount.objects.create(count=count, **lookup)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Product', '0008_media_blob'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_null_rows, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='productfacetcount',
+            name='color',
+            field=models.ForeignKey(db_constraint=False, default=0, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='Product.productcolor'),
+        ),
+        migrations.AlterField(
+            model_name='productfacetcount',
+            name='industry',
+            field=models.ForeignKey(db_constraint=False, default=0, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='Product.industry'),
+        ),
+        migrations.AlterField(
+            model_name='productfacetcount',
+            name='type_of_file',
+            field=models.ForeignKey(db_constraint=False, default=0, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='Product.typeoffile'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-17 01:41
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Product', '0009_product_facet_count_no_nulls'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='product',
+            name='product_type_industry_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='product_type_ind_active_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='product_type_ind_file_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='product_store_active_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='product_store_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='product_active_created_idx',
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 
+from .services.blob_storage import content_addressed_storage
+
 
 # Model representing an industry category
 class Industry(models.Model):
@@ -134,12 +136,29 @@ class ProductImage(models.Model):
         Product, on_delete=models.CASCADE, related_name="images"
     )  # Links product to its images (one-to-many relationship)
     image = models.ImageField(
-        upload_to="product_images/"
-    )  # Stores the image file in the product_images folder
+        upload_to="product_images/", storage=content_addressed_storage
+    )  # Stores the image file in product_images/ab/cd/, one copy per distinct content
     uploaded_at = models.DateTimeField(
         auto_now_add=True
     )  # Records the date and time when the image was uploaded
 
+    # Resized variants (thumbnails, WebP) made in the background after the upload,
+    # see Product/services/image_derivatives.py:
+    # {"thumbnail": {"path": "...", "width": 320, "height": 240}, ...}
+    DERIVATIVES_PENDING = "pending"
+    DERIVATIVES_DONE = "done"
+    DERIVATIVES_FAILED = "failed"
+    derivatives = models.JSONField(default=dict, blank=True)
+    derivatives_status = models.CharField(
+        max_length=10,
+        choices=[
+            (DERIVATIVES_PENDING, "Pending"),
+            (DERIVATIVES_DONE, "Done"),
+            (DERIVATIVES_FAILED, "Failed"),
+        ],
+        default=DERIVATIVES_PENDING,
+    )
+
     def __str__(self):
         return f"Image for {self.product.title}"  # String representation of the image
 
@@ -155,3 +174,153 @@ class MainImage(models.Model):
 
     def __str__(self):
         return f"Main image for {self.product.title}"  # String representation of the main image
+
+
+# Denormalized read model behind the listing endpoints: one flat row per product
+# holding exactly the fields of a listing card, so lists are read from a single
+# table without joins. Maintained on write by Product/signals.py
+# (see Product/services/listing_service.py), rebuilt with `backfill_product_listings`.
+class ProductListing(models.Model):
+    id = models.BigIntegerField(primary_key=True)  # Same id as the product
+    title = models.CharField(max_length=150)
+    descriptions = models.TextField()
+    price = models.DecimalField(decimal_places=2, default=0, max_digits=10)
+    active = models.BooleanField(default=True)
+    product_type = models.CharField(max_length=10)
+    created_at = models.DateTimeField()
+    size = models.IntegerField(null=True, blank=True)
+
+    # Filter columns, without database constraints: rows follow their product
+    industry = models.ForeignKey(
+        "Industry",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    type_of_file = models.ForeignKey(
+        "TypeOfFile",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    store_owner = models.ForeignKey(
+        "AuthenticationSystem.CustomUser",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+
+    # Copies of the joined display fields
+    industry_name = models.CharField(max_length=50, blank=True)
+    type_of_file_name = models.CharField(max_length=12, blank=True)
+    store_name = models.CharField(max_length=50, blank=True)
+    main_image_url = models.CharField(max_length=255, blank=True)
+    main_image_thumbnail_url = models.CharField(max_length=255, blank=True)
+    main_image_webp_url = models.CharField(max_length=255, blank=True)
+
+    def __str__(self):
+        return self.title
+
+    class Meta:
+        # Indexes matched to the filters of the listing endpoints (see Product/queries.py).
+        # Each one ends with the keyset ordering so pages are read in index order.
+        # Check them with: python manage.py explain_product_queries
+        indexes = [
+            models.Index(
+                fields=["product_type", "industry", "-created_at", "-id"],
+                name="listing_type_industry_idx",
+            ),
+            models.Index(
+                fields=["product_type", "industry", "active", "-created_at", "-id"],
+                name="listing_type_ind_active_idx",
+            ),
+            models.Index(
+                fields=["product_type", "industry", "type_of_file", "-created_at", "-id"],
+                name="listing_type_ind_file_idx",
+            ),
+            # sort=price|-price (one index serves both directions) and price ranges
+            models.Index(
+                fields=["product_type", "industry", "price", "id"],
+                name="listing_ind_price_idx",
+            ),
+            models.Index(
+                fields=["product_type", "industry", "active", "price", "id"],
+                name="listing_ind_active_price_idx",
+            ),
+            models.Index(
+                fields=["product_type", "industry", "type_of_file", "price", "id"],
+                name="listing_ind_file_price_idx",
+            ),
+            models.Index(
+                fields=["store_owner", "active", "-created_at", "-id"],
+                name="listing_store_active_idx",
+            ),
+            models.Index(
+                fields=["store_owner", "-created_at", "-id"],
+                name="listing_store_created_idx",
+            ),
+        ]
+
+
+# Aggregate behind the facets endpoint: how many active products share one combination
+# of the facet values. Kept up to date by the Product signals (+1/-1 per write, see
+# Product/services/facet_service.py), so facet counts are sums over these rows, whose
+# number depends on the combinations in use, not on the number of products.
+class ProductFacetCount(models.Model):
+    # "No industry / file type / color" is stored as NONE, not NULL: NULLs are all
+    # distinct in the unique constraint, so concurrent first inserts of a combination
+    # with a NULL would create duplicate rows
+    NONE = 0
+
+    product_type = models.CharField(max_length=10)
+    industry = models.ForeignKey(
+        "Industry",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        default=NONE,
+        related_name="+",
+    )
+    type_of_file = models.ForeignKey(
+        "TypeOfFile",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        default=NONE,
+        related_name="+",
+    )
+    color = models.ForeignKey(
+        "ProductColor",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        default=NONE,
+        related_name="+",
+    )
+    price_bucket = models.PositiveSmallIntegerField()  # Index in facet_service.PRICE_BUCKETS
+    count = models.PositiveIntegerField(default=0)  # Active products in this combination
+
+    def __str__(self):
+        return f"{self.product_type}/{self.industry_id}/{self.price_bucket}: {self.count}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product_type", "industry", "type_of_file", "color", "price_bucket"],
+                name="product_facet_count_unique",
+            ),
+        ]
+
+
+# One file of the content-addressed storage (Product/services/blob_storage.py), named
+# after the SHA-256 of its bytes, and the number of records pointing at it: identical
+# uploads share one file, which is deleted with its last reference.
+class MediaBlob(models.Model):
+    name = models.CharField(max_length=255, unique=True)  # Path relative to MEDIA_ROOT
+    size = models.BigIntegerField()  # Bytes
+    references = models.PositiveIntegerField(default=0)  # Records using the file
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.references} references)"
@@ -0,0 +1,114 @@
+import base64
+import json
+from collections import namedtuple
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.response import Response
+
+
+# Default ordering for list endpoints: newest first, id breaks ties
+DEFAULT_ORDERING = ("-created_at", "-id")
+
+# One page of results and the opaque cursor of the next page (None on the last page)
+KeysetPage = namedtuple("KeysetPage", ["items", "next"])
+
+
+def get_page_size(request):
+    """
+    Reads the optional 'page_size' query parameter, bounded by the settings.
+    """
+    default_size = getattr(settings, "KEYSET_PAGE_SIZE", 20)
+    max_size = getattr(settings, "KEYSET_MAX_PAGE_SIZE", 100)
+    try:
+        page_size = int(request.query_params.get("page_size", default_size))
+    except (TypeError, ValueError):
+        return default_size
+    return min(max(page_size, 1), max_size)
+
+
+def _to_json(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(values):
+    """
+    Packs the ordering values of the last row into an opaque url-safe string.
+    """
+    raw = json.dumps([_to_json(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, model, field_names):
+    """
+    Unpacks a cursor made by encode_cursor() back into typed field values.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(field_names):
+            raise ValueError
+        return [
+            model._meta.get_field(name).to_python(value)
+            for name, value in zip(field_names, values)
+        ]
+    except Exception:
+        raise ValueError("Invalid cursor.")
+
+
+def keyset_filter(ordering, values):
+    """
+    Builds the condition selecting rows strictly after `values` in `ordering`, e.g.
+    for ('-created_at', '-id'): created_at < c OR (created_at = c AND id < i).
+    A plain range on the first column is added so the database can seek the index.
+    """
+    condition = Q()
+    equal_prefix = {}
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition |= Q(**equal_prefix, **{f"{name}__{lookup}": value})
+        equal_prefix[name] = value
+
+    first = ordering[0]
+    bound = "lte" if first.startswith("-") else "gte"
+    return condition & Q(**{f"{first.lstrip('-')}__{bound}": values[0]})
+
+
+def paginate_keyset(queryset, request, ordering=DEFAULT_ORDERING):
+    """
+    Returns (KeysetPage, error_response) for the page selected by the 'cursor'
+    query parameter. Uses no OFFSET and no COUNT(*): the page is read with
+    `WHERE (ordering) after cursor ORDER BY ordering LIMIT page_size + 1`,
+    and the extra row only tells whether a next page exists.
+    """
+    field_names = [field.lstrip("-") for field in ordering]
+    page_size = get_page_size(request)
+    cursor = request.query_params.get("cursor")
+
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        try:
+            values = decode_cursor(cursor, queryset.model, field_names)
+        except ValueError as e:
+            return None, Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        queryset = queryset.filter(keyset_filter(ordering, values))
+
+    rows = list(queryset[: page_size + 1])
+    items = rows[:page_size]
+
+    next_cursor = None
+    if len(rows) > page_size:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, name) for name in field_names])
+
+    return KeysetPage(items, next_cursor), None
+
@@ -0,0 +1,84 @@
+from django.db.models import DecimalField, F, Func
+
+from .models import ProductListing
+from .pagination import DEFAULT_ORDERING
+from .services.search_service import filter_by_text
+
+
+# Queryset builders shared by the views and the explain_product_queries command,
+# so the plans checked by the command are exactly the ones the views run.
+# Listing endpoints read the flat ProductListing table: one table, no joins.
+
+# Values of the 'sort' parameter of products_sort_show and their keyset ordering.
+# Every ordering ends with id so it is total, and each one matches an index of
+# ProductListing, so the first page is read in index order instead of sorting.
+SORT_ORDERINGS = {
+    "newest": DEFAULT_ORDERING,
+    "price": ("price", "id"),
+    "-price": ("-price", "-id"),
+}
+
+
+def sorted_products_queryset(
+    product_type,
+    industry,
+    title=None,
+    type_of_file=None,
+    min_price=None,
+    max_price=None,
+    sort="newest",
+):
+    """
+    Returns the queryset behind products_sort_show,
+    or None if product_type is neither 'Physical' nor 'Digital'.
+    min_price and max_price are optional inclusive bounds; `sort` (a key of
+    SORT_ORDERINGS) decides how they are applied, the ordering itself is set
+    by the pagination.
+    """
+    if str(product_type).lower() == "physical":
+        products_list = ProductListing.objects.filter(
+            product_type=product_type, industry=industry
+        )
+        if title:
+            products_list = products_list.filter(active=True)
+    elif str(product_type).lower() == "digital":
+        products_list = ProductListing.objects.filter(
+            product_type=product_type,
+            industry=industry,
+            type_of_file=type_of_file,
+        )
+    else:
+        return None
+
+    if min_price is not None or max_price is not None:
+        price = "price"
+        if SORT_ORDERINGS[sort][0].lstrip("-") != "price":
+            # Sorted by date: check the bounds on the rows read in date order.
+            # A unary plus keeps the planner off the price index, whose range seek
+            # would return the whole filtered set unsorted.
+            products_list = products_list.alias(
+                row_price=Func(
+                    F("price"),
+                    template="(+%(expressions)s)",
+                    output_field=DecimalField(),
+                )
+            )
+            price = "row_price"
+        if min_price is not None:
+            products_list = products_list.filter(**{f"{price}__gte": min_price})
+        if max_price is not None:
+            products_list = products_list.filter(**{f"{price}__lte": max_price})
+    if title:
+        products_list = filter_by_text(products_list, title)
+    return products_list
+
+
+def store_products_queryset(store_owner, is_owner=False):
+    """
+    Returns the queryset behind show_products_by_store.
+    The owner sees all of their products, everyone else only active ones.
+    """
+    products_list = ProductListing.objects.filter(store_owner=store_owner)
+    if is_owner:
+        return products_list
+    return products_list.filter(active=True)
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Product, Industry, MainImage, ProductImage
+from .models import Product, Industry, MainImage, ProductImage, ProductListing
 
 
 # Serializer for the MainImage model (to show only the main image)
@@ -15,7 +15,10 @@ class MainImageSerializer(serializers.ModelSerializer):
 class ProductImageSerializer(serializers.ModelSerializer):
     class Meta:
         model = ProductImage
-        fields = ["image"]  # Include the image field to show all images of the product
+        fields = [
+            "image",  # Include the image field to show all images of the product
+            "derivatives",  # Paths and sizes of the thumbnails / WebP variants ({} until generated)
+        ]
 
 
 # Serializer for full product details
@@ -45,6 +48,41 @@ class ProductSerializerShow(serializers.ModelSerializer):
         ]
 
 
+# Serializer for the listing cards, read from the flat ProductListing table
+# Same fields as ProductSerializerShow, plus the names that used to need joins
+class ProductListingSerializer(serializers.ModelSerializer):
+    main_image = serializers.CharField(
+        source="main_image_url"
+    )  # URL of the main image ("" if the product has none)
+    main_image_thumbnail = serializers.CharField(
+        source="main_image_thumbnail_url"
+    )  # URL of its 320px JPEG thumbnail ("" until generated)
+    main_image_webp = serializers.CharField(
+        source="main_image_webp_url"
+    )  # URL of its 1024px WebP variant ("" until generated)
+
+    class Meta:
+        model = ProductListing
+        fields = [
+            "title",
+            "descriptions",
+            "industry",
+            "industry_name",
+            "product_type",
+            "type_of_file",
+            "type_of_file_name",
+            "size",
+            "id",
+            "price",
+            "main_image",
+            "main_image_thumbnail",
+            "main_image_webp",
+            "active",
+            "store_owner",
+            "store_name",
+        ]
+
+
 # Serializer for the Industry model
 # Converts Industry model instances to JSON format and vice versa
 class IndustrySerializer(serializers.ModelSerializer):
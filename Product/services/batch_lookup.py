@@ -0,0 +1,62 @@
+from django.core.cache import cache
+
+from Product.models import Product
+from Product.serializers import ProductSerializerFull
+from Product.services.cache_service import PRODUCT, get_generations, list_cache_timeout
+
+
+# Per-product cache entry of the batch lookup. The (PRODUCT, id) generation is part of
+# the key, so a write by the Product signals makes older entries unreachable, including
+# one back-filled by a concurrent batch that read the product before the write.
+PRODUCT_KEY = "product_data_{product_id}_{generation}"
+
+# Cached for ids that do not exist, so repeated misses do not hit the database
+NOT_FOUND = "not_found"
+NOT_FOUND_TIMEOUT = 60
+
+# Maximum number of ids per batch
+MAX_BATCH_SIZE = 100
+
+
+def product_cache_key(product_id, generation):
+    return PRODUCT_KEY.format(product_id=product_id, generation=generation)
+
+
+def get_products(product_ids):
+    """
+    Returns the serialized products (ProductSerializerFull) in the order of
+    `product_ids`, with None for ids that do not exist. One cache get_many,
+    one `id__in` query for the misses and one set_many to back-fill them, plus
+    one get_many for the generations.
+    """
+    unique_ids = list(dict.fromkeys(product_ids))
+    generations = get_generations([(PRODUCT, product_id) for product_id in unique_ids])
+    keys = {
+        product_id: product_cache_key(product_id, generation)
+        for product_id, generation in zip(unique_ids, generations)
+    }
+    found = cache.get_many(keys.values())
+
+    missing = [product_id for product_id, key in keys.items() if key not in found]
+    if missing:
+        products = Product.objects.in_bulk(missing)
+        loaded = {}
+        not_found = {}
+        for product_id in missing:
+            product = products.get(product_id)
+            if product is None:
+                not_found[keys[product_id]] = NOT_FOUND
+            else:
+                loaded[keys[product_id]] = ProductSerializerFull(product).data
+        if loaded:
+            cache.set_many(loaded, timeout=list_cache_timeout())
+        if not_found:
+            cache.set_many(not_found, timeout=NOT_FOUND_TIMEOUT)
+        found.update(loaded)
+        found.update(not_found)
+
+    results = []
+    for product_id in product_ids:
+        data = found.get(keys[product_id])
+        results.append(None if data == NOT_FOUND else data)
+    return results
@@ -0,0 +1,93 @@
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+from Product.services.media_paths import shard, unsharded
+
+
+# Uploads are read this many bytes at a time while hashing
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def content_hash(content):
+    """
+    Returns the SHA-256 hex digest of a File, reading it in chunks
+    (uploads can be large, they are never loaded in memory at once).
+    """
+    digest = hashlib.sha256()
+    for chunk in content.chunks(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File storage where a file is named after the hash of its content:
+    uploading the same bytes twice returns the existing name instead of writing
+    a second copy. Each name has a reference count (Product.models.MediaBlob),
+    incremented by save() and decremented by delete(); the file itself is removed
+    when its last reference is deleted, after the transaction commits.
+
+    Files saved before this storage was used have no MediaBlob row: they belong to
+    one record only and delete() removes them directly.
+    """
+
+    def blob_name(self, name, digest):
+        # <upload_to>/<2 hex>/<2 hex>/<sha256>.<ext>: the digest also fans the files out
+        directory, filename = os.path.split(unsharded(name))
+        extension = os.path.splitext(filename)[1].lower()
+        return shard(os.path.join(directory, f"{digest}{extension}"), digest)
+
+    def _save(self, name, content):
+        from Product.models import MediaBlob
+
+        name = self.blob_name(name, content_hash(content))
+        if not self.exists(name):
+            saved = super()._save(name, content)
+            if saved != name:
+                # Another request wrote the same content meanwhile: keep its copy
+                super().delete(saved)
+
+        with transaction.atomic():
+            blob, created = MediaBlob.objects.get_or_create(
+                name=name, defaults={"size": content.size, "references": 1}
+            )
+            if not created:
+                MediaBlob.objects.filter(pk=blob.pk).update(references=F("references") + 1)
+        return name
+
+    def delete(self, name):
+        from Product.models import MediaBlob
+
+        if not name:
+            return
+        with transaction.atomic():
+            blob = MediaBlob.objects.select_for_update().filter(name=name).first()
+            if blob is None:
+                transaction.on_commit(lambda: super(ContentAddressedStorage, self).delete(name))
+                return
+            if blob.references > 1:
+                MediaBlob.objects.filter(pk=blob.pk).update(references=F("references") - 1)
+                return
+            blob.delete()
+            transaction.on_commit(lambda: self._delete_unreferenced(name))
+
+    def _delete_unreferenced(self, name):
+        from Product.models import MediaBlob
+
+        # The same content may have been uploaded again since the row was deleted
+        if not MediaBlob.objects.filter(name=name).exists():
+            super().delete(name)
+
+
+def content_addressed_storage():
+    """
+    Storage of the deduplicated image fields (a callable keeps it out of the migrations).
+    """
+    return _storage
+
+
+_storage = ContentAddressedStorage()
@@ -0,0 +1,420 @@
+import hashlib
+import math
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import connections
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+
+# Generation counters (tags): every cached response embeds the generation of each
+# tag it depends on. A write bumps the counter, which makes all the old keys
+# unreachable at once (they simply expire), whatever their number.
+GENERATION_KEY = "generation_{scope}_{object_id}"
+
+# Scopes that have a generation counter
+INDUSTRY = "industry"  # Product lists of one industry
+STORE = "store"  # Product lists of one store owner
+PRODUCT = "product"  # Detail of one product
+BLOGS = "blogs"  # The list of all blogs
+PRODUCT_BLOGS = "product_blogs"  # Blogs of one product
+BLOG_COMMENTS = "blog_comments"  # Comments of one blog
+CART = "cart"  # Cart of one user
+
+# Response statuses that cached views store; 404 and empty lists are cached too
+# ("negative caching") so repeated lookups of missing objects do not hit the DB
+CACHED_STATUSES = (200, 404)
+
+# Per-view hit/miss counters of this worker, see cache_hit_rate()
+CACHE_STATS = defaultdict(Counter)
+
+# Single-flight recomputation (stampede protection), see get_or_compute()
+LOCK_TIMEOUT = 10  # Seconds a recompute lock is held at most (if its worker dies)
+LOCK_WAIT = 2.0  # Seconds a worker without a cached value waits for the lock holder
+POLL_INTERVAL = 0.05  # Seconds between two checks while waiting
+STALE_GRACE = 60  # Seconds an expired value is kept to be served during a recompute
+EARLY_REFRESH_BETA = 1.0  # > 1 refreshes earlier, < 1 later, 0 disables early refresh
+
+
+def list_cache_timeout():
+    """
+    Timeout of list caches that are invalidated through generation counters.
+    """
+    return getattr(settings, "PRODUCT_LIST_CACHE_TIMEOUT", 60 * 60 * 6)
+
+
+def catalog_stale_ttl():
+    """
+    Stale-while-revalidate window of the catalog read caches (product detail,
+    product lists, blog list): how long past its soft TTL a response may be served
+    while it is refreshed in the background.
+    """
+    return getattr(settings, "CATALOG_STALE_WHILE_REVALIDATE", 60 * 10)
+
+
+def _seed():
+    # Counters start from the current time, not 1, so a counter that was evicted
+    # and re-created never reuses a generation that older keys were built with.
+    return int(time.time() * 1000)
+
+
+def _generation_key(scope, object_id):
+    return GENERATION_KEY.format(scope=scope, object_id=object_id)
+
+
+def get_generation(scope, object_id):
+    """
+    Returns the current generation of one tag, e.g. (INDUSTRY, 3).
+    """
+    return get_generations([(scope, object_id)])[0]
+
+
+def get_generations(tags):
+    """
+    Returns the current generations of several tags with one cache round trip.
+    """
+    keys = [_generation_key(scope, object_id) for scope, object_id in tags]
+    found = cache.get_many(keys)
+    generations = []
+    for key in keys:
+        generation = found.get(key)
+        if generation is None:
+            cache.add(key, _seed(), timeout=None)
+            generation = cache.get(key)
+        generations.append(generation)
+    return generations
+
+
+class InvalidTagId(ValueError):
+    """
+    Raised by query_id() for a non-integer id; cached_view answers it with 400.
+    """
+
+
+def query_id(request, name):
+    """
+    Returns the query parameter `name` as an int, for tags: the signals bump
+    (PRODUCT, 3), so "03" and "3" must read that same generation.
+    None if the parameter is missing.
+    """
+    value = request.query_params.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise InvalidTagId(f"'{name}' must be an integer.")
+
+
+def bump_generation(scope, object_id):
+    """
+    Moves a tag to a new generation. O(1): no key is deleted.
+    """
+    if object_id is None:
+        return
+    key = _generation_key(scope, object_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The counter does not exist (yet or anymore): start a fresh one
+        cache.set(key, _seed(), timeout=None)
+
+
+def invalidate(*tags):
+    """
+    Invalidates every cached response depending on one of the (scope, object_id) tags.
+    """
+    for scope, object_id in tags:
+        bump_generation(scope, object_id)
+
+
+def bump_product_generations(product, previous=None):
+    """
+    Invalidates every cached list and detail that may contain the product.
+    `previous` is an optional (industry_id, store_owner_id) pair from before an update.
+    """
+    industries = {product.industry_id}
+    stores = {product.store_owner_id}
+    if previous:
+        industries.add(previous[0])
+        stores.add(previous[1])
+
+    invalidate(
+        (PRODUCT, product.pk),
+        *[(INDUSTRY, industry_id) for industry_id in industries],
+        *[(STORE, store_owner_id) for store_owner_id in stores],
+    )
+
+
+def _entry_is_stale(entry, now):
+    """
+    Probabilistic early expiration ("XFetch"): the closer an entry is to its
+    expiry and the longer it took to compute, the more likely one reader
+    refreshes it early, so hot keys are recomputed before they expire.
+    """
+    early = entry["delta"] * EARLY_REFRESH_BETA * -math.log(1.0 - random.random())
+    return now + early >= entry["expires"]
+
+
+def run_in_background(function):
+    """
+    Runs a stale-while-revalidate refresh outside the request.
+    """
+
+    def target():
+        try:
+            function()
+        finally:
+            # The thread opened its own database connections
+            connections.close_all()
+
+    threading.Thread(target=target, daemon=True).start()
+
+
+def _store(backend, key, compute, timeout, stale_ttl):
+    """
+    Computes a value and stores it with its logical expiry. Returns the value.
+    """
+    started = time.time()
+    value = compute()
+    if value is not None:
+        ttl = timeout(value) if callable(timeout) else timeout
+        entry = {
+            "value": value,
+            "expires": time.time() + ttl,
+            "delta": time.time() - started,
+        }
+        backend.set(key, entry, timeout=ttl + max(STALE_GRACE, stale_ttl))
+    return value
+
+
+def get_or_compute(key, compute, timeout, stale_ttl=0, using="default"):
+    """
+    Returns (value, state) for a cache key, recomputing it with single flight.
+
+    compute:   callable() -> value to cache, or None to cache nothing.
+    timeout:   seconds (the soft TTL), or callable(value) -> seconds.
+    stale_ttl: stale-while-revalidate window. For this many seconds after the soft
+               TTL (the hard TTL is timeout + stale_ttl) an expired value is served
+               immediately and refreshed by a background thread.
+    state:     'HIT', 'STALE' (expired value served while it is recomputed
+               elsewhere), 'MISS' (computed by this call).
+    using:     alias of the cache in settings.CACHES.
+
+    Only the worker holding the lock (cache.add, atomic on every backend)
+    recomputes an expired key; the others get the last value if there is one,
+    or wait up to LOCK_WAIT for the new one. Values are stored with a logical
+    expiry and kept STALE_GRACE seconds longer so there is a last value to serve.
+    """
+    backend = caches[using]
+    entry = backend.get(key)
+    now = time.time()
+    if entry is not None and not _entry_is_stale(entry, now):
+        return entry["value"], "HIT"
+
+    lock_key = f"lock_{key}"
+    locked = backend.add(lock_key, 1, timeout=LOCK_TIMEOUT)
+
+    if locked and entry is not None and now < entry["expires"] + stale_ttl:
+        # Stale-while-revalidate: answer now, refresh outside the request
+        def refresh():
+            # Cache connections are per thread: look the backend up again
+            thread_backend = caches[using]
+            try:
+                _store(thread_backend, key, compute, timeout, stale_ttl)
+            finally:
+                thread_backend.delete(lock_key)
+
+        run_in_background(refresh)
+        return entry["value"], "STALE" if now >= entry["expires"] else "HIT"
+
+    if not locked:
+        if entry is not None:
+            return entry["value"], "STALE" if now >= entry["expires"] else "HIT"
+
+        # Nothing to serve: wait for the worker that is computing the value
+        deadline = now + LOCK_WAIT
+        while time.time() < deadline:
+            time.sleep(POLL_INTERVAL)
+            entry = backend.get(key)
+            if entry is not None:
+                return entry["value"], "HIT"
+            if backend.get(lock_key) is None:
+                # The other worker finished without caching anything
+                break
+
+        # Waited long enough: compute without the lock
+        return compute(), "MISS"
+
+    try:
+        value = _store(backend, key, compute, timeout, stale_ttl)
+    finally:
+        backend.delete(lock_key)
+    return value, "MISS"
+
+
+def normalized_params(request, params=None):
+    """
+    Returns the query string in a canonical form: only the given params,
+    sorted by name, values stripped and empty values dropped, so that
+    '?b=2&a=1', '?a=1&b=2&c=' and '?a= 1&b=2' share one cache entry.
+    """
+    query_params = request.query_params
+    names = sorted(params if params is not None else query_params.keys())
+    items = []
+    for name in names:
+        values = sorted(
+            value.strip() for value in query_params.getlist(name) if value.strip()
+        )
+        items.extend((name, value) for value in values)
+    return urlencode(items)
+
+
+def cache_hit_rate(prefix):
+    """
+    Returns the share of requests of a cached view answered from the cache
+    by this worker, or None if the view has not been called yet.
+    """
+    stats = CACHE_STATS[prefix]
+    total = stats["hit"] + stats["miss"]
+    return stats["hit"] / total if total else None
+
+
+def make_etag(cache_key):
+    """
+    Weak ETag of a cached view response. The key already holds everything the
+    response depends on (tag generations, params, user), so no body is needed.
+    """
+    return 'W/"%s"' % hashlib.md5(cache_key.encode("utf-8")).hexdigest()
+
+
+def etag_matches(request, etag):
+    """
+    Tells whether the request's If-None-Match header lists the ETag (weak comparison).
+    """
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate == "*" or candidate.removeprefix("W/") == opaque
+        for candidate in parse_etags(header)
+    )
+
+
+def cached_view(
+    prefix,
+    timeout=600,
+    tags=None,
+    params=None,
+    vary_on_user=False,
+    vary=None,
+    negative_timeout=60,
+    stale_while_revalidate=0,
+    using="default",
+    etag=False,
+):
+    """
+    Caches the responses of a GET view. Use it below @api_view:
+
+        @api_view(["GET"])
+        @cached_view("product_detail", tags=lambda r: [(PRODUCT, query_id(r, "product_id"))])
+        def product_detail(request): ...
+
+    prefix:           name of the view in cache keys and in CACHE_STATS.
+    timeout:          TTL of successful responses, in seconds.
+    tags:             callable(request) -> [(scope, object_id), ...]; the key embeds the
+                      generation of each tag, so invalidate(tag) drops the entry. Read ids
+                      with query_id(), so that invalid ids are answered with 400.
+    params:           query parameters that select the response (default: all of them).
+    vary_on_user:     keep a separate entry per authenticated user.
+    vary:             callable(request) -> str, any other part of the key.
+    negative_timeout: TTL of 404 responses.
+    stale_while_revalidate: seconds after `timeout` (the soft TTL) during which an
+                      expired response is still served and refreshed in the background.
+    using:            alias of the cache in settings.CACHES, e.g. 'reference' for the
+                      two-tier cache of Product/services/tiered_cache.py.
+    etag:             send an ETag with 200 responses and answer a matching
+                      If-None-Match with 304 before reading the cache or the database.
+                      Only for views whose tags change on every write they show.
+
+    Responses with a status in CACHED_STATUSES are stored, including empty lists and 404s.
+    Expired entries are recomputed by one worker at a time (see get_or_compute()).
+    Every response gets an 'X-Cache: HIT|STALE|MISS' header.
+    The tags must change on every write to the data the view shows: besides
+    invalidation, with etag=True they version the responses clients keep.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            key_parts = [f"view_{prefix}"]
+            if tags:
+                try:
+                    view_tags = tags(request)
+                except InvalidTagId as e:
+                    return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+                key_parts.append(
+                    ".".join(str(generation) for generation in get_generations(view_tags))
+                )
+            if vary_on_user:
+                user = request.user
+                key_parts.append(f"u{user.pk}" if user.is_authenticated else "anon")
+            if vary:
+                key_parts.append(str(vary(request)))
+            query = normalized_params(request, params)
+            key_parts.append(hashlib.md5(query.encode("utf-8")).hexdigest())
+            cache_key = "_".join(key_parts)
+
+            etag_value = make_etag(cache_key) if etag else None
+            if etag_value and etag_matches(request, etag_value):
+                # The client already has this version: no cache read, no body
+                CACHE_STATS[prefix]["hit"] += 1
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+                response["ETag"] = etag_value
+                response["X-Cache"] = "HIT"
+                return response
+
+            computed = {}
+
+            def compute():
+                response = view(request, *args, **kwargs)
+                computed["response"] = response
+                if response.status_code in CACHED_STATUSES:
+                    return (response.status_code, response.data)
+                return None
+
+            def entry_timeout(value):
+                return timeout if value[0] == 200 else negative_timeout
+
+            value, state = get_or_compute(
+                cache_key,
+                compute,
+                entry_timeout,
+                stale_ttl=stale_while_revalidate,
+                using=using,
+            )
+
+            if state == "MISS":
+                CACHE_STATS[prefix]["miss"] += 1
+                response = computed["response"]
+            else:
+                CACHE_STATS[prefix]["hit"] += 1
+                status_code, data = value
+                response = Response(data, status=status_code)
+            response["X-Cache"] = state
+            if etag_value and response.status_code == 200:
+                response["ETag"] = etag_value
+            return response
+
+        return wrapper
+
+    return decorator
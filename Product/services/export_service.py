@@ -0,0 +1,90 @@
+import csv
+import json
+
+from Product.models import Product
+from Product.services.import_service import COLUMNS
+
+
+# Columns of an export: the import columns (so a file can be imported back), plus
+# the id, the active flag and the creation date
+EXPORT_COLUMNS = ("id",) + COLUMNS + ("active", "created_at")
+
+# Rows fetched from the database at a time
+EXPORT_CHUNK_SIZE = 2000
+
+# Export column -> queryset value
+_FIELDS = {
+    "id": "id",
+    "product_title": "title",
+    "product_price": "price",
+    "description": "descriptions",
+    "product_type": "product_type",
+    "length": "length",
+    "width": "width",
+    "weight": "weight",
+    "color": "color__name",
+    "size": "size",
+    "type_of_file": "type_of_file__name_of_type",
+    "industry": "industry__name",
+    "active": "active",
+    "created_at": "created_at",
+}
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson; charset=utf-8",
+}
+
+
+def export_rows(store_owner):
+    """
+    Yields the products of a store owner as tuples in EXPORT_COLUMNS order.
+    Rows are fetched EXPORT_CHUNK_SIZE at a time (a server-side cursor on PostgreSQL),
+    never all at once.
+    """
+    return (
+        Product.objects.filter(store_owner=store_owner)
+        .order_by("id")
+        .values_list(*[_FIELDS[column] for column in EXPORT_COLUMNS])
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class _Echo:
+    """
+    File-like object whose write() returns the line, so csv.writer output can be yielded.
+    """
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow([_text(value) for value in row])
+
+
+def stream_jsonl(rows):
+    for row in rows:
+        item = dict(zip(EXPORT_COLUMNS, row))
+        for column in ("product_price", "created_at"):
+            item[column] = _text(item[column])
+        yield json.dumps(item, ensure_ascii=False) + "\n"
+
+
+def stream_export(store_owner, file_format):
+    """
+    Returns an iterator over the chunks of the export file.
+    """
+    rows = export_rows(store_owner)
+    return stream_csv(rows) if file_format == "csv" else stream_jsonl(rows)
@@ -0,0 +1,191 @@
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Greatest
+
+from Product.models import Industry, Product, ProductColor, ProductFacetCount, TypeOfFile
+from Product.services.reference_data import get_reference_names
+
+
+# Lower bounds of the price buckets; the last bucket is open-ended
+PRICE_BUCKETS = (0, 10, 50, 100, 500, 1000)
+
+# Facet name -> ProductFacetCount column
+FACET_FIELDS = {
+    "product_type": "product_type",
+    "industry": "industry_id",
+    "type_of_file": "type_of_file_id",
+    "color": "color_id",
+    "price": "price_bucket",
+}
+
+# Facets whose values are ids of a reference model, and the field holding their name
+FACET_NAMES = {
+    "industry": (Industry, "name"),
+    "type_of_file": (TypeOfFile, "name_of_type"),
+    "color": (ProductColor, "name"),
+}
+
+
+def price_bucket(price):
+    """
+    Returns the index of the PRICE_BUCKETS bucket a price falls into.
+    """
+    price = Decimal(price or 0)
+    bucket = 0
+    for index, lower in enumerate(PRICE_BUCKETS):
+        if price >= lower:
+            bucket = index
+    return bucket
+
+
+def bucket_range(bucket):
+    """
+    Returns the (min, max) prices of a bucket, max being None for the last one.
+    """
+    upper = PRICE_BUCKETS[bucket + 1] if bucket + 1 < len(PRICE_BUCKETS) else None
+    return PRICE_BUCKETS[bucket], upper
+
+
+# Product fields that decide the facet combination of a product
+PRODUCT_FACET_FIELDS = (
+    "active",
+    "product_type",
+    "industry_id",
+    "type_of_file_id",
+    "color_id",
+    "price",
+)
+
+
+def facet_key(values):
+    """
+    Returns the ProductFacetCount lookup of a product from its PRODUCT_FACET_FIELDS
+    values (a dict), or None if the product is not counted (inactive).
+    """
+    if not values or not values["active"]:
+        return None
+    none = ProductFacetCount.NONE
+    return {
+        "product_type": values["product_type"],
+        "industry_id": values["industry_id"] or none,
+        "type_of_file_id": values["type_of_file_id"] or none,
+        "color_id": values["color_id"] or none,
+        "price_bucket": price_bucket(values["price"]),
+    }
+
+
+def product_facet_values(product):
+    return {field: getattr(product, field) for field in PRODUCT_FACET_FIELDS}
+
+
+def _add(key, delta):
+    rows = ProductFacetCount.objects.filter(**key)
+    # Never below 0: a product that was not counted (e.g. before the backfill)
+    # must not break its own save on the count's CHECK constraint
+    if rows.update(count=Greatest(F("count") + delta, 0)) or delta < 0:
+        return
+    try:
+        # First product of this combination; a savepoint so a concurrent insert
+        # of the same row does not break the caller's transaction
+        with transaction.atomic():
+            ProductFacetCount.objects.create(count=delta, **key)
+    except IntegrityError:
+        rows.update(count=F("count") + delta)
+
+
+def move_product(previous, current):
+    """
+    Moves one product between facet combinations: -1 on the combination of the
+    `previous` values, +1 on the `current` one (either may be None). O(1) rows.
+    """
+    old_key, new_key = facet_key(previous), facet_key(current)
+    if old_key == new_key:
+        return
+    with transaction.atomic():
+        if old_key:
+            _add(old_key, -1)
+        if new_key:
+            _add(new_key, 1)
+
+
+def add_products(products):
+    """
+    Counts new products (e.g. from a bulk import, which sends no signals):
+    one update per facet combination, not per product.
+    """
+    deltas = {}
+    for product in products:
+        key = facet_key(product_facet_values(product))
+        if key:
+            key_tuple = tuple(key.items())
+            deltas[key_tuple] = deltas.get(key_tuple, 0) + 1
+    with transaction.atomic():
+        for key, delta in deltas.items():
+            _add(dict(key), delta)
+
+
+def rebuild_facet_counts():
+    """
+    Recomputes the whole aggregate table from Product (used by the backfill command).
+    Returns the number of combinations written.
+    """
+    totals = {}
+    rows = (
+        Product.objects.filter(active=True)
+        .values("product_type", "industry_id", "type_of_file_id", "color_id", "price")
+        .annotate(products=Count("id"))
+    )
+    for row in rows:
+        key = facet_key({"active": True, **row})
+        key_tuple = tuple(key.items())
+        totals[key_tuple] = totals.get(key_tuple, 0) + row["products"]
+
+    with transaction.atomic():
+        ProductFacetCount.objects.all().delete()
+        ProductFacetCount.objects.bulk_create(
+            ProductFacetCount(count=count, **dict(key)) for key, count in totals.items()
+        )
+    return len(totals)
+
+
+def facet_counts(filters):
+    """
+    Returns {facet: [{value, count}, ...]} and the total for the current filters,
+    e.g. {"industry": 3, "price": 1}. Each facet is counted with every filter applied
+    except its own, so the sidebar shows how many products each alternative would give.
+    """
+    facets = {}
+    for facet, column in FACET_FIELDS.items():
+        other_filters = {
+            FACET_FIELDS[name]: value for name, value in filters.items() if name != facet
+        }
+        rows = (
+            ProductFacetCount.objects.filter(count__gt=0, **other_filters)
+            .values(column)
+            .annotate(products=Sum("count"))
+            .order_by(column)
+        )
+        facets[facet] = [
+            {"value": row[column], "count": row["products"]}
+            for row in rows
+            if row[column] != ProductFacetCount.NONE
+        ]
+
+    total = (
+        ProductFacetCount.objects.filter(
+            **{FACET_FIELDS[name]: value for name, value in filters.items()}
+        ).aggregate(total=Sum("count"))["total"]
+        or 0
+    )
+
+    # Labels come from the reference data cache, not from joins
+    for facet, (model, field) in FACET_NAMES.items():
+        names = get_reference_names(model, field)
+        for item in facets[facet]:
+            item["name"] = names.get(item["value"], "")
+    for item in facets["price"]:
+        item["min"], item["max"] = bucket_range(item["value"])
+
+    return facets, total
@@ -0,0 +1,97 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from Product.models import ProductImage
+from Product.services.image_processing import render_derivatives
+from Product.services.media_paths import shard
+
+
+# Where derivatives are stored, next to the originals
+DERIVATIVES_DIR = "product_images/derivatives"
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def worker_count():
+    return getattr(settings, "IMAGE_DERIVATIVE_WORKERS", None) or os.cpu_count() or 1
+
+
+def image_pool():
+    """
+    Returns the process pool of this worker, created on first use. Resizing is CPU
+    bound: processes are not limited by the GIL and keep the web workers responsive.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=worker_count(),
+                # The worker function needs no Django: start clean processes
+                # instead of forking a process that holds DB connections and threads
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def derivative_url(info):
+    return default_storage.url(info["path"]) if info else ""
+
+
+def delete_derivative_files(derivatives):
+    for info in (derivatives or {}).values():
+        default_storage.delete(info["path"])
+
+
+def store_derivatives(product_image, rendered):
+    """
+    Saves rendered derivatives and records their paths and sizes on the image.
+    The update goes through save(), so the listing row and caches follow (signals).
+    """
+    old_derivatives = product_image.derivatives
+    derivatives = {}
+    for name, (data, width, height, extension) in rendered.items():
+        path = default_storage.save(
+            shard(f"{DERIVATIVES_DIR}/{product_image.pk}_{name}.{extension}"),
+            ContentFile(data),
+        )
+        derivatives[name] = {"path": path, "width": width, "height": height}
+
+    product_image.derivatives = derivatives
+    product_image.derivatives_status = ProductImage.DERIVATIVES_DONE
+    product_image.save(update_fields=["derivatives", "derivatives_status"])
+    delete_derivative_files(old_derivatives)
+
+
+def generate_derivatives(product_image_id, pool=None):
+    """
+    Renders the derivatives of one ProductImage (in the process pool unless pool=False)
+    and stores them. Returns the image, or None if it no longer exists.
+    """
+    product_image = ProductImage.objects.filter(pk=product_image_id).first()
+    if product_image is None:
+        return None
+
+    with product_image.image.open("rb") as original:
+        data = original.read()
+
+    try:
+        if pool is False:
+            rendered = render_derivatives(data)
+        else:
+            rendered = (pool or image_pool()).submit(render_derivatives, data).result()
+    except OSError:
+        # Not an image Pillow can read: keep serving the original
+        product_image.derivatives_status = ProductImage.DERIVATIVES_FAILED
+        product_image.save(update_fields=["derivatives_status"])
+        return product_image
+
+    store_derivatives(product_image, rendered)
+    return product_image
+
@@ -0,0 +1,44 @@
+import io
+
+from PIL import Image, ImageOps
+
+
+# Derivatives made for every product image: name -> (max width/height in pixels, format).
+# Images are scaled down to fit the box, keeping their aspect ratio, never scaled up.
+DERIVATIVES = {
+    "thumbnail": (320, "JPEG"),
+    "thumbnail_webp": (320, "WEBP"),
+    "medium_webp": (1024, "WEBP"),
+}
+
+EXTENSIONS = {"JPEG": "jpg", "WEBP": "webp"}
+
+QUALITY = 80
+
+
+# This module does not import Django: render_derivatives() runs in the worker
+# processes of the image pool (see image_derivatives.py), which are not set up.
+
+
+def render_derivatives(data):
+    """
+    Returns {name: (bytes, width, height, extension)} for the DERIVATIVES of one
+    image given as bytes. Raises OSError if the data is not a readable image.
+    """
+    with Image.open(io.BytesIO(data)) as source:
+        source = ImageOps.exif_transpose(source)
+        results = {}
+        for name, (size, image_format) in DERIVATIVES.items():
+            image = source.copy()
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            output = io.BytesIO()
+            image.save(output, image_format, quality=QUALITY, optimize=True)
+            results[name] = (
+                output.getvalue(),
+                image.width,
+                image.height,
+                EXTENSIONS[image_format],
+            )
+        return results
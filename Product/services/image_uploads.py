@@ -0,0 +1,45 @@
+import os
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from Product.models import MainImage, Product, ProductImage
+
+
+# Where create_product keeps the uploaded images until the save_product_images task stores them
+STAGING_DIR = "upload_staging"
+
+
+def stage_uploads(files):
+    """
+    Copies uploaded files to the staging directory and returns their storage names.
+    A plain file write: hashing, deduplication and the ProductImage rows (with their
+    listing and cache updates) are left to save_staged_images() in a worker.
+    """
+    return [
+        default_storage.save(os.path.join(STAGING_DIR, os.path.basename(upload.name)), upload)
+        for upload in files
+    ]
+
+
+def save_staged_images(product_id, staged_names):
+    """
+    Creates the ProductImage rows of staged uploads, the first one as the main image,
+    then deletes the staged files. All images are saved in one transaction, so a
+    failed run saves none and its retry starts over; a product that already has a
+    main image (a run that failed after its commit) or was deleted is skipped.
+    """
+    product = Product.objects.filter(pk=product_id).first()
+    if product is not None and not MainImage.objects.filter(product=product).exists():
+        with transaction.atomic():
+            for position, staged_name in enumerate(staged_names):
+                with default_storage.open(staged_name) as staged:
+                    image = ProductImage.objects.create(
+                        product=product,
+                        image=File(staged, name=os.path.basename(staged_name)),
+                    )
+                if position == 0:
+                    MainImage.objects.create(product=product, product_image=image)
+    for staged_name in staged_names:
+        default_storage.delete(staged_name)
@@ -0,0 +1,292 @@
+import codecs
+import csv
+import io
+import json
+from collections import namedtuple
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from Product.models import Industry, Product, ProductColor, TypeOfFile
+from Product.services.cache_service import INDUSTRY, PRODUCT, STORE, invalidate
+from Product.services.facet_service import add_products
+from Product.services.listing_service import save_listings
+
+
+# Supported file formats (also the accepted file extensions)
+FORMATS = ("csv", "jsonl")
+
+# Columns of an import file; the names match the create_product form fields,
+# plus the optional 'industry' (name) and 'weight'
+COLUMNS = (
+    "product_title",
+    "product_price",
+    "description",
+    "product_type",
+    "length",
+    "width",
+    "weight",
+    "color",
+    "size",
+    "type_of_file",
+    "industry",
+)
+
+# Rows inserted per transaction
+DEFAULT_BATCH_SIZE = 1000
+
+# Bytes read at a time when checking the encoding of a file
+ENCODING_CHUNK_SIZE = 64 * 1024
+
+# Result of an import: number of products created, [{"row": n, "error": "..."}], and
+# {"row": n, "error": "..."} if the file could not be read past row n (else None)
+ImportResult = namedtuple(
+    "ImportResult", ["created", "errors", "file_error"], defaults=[None]
+)
+
+
+class ImportFileError(ValueError):
+    """
+    Raised when the file itself cannot be read (encoding, CSV syntax) at `row`.
+    """
+
+    def __init__(self, message, row):
+        super().__init__(message)
+        self.row = row
+
+
+def detect_format(filename, default="csv"):
+    """
+    Returns the import format from a file name extension.
+    """
+    extension = str(filename).rsplit(".", 1)[-1].lower() if "." in str(filename) else ""
+    return extension if extension in FORMATS else default
+
+
+def check_encoding(stream, header_lines=0):
+    """
+    Reads a seekable binary stream once, in chunks, and rewinds it. Raises
+    ImportFileError at the row of the first byte that is not UTF-8 (row numbers
+    skip the `header_lines` first lines), so such a file is refused before any insert.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    line = 1
+    try:
+        for chunk in iter(lambda: stream.read(ENCODING_CHUNK_SIZE), b""):
+            try:
+                decoder.decode(chunk)
+            except UnicodeDecodeError as e:
+                line += chunk[: max(e.start, 0)].count(b"\n")
+                break
+            line += chunk.count(b"\n")
+        else:
+            try:
+                decoder.decode(b"", final=True)
+                return
+            except UnicodeDecodeError:
+                pass
+    finally:
+        stream.seek(0)
+    raise ImportFileError(
+        f"The file is not UTF-8 (line {line}): save it as UTF-8", line - header_lines
+    )
+
+
+def iter_rows(stream, file_format):
+    """
+    Yields (row_number, dict or error message) from a binary stream, one row at a
+    time, so the file is never loaded in memory as a whole. Raises ImportFileError
+    if the rest of the file cannot be read.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    row_number = 0
+    try:
+        if file_format == "csv":
+            for row_number, row in enumerate(csv.DictReader(text), start=1):
+                yield row_number, row
+            return
+
+        for row_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield row_number, "Invalid JSON."
+                continue
+            yield row_number, row if isinstance(row, dict) else "Each line must be a JSON object."
+    except UnicodeDecodeError:
+        raise ImportFileError("The file is not UTF-8: save it as UTF-8", row_number + 1)
+    except csv.Error as e:
+        raise ImportFileError(f"Invalid CSV: {e}", row_number + 1)
+
+
+class ReferenceMaps:
+    """
+    Name -> object maps of colors, file types and industries,
+    each loaded with one query for the whole import.
+    """
+
+    def __init__(self):
+        self.colors = {obj.name.lower(): obj for obj in ProductColor.objects.all()}
+        self.file_types = {
+            obj.name_of_type.lower(): obj for obj in TypeOfFile.objects.all()
+        }
+        self.industries = {obj.name.lower(): obj for obj in Industry.objects.all()}
+
+    @staticmethod
+    def find(mapping, name, label):
+        obj = mapping.get(str(name).strip().lower())
+        if obj is None:
+            raise ValueError(f"Invalid {label}")
+        return obj
+
+
+def _value(row, column):
+    value = row.get(column)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _integer(row, column):
+    value = _value(row, column)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{column} must be an integer")
+
+
+def build_product(row, store_owner, maps):
+    """
+    Returns an unsaved Product for one row, with the same rules as create_product.
+    Raises ValueError or ValidationError with the reason the row is rejected.
+    """
+    title = _value(row, "product_title")
+    price = _value(row, "product_price")
+    product_type = _value(row, "product_type")
+    description = _value(row, "description") or ""
+
+    if not all([title, price, product_type]):
+        raise ValueError("product_title, product_price, and product_type are required")
+    try:
+        price = Decimal(price)
+    except InvalidOperation:
+        raise ValueError("product_price must be a number")
+
+    product = Product(
+        title=title,
+        price=price,
+        descriptions=description,
+        product_type=product_type.capitalize(),
+        store_owner=store_owner,
+    )
+
+    industry = _value(row, "industry")
+    if industry:
+        product.industry = maps.find(maps.industries, industry, "industry")
+
+    if product.product_type == "Physical":
+        product.length = _integer(row, "length")
+        product.width = _integer(row, "width")
+        product.weight = _integer(row, "weight")
+        color = _value(row, "color")
+        if not all([description, product.length, product.width, color]):
+            raise ValueError(
+                "description, length, width, color are required for physical products"
+            )
+        product.color = maps.find(maps.colors, color, "color")
+
+    elif product.product_type == "Digital":
+        product.size = _integer(row, "size")
+        type_of_file = _value(row, "type_of_file")
+        if not all([product.size, type_of_file]):
+            raise ValueError("size and type_of_file are required for digital products")
+        product.type_of_file = maps.find(maps.file_types, type_of_file, "file type")
+
+    else:
+        raise ValueError("Invalid product type")
+
+    # Field lengths, decimal digits... (relations are already resolved above)
+    product.clean_fields(
+        exclude=["industry", "color", "type_of_file", "store_owner", "descriptions"]
+    )
+    return product
+
+
+def _error_message(error):
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{field}: {' '.join(messages)}"
+            for field, messages in error.message_dict.items()
+        )
+    return str(error)
+
+
+def save_batch(products):
+    """
+    Inserts one batch in a transaction and updates what the Product signals would
+    have: listing rows, facet counts and cache generations (bulk_create sends no
+    signals; the full-text index triggers still run in the database).
+    """
+    with transaction.atomic():
+        Product.objects.bulk_create(products)
+        save_listings(products, with_images=False)
+        add_products(products)
+    invalidate(
+        # Ids that were looked up before they existed are negatively cached
+        *[(PRODUCT, product.pk) for product in products],
+        *[(INDUSTRY, industry_id) for industry_id in {p.industry_id for p in products}],
+        *[(STORE, store_id) for store_id in {p.store_owner_id for p in products}],
+    )
+
+
+def import_products(stream, file_format, store_owner, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Imports products from a CSV or JSONL binary stream for one store owner.
+    Invalid rows are reported and skipped, the valid ones are inserted in batches.
+    A stream that is not UTF-8 is refused before any insert when it is seekable.
+    If the file cannot be read past some row, the import stops there: the batches
+    already inserted stay, and the row is returned in `file_error`.
+    Returns an ImportResult.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unsupported format: {file_format}")
+
+    created = 0
+    errors = []
+    batch = []
+    try:
+        if stream.seekable():
+            check_encoding(stream, header_lines=1 if file_format == "csv" else 0)
+        maps = ReferenceMaps()
+        for row_number, row in iter_rows(stream, file_format):
+            if isinstance(row, str):
+                errors.append({"row": row_number, "error": row})
+                continue
+            try:
+                batch.append(build_product(row, store_owner, maps))
+            except (ValueError, ValidationError) as e:
+                errors.append({"row": row_number, "error": _error_message(e)})
+                continue
+
+            if len(batch) >= batch_size:
+                save_batch(batch)
+                created += len(batch)
+                batch = []
+    except ImportFileError as e:
+        # The rows read before the error are kept, like the batches already inserted
+        if batch:
+            save_batch(batch)
+            created += len(batch)
+        return ImportResult(created, errors, {"row": e.row, "error": str(e)})
+
+    if batch:
+        save_batch(batch)
+        created += len(batch)
+
+    return ImportResult(created, errors)
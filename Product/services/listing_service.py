@@ -0,0 +1,115 @@
+from django.db import transaction
+
+from Product.models import MainImage, Product, ProductListing
+from Product.services.image_derivatives import derivative_url
+
+
+# Columns copied from Product as they are
+PRODUCT_FIELDS = (
+    "title",
+    "descriptions",
+    "price",
+    "active",
+    "product_type",
+    "created_at",
+    "size",
+    "industry_id",
+    "type_of_file_id",
+    "store_owner_id",
+)
+
+# Every column of ProductListing except the primary key
+LISTING_FIELDS = PRODUCT_FIELDS + (
+    "industry_name",
+    "type_of_file_name",
+    "store_name",
+    "main_image_url",
+    "main_image_thumbnail_url",
+    "main_image_webp_url",
+)
+
+
+def products_for_listing():
+    """
+    Product queryset loading everything a listing row needs in one query.
+    """
+    return Product.objects.select_related(
+        "industry", "type_of_file", "store_owner", "main_image__product_image"
+    )
+
+
+def store_name(store_owner):
+    # CustomUser has no store name column: the username is the public store name
+    return getattr(store_owner, "store_name", None) or store_owner.username
+
+
+def main_image(product):
+    try:
+        return product.main_image.product_image
+    except MainImage.DoesNotExist:
+        return None
+
+
+def main_image_url(product):
+    product_image = main_image(product)
+    if product_image is None or not product_image.image:
+        return ""
+    return product_image.image.url
+
+
+def set_main_image(listing, product):
+    """
+    Copies the URLs of the main image and of its derivatives (once generated) to a listing row.
+    """
+    product_image = main_image(product)
+    derivatives = product_image.derivatives if product_image else {}
+    listing.main_image_url = main_image_url(product)
+    listing.main_image_thumbnail_url = derivative_url(derivatives.get("thumbnail"))
+    listing.main_image_webp_url = derivative_url(derivatives.get("medium_webp"))
+
+
+def build_listing(product, with_images=True):
+    """
+    Returns the (unsaved) ProductListing row of a product loaded with products_for_listing().
+    with_images=False skips the main image lookup, for products that cannot have one yet.
+    """
+    listing = ProductListing(id=product.pk)
+    for field in PRODUCT_FIELDS:
+        setattr(listing, field, getattr(product, field))
+    listing.industry_name = product.industry.name if product.industry else ""
+    listing.type_of_file_name = (
+        product.type_of_file.name_of_type if product.type_of_file else ""
+    )
+    listing.store_name = store_name(product.store_owner)
+    if with_images:
+        set_main_image(listing, product)
+    return listing
+
+
+def refresh_listing(product_id):
+    """
+    Re-builds the listing row of one product, or deletes it if the product is gone.
+    Runs in the transaction of the write that triggered it (from the signals).
+    """
+    with transaction.atomic():
+        product = products_for_listing().filter(pk=product_id).first()
+        if product is None:
+            ProductListing.objects.filter(pk=product_id).delete()
+            return None
+        listing = build_listing(product)
+        listing.save()
+        return listing
+
+
+def save_listings(products, with_images=True):
+    """
+    Upserts the listing rows of several products with one bulk query.
+    """
+    listings = [build_listing(product, with_images) for product in products]
+    ProductListing.objects.bulk_create(
+        listings,
+        update_conflicts=True,
+        unique_fields=["id"],
+        update_fields=list(LISTING_FIELDS),
+    )
+    return len(listings)
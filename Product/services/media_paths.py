@@ -0,0 +1,52 @@
+import hashlib
+import os
+import re
+
+from django.utils.deconstruct import deconstructible
+
+
+# Two levels of 256 subdirectories: 65,536 leaves, ~15 files per directory per million
+SHARD_PATTERN = re.compile(r"^[0-9a-f]{2}$")
+
+
+def shard(name, digest=None):
+    """
+    Returns name with two hashed subdirectories inserted before the file name,
+    e.g. blog_content/post.pdf -> blog_content/3f/a2/post.pdf. The directories come
+    from `digest` (hex) when given, otherwise from the MD5 of the file name.
+    """
+    directory, filename = os.path.split(name)
+    digest = digest or hashlib.md5(filename.encode("utf-8")).hexdigest()
+    return os.path.join(directory, digest[:2], digest[2:4], filename)
+
+
+def is_sharded(name):
+    parts = name.split("/")
+    return len(parts) >= 3 and all(SHARD_PATTERN.match(part) for part in parts[-3:-1])
+
+
+def unsharded(name):
+    """
+    Returns a sharded name without its two hashed subdirectories.
+    """
+    if not is_sharded(name):
+        return name
+    parts = name.split("/")
+    return "/".join(parts[:-3] + parts[-1:])
+
+
+@deconstructible
+class ShardedUploadTo:
+    """
+    upload_to for FileFields: stores the uploads of `directory` in hashed subdirectories,
+    so no directory holds more than a few hundred files even with millions of uploads.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def __call__(self, instance, filename):
+        return shard(os.path.join(self.directory, filename))
+
+    def __eq__(self, other):
+        return isinstance(other, ShardedUploadTo) and self.directory == other.directory
@@ -0,0 +1,57 @@
+import hashlib
+
+from django.core.cache import caches
+
+
+# Alias of the two-tier (in-process L1 + shared L2) cache in settings.CACHES
+REFERENCE_CACHE = "reference"
+
+# How long a lookup result stays in the reference cache; every write to a
+# reference model clears the whole tier anyway (see Product/signals.py)
+REFERENCE_TIMEOUT = 60 * 60 * 24
+
+
+def reference_cache():
+    return caches[REFERENCE_CACHE]
+
+
+def get_reference_object(model, **lookup):
+    """
+    Returns the object of a small reference model (ProductColor, TypeOfFile,
+    Industry) matching the lookup, or None. Served from local memory after
+    the first call instead of one query per request.
+    """
+    raw_key = "&".join(f"{field}={value}" for field, value in sorted(lookup.items()))
+    cache_key = (
+        f"reference_{model._meta.label_lower}_"
+        + hashlib.md5(raw_key.encode("utf-8")).hexdigest()
+    )
+
+    # Stored as a 1-tuple (or an empty tuple when nothing matches),
+    # so a missing object is cached too
+    cached = reference_cache().get(cache_key)
+    if cached is None:
+        instance = model.objects.filter(**lookup).first()
+        cached = (instance,) if instance else ()
+        reference_cache().set(cache_key, cached, timeout=REFERENCE_TIMEOUT)
+    return cached[0] if cached else None
+
+
+def clear_reference_cache():
+    """
+    Invalidates all reference data on every worker (bumps the tier version).
+    """
+    reference_cache().clear()
+
+
+def get_reference_names(model, field):
+    """
+    Returns {id: name} for every object of a reference model,
+    from the reference cache after the first call.
+    """
+    cache_key = f"reference_names_{model._meta.label_lower}_{field}"
+    names = reference_cache().get(cache_key)
+    if names is None:
+        names = dict(model.objects.values_list("id", field))
+        reference_cache().set(cache_key, names, timeout=REFERENCE_TIMEOUT)
+    return names
@@ -0,0 +1,221 @@
+import re
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from Product.models import Product
+
+
+# Name of the SQLite FTS5 virtual table that mirrors Product.title/descriptions
+SQLITE_FTS_TABLE = "Product_product_fts"
+
+# Text search configuration used by the Postgres GIN expression index.
+# The query below must use the exact same expression or the index is skipped.
+POSTGRES_TS_CONFIG = "simple"
+# Title lexemes get weight A and description lexemes weight B, so ts_rank
+# scores title matches higher (the weights are stored in the index too).
+POSTGRES_TSVECTOR = (
+    f"setweight(to_tsvector('{POSTGRES_TS_CONFIG}', "
+    "coalesce(\"Product_product\".\"title\", '')), 'A') || "
+    f"setweight(to_tsvector('{POSTGRES_TS_CONFIG}', "
+    "coalesce(\"Product_product\".\"descriptions\", '')), 'B')"
+)
+POSTGRES_INDEX_NAME = "Product_product_search_weighted_gin"
+# Unweighted index of earlier versions, dropped when the weighted one is installed
+POSTGRES_OLD_INDEX_NAME = "Product_product_search_gin"
+
+# SQLite: external-content FTS5 table kept in sync with Product_product by triggers,
+# so every INSERT/UPDATE/DELETE (including bulk operations) updates the index incrementally.
+SQLITE_INDEX_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS "{SQLITE_FTS_TABLE}" USING fts5(
+        title, descriptions,
+        content='Product_product', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS "{SQLITE_FTS_TABLE}_ai" AFTER INSERT ON "Product_product" BEGIN
+        INSERT INTO "{SQLITE_FTS_TABLE}"(rowid, title, descriptions)
+        VALUES (new.id, new.title, new.descriptions);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS "{SQLITE_FTS_TABLE}_ad" AFTER DELETE ON "Product_product" BEGIN
+        INSERT INTO "{SQLITE_FTS_TABLE}"("{SQLITE_FTS_TABLE}", rowid, title, descriptions)
+        VALUES ('delete', old.id, old.title, old.descriptions);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS "{SQLITE_FTS_TABLE}_au" AFTER UPDATE OF title, descriptions ON "Product_product" BEGIN
+        INSERT INTO "{SQLITE_FTS_TABLE}"("{SQLITE_FTS_TABLE}", rowid, title, descriptions)
+        VALUES ('delete', old.id, old.title, old.descriptions);
+        INSERT INTO "{SQLITE_FTS_TABLE}"(rowid, title, descriptions)
+        VALUES (new.id, new.title, new.descriptions);
+    END
+    """,
+]
+SQLITE_TRIGGERS = [f"{SQLITE_FTS_TABLE}_ai", f"{SQLITE_FTS_TABLE}_ad", f"{SQLITE_FTS_TABLE}_au"]
+
+# PostgreSQL: GIN expression index, maintained by Postgres on every write
+POSTGRES_INDEX_SQL = [
+    f'DROP INDEX IF EXISTS "{POSTGRES_OLD_INDEX_NAME}"',
+    f"""
+    CREATE INDEX IF NOT EXISTS "{POSTGRES_INDEX_NAME}" ON "Product_product"
+    USING GIN ({POSTGRES_TSVECTOR})
+    """,
+]
+
+# Splits the user input into words (works for Persian and English text)
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_backend():
+    """
+    Returns the full-text backend available for the configured database:
+    'fts5' for SQLite, 'postgres' for PostgreSQL, or None (fallback to icontains).
+    """
+    if connection.vendor == "sqlite":
+        return "fts5"
+    if connection.vendor == "postgresql":
+        return "postgres"
+    return None
+
+
+def install_search_index(conn=None):
+    """
+    Creates the full-text index for the current database if it is missing.
+    On SQLite the index is rebuilt whenever a trigger had to be (re)created,
+    because Django drops triggers when it remakes the Product table in a migration.
+    """
+    conn = conn or connection
+    with conn.cursor() as cursor:
+        if conn.vendor == "sqlite":
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name IN (%s, %s, %s)",
+                SQLITE_TRIGGERS,
+            )
+            if len(cursor.fetchall()) == len(SQLITE_TRIGGERS):
+                return
+            for statement in SQLITE_INDEX_SQL:
+                cursor.execute(statement)
+            cursor.execute(
+                f'INSERT INTO "{SQLITE_FTS_TABLE}"("{SQLITE_FTS_TABLE}") VALUES (\'rebuild\')'
+            )
+        elif conn.vendor == "postgresql":
+            for statement in POSTGRES_INDEX_SQL:
+                cursor.execute(statement)
+
+
+def drop_search_index(conn=None):
+    """
+    Removes the full-text index created by install_search_index().
+    """
+    conn = conn or connection
+    with conn.cursor() as cursor:
+        if conn.vendor == "sqlite":
+            for trigger in SQLITE_TRIGGERS:
+                cursor.execute(f'DROP TRIGGER IF EXISTS "{trigger}"')
+            cursor.execute(f'DROP TABLE IF EXISTS "{SQLITE_FTS_TABLE}"')
+        elif conn.vendor == "postgresql":
+            cursor.execute(f'DROP INDEX IF EXISTS "{POSTGRES_INDEX_NAME}"')
+
+
+def tokenize(query):
+    """
+    Splits a raw search string into lower-cased tokens.
+    """
+    return [token.lower() for token in _TOKEN_RE.findall(str(query or ""))]
+
+
+def build_fts5_query(query):
+    """
+    Converts user input into a safe FTS5 MATCH expression.
+    Every token is quoted (so FTS5 operators in the input are ignored)
+    and prefix-matched, e.g. 'smart pho' -> '"smart"* "pho"*'.
+    """
+    return " ".join('"%s"*' % token.replace('"', '""') for token in tokenize(query))
+
+
+def build_tsquery(query):
+    """
+    Converts user input into a prefix-matching Postgres tsquery string,
+    e.g. 'smart pho' -> 'smart:* & pho:*'.
+    """
+    return " & ".join(f"{token}:*" for token in tokenize(query))
+
+
+def matching_ids_sql(query):
+    """
+    Returns (sql, params) selecting the ids of products matching the query
+    through the full-text index, or None if no index is available.
+    """
+    backend = search_backend()
+    if backend == "fts5":
+        return (
+            f'SELECT rowid FROM "{SQLITE_FTS_TABLE}" WHERE "{SQLITE_FTS_TABLE}" MATCH %s',
+            [build_fts5_query(query)],
+        )
+    if backend == "postgres":
+        return (
+            f'SELECT "Product_product"."id" FROM "Product_product" '
+            f"WHERE {POSTGRES_TSVECTOR} @@ to_tsquery('{POSTGRES_TS_CONFIG}', %s)",
+            [build_tsquery(query)],
+        )
+    return None
+
+
+def filter_by_text(queryset, query):
+    """
+    Restricts a Product queryset to rows matching the query.
+    Uses the full-text index instead of a LIKE '%...%' scan where available.
+    """
+    if not tokenize(query):
+        return queryset.none()
+
+    index_sql = matching_ids_sql(query)
+    if index_sql is None:
+        return queryset.filter(title__icontains=query)
+
+    sql, params = index_sql
+    return queryset.filter(id__in=RawSQL(sql, params))
+
+
+def ranked_product_ids(query, limit=20, active_only=True):
+    """
+    Returns the ids of the best matching products ordered by relevance.
+    Title matches are weighted higher than description matches.
+    """
+    if not tokenize(query):
+        return []
+
+    backend = search_backend()
+    active_clause = ' AND "Product_product"."active"' if active_only else ""
+
+    if backend == "fts5":
+        sql = (
+            f'SELECT "Product_product"."id" FROM "{SQLITE_FTS_TABLE}" '
+            f'JOIN "Product_product" ON "Product_product"."id" = "{SQLITE_FTS_TABLE}".rowid '
+            f'WHERE "{SQLITE_FTS_TABLE}" MATCH %s{active_clause} '
+            f'ORDER BY bm25("{SQLITE_FTS_TABLE}", 10.0, 1.0) '
+            "LIMIT %s"
+        )
+        params = [build_fts5_query(query), limit]
+    elif backend == "postgres":
+        sql = (
+            f'SELECT "Product_product"."id" FROM "Product_product", '
+            f"to_tsquery('{POSTGRES_TS_CONFIG}', %s) query "
+            f"WHERE {POSTGRES_TSVECTOR} @@ query{active_clause} "
+            f"ORDER BY ts_rank({POSTGRES_TSVECTOR}, query) DESC "
+            "LIMIT %s"
+        )
+        params = [build_tsquery(query), limit]
+    else:
+        queryset = Product.objects.filter(title__icontains=query)
+        if active_only:
+            queryset = queryset.filter(active=True)
+        return list(queryset.values_list("id", flat=True)[:limit])
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
@@ -0,0 +1,184 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+# L1 stores are shared by every thread of the process (Django creates one backend
+# instance per thread), keyed by the cache LOCATION like LocMemCache does
+_stores = {}
+_stores_lock = threading.Lock()
+
+# Returned by LocalLRU.get() when a key is missing or expired
+_MISSING = object()
+
+
+class LocalLRU:
+    """
+    Bounded in-process LRU with per-entry expiry, plus the tier version
+    the entries were read under.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.version = None  # Tier version the entries belong to
+        self.checked_at = 0.0  # When the version was last read from L2
+
+    def get(self, key):
+        with self.lock:
+            item = self.entries.get(key)
+            if item is None:
+                return _MISSING
+            value, expires = item
+            if expires is not None and expires <= time.monotonic():
+                del self.entries[key]
+                return _MISSING
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        expires = None if timeout is None else time.monotonic() + timeout
+        with self.lock:
+            self.entries[key] = (value, expires)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            return self.entries.pop(key, None) is not None
+
+    def flush(self, version):
+        with self.lock:
+            self.entries.clear()
+            self.version = version
+
+
+class TwoTierCache(BaseCache):
+    """
+    Cache backend for small, hot, rarely-changing reference data.
+
+    L1 is a bounded in-process LRU with TTL, L2 is another configured cache
+    (the shared Redis cache in production). Reads are served from L1 when
+    possible, otherwise from L2 (and copied into L1).
+
+    Every L2 key embeds a tier version stored in L2. clear() bumps it, which
+    makes the old L2 entries unreachable and, within VERSION_CHECK_INTERVAL
+    seconds, makes every worker drop its L1: cross-worker invalidation without
+    a message bus. delete() only removes a key from L2 and from this worker's L1,
+    so call clear() after the underlying data changes.
+
+        CACHES["reference"] = {
+            "BACKEND": "Product.services.tiered_cache.TwoTierCache",
+            "LOCATION": "reference",
+            "OPTIONS": {
+                "L2": "default",  # Alias of the shared cache
+                "MAX_ENTRIES": 1024,  # L1 size
+                "L1_TIMEOUT": 60,  # Max seconds an entry lives in L1
+                "VERSION_CHECK_INTERVAL": 1.0,  # Max seconds between two L2 version reads
+            },
+        }
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._namespace = location or "reference"
+        self._l2_alias = options.get("L2", "default")
+        self._l1_timeout = options.get("L1_TIMEOUT", 60)
+        self._check_interval = options.get("VERSION_CHECK_INTERVAL", 1.0)
+        with _stores_lock:
+            self._l1 = _stores.setdefault(
+                self._namespace, LocalLRU(options.get("MAX_ENTRIES", 1024))
+            )
+
+    @property
+    def _l2(self):
+        return caches[self._l2_alias]
+
+    @property
+    def _version_key(self):
+        return f"tier_version_{self._namespace}"
+
+    def _tier_version(self):
+        """
+        Returns the current tier version, reading it from L2 at most once per
+        VERSION_CHECK_INTERVAL, and drops L1 if another worker bumped it.
+        """
+        now = time.monotonic()
+        if self._l1.version is not None and now - self._l1.checked_at < self._check_interval:
+            return self._l1.version
+
+        version = self._l2.get(self._version_key)
+        if version is None:
+            self._l2.add(self._version_key, int(time.time() * 1000), timeout=None)
+            version = self._l2.get(self._version_key)
+        if version != self._l1.version:
+            self._l1.flush(version)
+        self._l1.checked_at = now
+        return version
+
+    def _l2_key(self, key):
+        return f"{self._namespace}_{self._tier_version()}_{key}"
+
+    def _timeout(self, timeout):
+        # Relative timeout for L2 (BaseCache.get_backend_timeout() returns an absolute time)
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def _l1_ttl(self, timeout):
+        if timeout is None:
+            return self._l1_timeout
+        return min(timeout, self._l1_timeout)
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        l2_key = self._l2_key(key)  # Also refreshes the version and L1
+        value = self._l1.get(key)
+        if value is not _MISSING:
+            return value
+
+        value = self._l2.get(l2_key, _MISSING)
+        if value is _MISSING:
+            return default
+        self._l1.set(key, value, self._l1_timeout)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        timeout = self._timeout(timeout)
+        self._l2.set(self._l2_key(key), value, timeout=timeout)
+        self._l1.set(key, value, self._l1_ttl(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        # Goes to L2 only, so add() keeps working as a cross-worker lock
+        key = self.make_and_validate_key(key, version=version)
+        timeout = self._timeout(timeout)
+        return self._l2.add(self._l2_key(key), value, timeout=timeout)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._l2.touch(self._l2_key(key), timeout=self._timeout(timeout))
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._l1.delete(key)
+        return self._l2.delete(self._l2_key(key))
+
+    def has_key(self, key, version=None):
+        return self.get(key, _MISSING, version=version) is not _MISSING
+
+    def clear(self):
+        """
+        Invalidates the whole tier on every worker by bumping its version.
+        """
+        try:
+            version = self._l2.incr(self._version_key)
+        except ValueError:
+            version = int(time.time() * 1000)
+            self._l2.set(self._version_key, version, timeout=None)
+        self._l1.flush(version)
+        self._l1.checked_at = time.monotonic()
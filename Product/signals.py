@@ -0,0 +1,185 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from AuthenticationSystem.models import CustomUser
+
+from .models import (
+    Industry,
+    MainImage,
+    Product,
+    ProductColor,
+    ProductImage,
+    ProductListing,
+    TypeOfFile,
+)
+from .services.cache_service import INDUSTRY, STORE, bump_product_generations, invalidate
+from .services.facet_service import (
+    PRODUCT_FACET_FIELDS,
+    move_product,
+    product_facet_values,
+)
+from .services.image_derivatives import delete_derivative_files
+from .services.listing_service import refresh_listing, store_name
+from .services.reference_data import clear_reference_cache
+from .tasks import generate_image_derivatives
+
+
+@receiver(pre_save, sender=Product)
+def remember_product_scopes(sender, instance, **kwargs):
+    """
+    Keeps the industry and store a product had before an update,
+    so the lists it is moved out of are invalidated too,
+    and its facet values, so its facet counts can be moved.
+    """
+    instance._previous_scopes = None
+    instance._previous_facets = None
+    if instance.pk:
+        previous = (
+            Product.objects.filter(pk=instance.pk)
+            .values("store_owner_id", *PRODUCT_FACET_FIELDS)
+            .first()
+        )
+        if previous:
+            instance._previous_scopes = (previous["industry_id"], previous["store_owner_id"])
+            instance._previous_facets = previous
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_caches(sender, instance, **kwargs):
+    """
+    Bumps the generation counters of the product, its industry and its store.
+    """
+    bump_product_generations(
+        instance, previous=getattr(instance, "_previous_scopes", None)
+    )
+
+
+@receiver(post_save, sender=Product)
+def update_product_listing(sender, instance, **kwargs):
+    """
+    Keeps the ProductListing row and the facet counts of the product in sync.
+    """
+    refresh_listing(instance.pk)
+    move_product(
+        getattr(instance, "_previous_facets", None), product_facet_values(instance)
+    )
+
+
+@receiver(post_delete, sender=Product)
+def delete_product_listing(sender, instance, **kwargs):
+    ProductListing.objects.filter(pk=instance.pk).delete()
+    move_product(product_facet_values(instance), None)
+
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+@receiver(post_save, sender=MainImage)
+@receiver(post_delete, sender=MainImage)
+def invalidate_product_image_caches(sender, instance, **kwargs):
+    """
+    Listing cards show the main image, so image writes refresh the listing row
+    and invalidate the product caches too.
+    """
+    product = Product.objects.filter(pk=instance.product_id).first()
+    if product:
+        refresh_listing(product.pk)
+        bump_product_generations(product)
+
+
+@receiver(post_save, sender=ProductImage)
+def generate_product_image_derivatives(sender, instance, created, **kwargs):
+    # Queued in the upload's transaction: the upload answers without waiting for the resizing
+    if created:
+        generate_image_derivatives.enqueue(instance.pk)
+
+
+@receiver(post_delete, sender=ProductImage)
+def delete_product_image_derivatives(sender, instance, **kwargs):
+    transaction.on_commit(lambda: delete_derivative_files(instance.derivatives))
+
+
+# Images and logos live in the content-addressed storage: a deleted or replaced file
+# releases one reference, and the file goes with its last one
+
+
+@receiver(post_delete, sender=ProductImage)
+def release_product_image_file(sender, instance, **kwargs):
+    instance.image.delete(save=False)
+
+
+@receiver(pre_save, sender=CustomUser)
+def remember_store_logo(sender, instance, update_fields=None, **kwargs):
+    instance._previous_store_logo = None
+    # Skip partial saves that cannot change the logo (e.g. last_login updates)
+    if instance.pk and (update_fields is None or "store_logo" in update_fields):
+        instance._previous_store_logo = (
+            CustomUser.objects.filter(pk=instance.pk)
+            .values_list("store_logo", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=CustomUser)
+def release_replaced_store_logo(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_store_logo", None)
+    if previous and previous != instance.store_logo.name:
+        instance.store_logo.storage.delete(previous)
+
+
+@receiver(post_delete, sender=CustomUser)
+def release_store_logo(sender, instance, **kwargs):
+    if instance.store_logo:
+        instance.store_logo.delete(save=False)
+
+
+# Listing rows copy the names of their industry, file type and store:
+# renames are applied to the rows and to the cached lists showing them
+
+
+@receiver(post_save, sender=Industry)
+def rename_listing_industry(sender, instance, created, **kwargs):
+    if not created:
+        ProductListing.objects.filter(industry_id=instance.pk).update(
+            industry_name=instance.name
+        )
+        invalidate((INDUSTRY, instance.pk))
+
+
+@receiver(post_save, sender=TypeOfFile)
+def rename_listing_type_of_file(sender, instance, created, **kwargs):
+    if not created:
+        listings = ProductListing.objects.filter(type_of_file_id=instance.pk)
+        industries = set(listings.values_list("industry_id", flat=True))
+        listings.update(type_of_file_name=instance.name_of_type)
+        invalidate(*[(INDUSTRY, industry_id) for industry_id in industries])
+
+
+@receiver(post_save, sender=CustomUser)
+def rename_listing_store(sender, instance, created, update_fields=None, **kwargs):
+    # Skip partial saves that cannot change the name (e.g. last_login updates)
+    if created or (update_fields is not None and "username" not in update_fields):
+        return
+    listings = ProductListing.objects.filter(store_owner_id=instance.pk).exclude(
+        store_name=store_name(instance)
+    )
+    industries = set(listings.values_list("industry_id", flat=True))
+    if listings.update(store_name=store_name(instance)):
+        invalidate(
+            (STORE, instance.pk),
+            *[(INDUSTRY, industry_id) for industry_id in industries],
+        )
+
+
+@receiver(post_save, sender=Industry)
+@receiver(post_delete, sender=Industry)
+@receiver(post_save, sender=ProductColor)
+@receiver(post_delete, sender=ProductColor)
+@receiver(post_save, sender=TypeOfFile)
+@receiver(post_delete, sender=TypeOfFile)
+def invalidate_reference_caches(sender, instance, **kwargs):
+    """
+    Reference data lives in the two-tier cache: clear it on every worker.
+    """
+    clear_reference_cache()
@@ -0,0 +1,20 @@
+from TaskQueue.queue import task
+
+from .services.image_derivatives import generate_derivatives
+from .services.image_uploads import save_staged_images
+
+
+@task()
+def generate_image_derivatives(product_image_id):
+    """
+    Renders the thumbnails and WebP variants of a new ProductImage.
+    """
+    generate_derivatives(product_image_id)
+
+
+@task(priority=10)
+def save_product_images(product_id, staged_names):
+    """
+    Stores the images uploaded with a new product (staged by create_product).
+    """
+    save_staged_images(product_id, staged_names)
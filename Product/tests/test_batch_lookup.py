@@ -0,0 +1,79 @@
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory
+from rest_framework import status
+from Product.models import Product
+from Product.services.batch_lookup import product_cache_key
+from Product.services.cache_service import PRODUCT, get_generation
+from Product.views import product_batch
+from AuthenticationSystem.models import CustomUser
+
+
+class ProductBatchTest(TestCase):
+    def setUp(self):
+        """
+        Set up a store owner with three products.
+        """
+        cache.clear()
+        self.factory = RequestFactory()
+        self.store_owner = CustomUser.objects.create(
+            username="store_owner", phone_number="+989123456789", user_type="store_owner"
+        )
+        self.products = [
+            Product.objects.create(
+                title=f"Phone {number}", descriptions="x", store_owner=self.store_owner
+            )
+            for number in range(3)
+        ]
+
+    def _batch(self, ids):
+        return product_batch(self.factory.get(f"/products/batch/?ids={ids}"))
+
+    def test_request_order_and_not_found(self):
+        """
+        Test that results follow the requested order, with not-found markers.
+        """
+        first, second, third = self.products
+        response = self._batch(f"{third.id},999,{first.id},{third.id}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in response.data["products"]],
+            [third.id, 999, first.id, third.id],
+        )
+        self.assertEqual(response.data["products"][1], {"id": 999, "not_found": True})
+
+    def test_one_query_for_misses_then_none(self):
+        """
+        Test that misses are loaded with one query and served from the cache afterwards.
+        """
+        ids = ",".join(str(product.id) for product in self.products) + ",999"
+        with self.assertNumQueries(1):
+            self._batch(ids)
+        with self.assertNumQueries(0):
+            self._batch(ids)
+
+    def test_product_write_drops_entry(self):
+        """
+        Test that a product update is visible in the next batch.
+        """
+        product = self.products[0]
+        self._batch(product.id)
+        product.title = "Renamed"
+        product.save()
+        self.assertEqual(self._batch(product.id).data["products"][0]["title"], "Renamed")
+
+    def test_stale_back_fill_is_not_served(self):
+        """
+        Test that data read before a write and cached after it is not served.
+        """
+        product = self.products[0]
+        stale_key = product_cache_key(product.id, get_generation(PRODUCT, product.id))
+        stale_data = self._batch(product.id).data["products"][0]
+        product.title = "Renamed"
+        product.save()
+        # A concurrent batch that loaded the product before the write back-fills now
+        cache.set(stale_key, stale_data)
+        self.assertEqual(self._batch(product.id).data["products"][0]["title"], "Renamed")
+
+    def test_invalid_ids(self):
+        for ids in ("", "a,b", ",".join(["1"] * 101)):
+            self.assertEqual(self._batch(ids).status_code, status.HTTP_400_BAD_REQUEST)
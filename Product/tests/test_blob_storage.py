@@ -0,0 +1,79 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from MVP.testing import TemporaryMediaMixin
+from Product.models import Industry, MediaBlob, Product, ProductImage
+from Product.services.blob_storage import content_addressed_storage
+from AuthenticationSystem.models import CustomUser
+
+
+class ContentAddressedStorageTest(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        """
+        Set up a store owner and a product.
+        """
+        self.storage = content_addressed_storage()
+        self.store_owner = CustomUser.objects.create(
+            username="store_owner", phone_number="+989123456789", user_type="store_owner"
+        )
+        self.product = Product.objects.create(
+            title="Smartphone",
+            price=100,
+            industry=Industry.objects.create(name="Technology"),
+            store_owner=self.store_owner,
+        )
+
+    def upload(self, name, data):
+        return ProductImage.objects.create(
+            product=self.product, image=SimpleUploadedFile(name, data)
+        )
+
+    def test_identical_uploads_share_one_file(self):
+        """
+        Test that the same bytes uploaded twice under different names are stored once.
+        """
+        first = self.upload("phone.JPG", b"same bytes")
+        second = self.upload("other.jpg", b"same bytes")
+        third = self.upload("phone.jpg", b"other bytes")
+
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertNotEqual(first.image.name, third.image.name)
+        self.assertTrue(first.image.name.startswith("product_images/"))
+        self.assertTrue(first.image.name.endswith(".jpg"))
+        self.assertEqual(MediaBlob.objects.get(name=first.image.name).references, 2)
+        self.assertEqual(MediaBlob.objects.count(), 2)
+
+    def test_file_is_deleted_with_its_last_reference(self):
+        """
+        Test that deleting an image only removes the file when no other record uses it.
+        """
+        first = self.upload("phone.jpg", b"same bytes")
+        second = self.upload("copy.jpg", b"same bytes")
+        name = first.image.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(self.storage.exists(name))
+        self.assertEqual(MediaBlob.objects.get(name=name).references, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(self.storage.exists(name))
+        self.assertFalse(MediaBlob.objects.exists())
+
+    def test_replaced_store_logo_is_released(self):
+        """
+        Test that a store logo shares the storage and releases its old file when replaced.
+        """
+        self.store_owner.store_logo = SimpleUploadedFile("logo.png", b"logo one")
+        self.store_owner.save()
+        old_name = self.store_owner.store_logo.name
+        self.assertTrue(old_name.startswith("store_logos/"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.store_owner.store_logo = SimpleUploadedFile("logo.png", b"logo two")
+            self.store_owner.save()
+        self.assertFalse(self.storage.exists(old_name))
+        self.assertEqual(
+            list(MediaBlob.objects.values_list("name", flat=True)),
+            [self.store_owner.store_logo.name],
+        )
@@ -0,0 +1,84 @@
+from django.test import TestCase, RequestFactory
+from django.core.cache import cache
+from rest_framework import status
+from Product.models import Product, Industry
+from Product.views import products_sort_show, show_products_by_store
+from Product.services.cache_service import INDUSTRY, STORE, get_generation
+from AuthenticationSystem.models import CustomUser
+
+
+class GenerationCacheTest(TestCase):
+    def setUp(self):
+        """
+        Set up two industries and a store owner with one product.
+        """
+        cache.clear()
+        self.factory = RequestFactory()
+        self.industry = Industry.objects.create(name="Technology")
+        self.other_industry = Industry.objects.create(name="Books")
+        self.store_owner = CustomUser.objects.create(
+            username="store_owner", phone_number="+989123456789", user_type="store_owner"
+        )
+        self.product = self._create("Smartphone")
+
+    def _create(self, title):
+        return Product.objects.create(
+            title=title,
+            descriptions="Test",
+            industry=self.industry,
+            store_owner=self.store_owner,
+        )
+
+    def _sorted(self, industry):
+        request = self.factory.get(
+            f"/products/sort/?product_type=Physical&industry={industry.id}"
+        )
+        return products_sort_show(request)
+
+    def test_product_write_bumps_generations(self):
+        """
+        Test that saving a product moves its industry and store to a new generation.
+        """
+        industry_generation = get_generation(INDUSTRY, self.industry.id)
+        store_generation = get_generation(STORE, self.store_owner.id)
+
+        self.product.title = "Smartphone 2"
+        self.product.save()
+
+        self.assertEqual(get_generation(INDUSTRY, self.industry.id), industry_generation + 1)
+        self.assertEqual(get_generation(STORE, self.store_owner.id), store_generation + 1)
+
+    def test_products_sort_show_sees_new_products(self):
+        """
+        Test that a cached product list is not served after a product is added.
+        """
+        self.assertEqual(len(self._sorted(self.industry).data["products"]), 1)
+        self._create("Laptop")
+        self.assertEqual(len(self._sorted(self.industry).data["products"]), 2)
+
+    def test_moving_product_invalidates_old_industry(self):
+        """
+        Test that both the old and the new industry lists are invalidated on update.
+        """
+        self.assertEqual(len(self._sorted(self.industry).data["products"]), 1)
+        self.assertEqual(len(self._sorted(self.other_industry).data["products"]), 0)
+
+        self.product.industry = self.other_industry
+        self.product.save()
+
+        self.assertEqual(len(self._sorted(self.industry).data["products"]), 0)
+        self.assertEqual(len(self._sorted(self.other_industry).data["products"]), 1)
+
+    def test_show_products_by_store_sees_deletes(self):
+        """
+        Test that a cached store list is not served after a product is deleted.
+        """
+        self._create("Laptop")
+        request = self.factory.get(f"/products/store/?store_owner_id={self.store_owner.id}")
+        self.assertEqual(len(show_products_by_store(request).data["products"]), 2)
+
+        self.product.delete()
+        request = self.factory.get(f"/products/store/?store_owner_id={self.store_owner.id}")
+        response = show_products_by_store(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["products"]), 1)
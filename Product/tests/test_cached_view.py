@@ -0,0 +1,282 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import TestCase, RequestFactory
+from MVP.testing import TemporaryMediaMixin
+from django.core.cache import cache, caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework import status
+from rest_framework.decorators import api_view
+from rest_framework.request import Request
+from rest_framework.response import Response
+from Product.models import Product, Industry
+from Product.views import industries_list_show, product_detail
+from Product.services import cache_service
+from Product.services.cache_service import (
+    CACHE_STATS,
+    cache_hit_rate,
+    cached_view,
+    etag_matches,
+    get_or_compute,
+    invalidate,
+    normalized_params,
+)
+from Document.models import Blog
+from Document.views import blog_dependent_on_product
+from AuthenticationSystem.models import CustomUser
+
+
+calls = []
+
+
+@api_view(["GET"])
+@cached_view("test_echo", tags=lambda request: [("echo", "all")], params=["a", "b"])
+def echo(request):
+    calls.append(request.query_params.dict())
+    return Response({"items": []}, status=200)
+
+
+class CachedViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        calls.clear()
+        CACHE_STATS.clear()
+        self.factory = RequestFactory()
+
+    def test_normalized_params(self):
+        """
+        Test that parameter order, whitespace and unknown params do not change the key.
+        """
+        first = Request(self.factory.get("/?b=2&a=1&utm=x"))
+        second = Request(self.factory.get("/?a= 1&b=2&c="))
+        self.assertEqual(
+            normalized_params(first, ["a", "b"]), normalized_params(second, ["a", "b"])
+        )
+
+    def test_empty_results_are_cache_hits(self):
+        """
+        Test that an empty list is served from the cache on the second call.
+        """
+        first = echo(self.factory.get("/?a=1&b=2"))
+        second = echo(self.factory.get("/?b=2&a=1&utm_source=mail"))
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache_hit_rate("test_echo"), 0.5)
+
+    def test_invalidate_tag(self):
+        """
+        Test that invalidating a tag makes the next call a miss.
+        """
+        echo(self.factory.get("/?a=1"))
+        invalidate(("echo", "all"))
+        self.assertEqual(echo(self.factory.get("/?a=1"))["X-Cache"], "MISS")
+        self.assertEqual(len(calls), 2)
+
+
+class SingleFlightTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_misses_compute_once(self):
+        """
+        Test that concurrent misses on one key run the computation only once.
+        """
+        computations = []
+
+        def compute():
+            computations.append(1)
+            time.sleep(0.2)
+            return "value"
+
+        results = []
+
+        def worker():
+            results.append(get_or_compute("hot_key", compute, 60))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(computations), 1)
+        self.assertEqual([value for value, _ in results], ["value"] * 5)
+
+    def test_expired_value_is_served_while_locked(self):
+        """
+        Test that an expired value is served as STALE while another worker holds the lock.
+        """
+        cache.set(
+            "hot_key",
+            {"value": "old", "expires": time.time() - 1, "delta": 0.01},
+            timeout=60,
+        )
+        cache.add("lock_hot_key", 1, timeout=10)
+        value, state = get_or_compute("hot_key", lambda: "new", 60)
+        self.assertEqual((value, state), ("old", "STALE"))
+
+        cache.delete("lock_hot_key")
+        value, state = get_or_compute("hot_key", lambda: "new", 60)
+        self.assertEqual((value, state), ("new", "MISS"))
+
+
+class StaleWhileRevalidateTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        cache.set(
+            "catalog_key",
+            {"value": "old", "expires": time.time() - 1, "delta": 0.01},
+            timeout=60,
+        )
+
+    def test_expired_value_served_and_refreshed_in_background(self):
+        """
+        Test that inside the stale window the old value is returned at once
+        and the refresh is handed to the background runner.
+        """
+        refreshes = []
+        with mock.patch.object(cache_service, "run_in_background", refreshes.append):
+            value, state = get_or_compute("catalog_key", lambda: "new", 60, stale_ttl=30)
+        self.assertEqual((value, state), ("old", "STALE"))
+        self.assertEqual(len(refreshes), 1)
+
+        # Run the refresh: the next read is a fresh hit
+        refreshes[0]()
+        self.assertEqual(get_or_compute("catalog_key", lambda: "newer", 60), ("new", "HIT"))
+
+    def test_past_hard_ttl_recomputes_inline(self):
+        """
+        Test that past the hard TTL the value is recomputed in the request.
+        """
+        cache.set(
+            "catalog_key",
+            {"value": "old", "expires": time.time() - 100, "delta": 0.01},
+            timeout=60,
+        )
+        value, state = get_or_compute("catalog_key", lambda: "new", 60, stale_ttl=30)
+        self.assertEqual((value, state), ("new", "MISS"))
+
+
+class CachedViewsIntegrationTest(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["reference"].clear()
+        self.factory = RequestFactory()
+        self.store_owner = CustomUser.objects.create(
+            username="store_owner", phone_number="+989123456789", user_type="store_owner"
+        )
+
+    def test_not_found_is_negatively_cached_until_created(self):
+        """
+        Test that a 404 is cached, and dropped once the product exists.
+        """
+        missing_id = 12345
+        response = product_detail(self.factory.get(f"/?product_id={missing_id}"))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = product_detail(self.factory.get(f"/?product_id={missing_id}"))
+        self.assertEqual(response["X-Cache"], "HIT")
+
+        Product.objects.create(
+            id=missing_id, title="Late", descriptions="x", store_owner=self.store_owner
+        )
+        response = product_detail(self.factory.get(f"/?product_id={missing_id}"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_zero_padded_id_follows_writes(self):
+        """
+        Test that '0<id>' reads the generation bumped for <id>, and a non-integer id is a 400.
+        """
+        product = Product.objects.create(
+            title="Phone", descriptions="x", store_owner=self.store_owner
+        )
+        request = f"/?product_id=0{product.id}"
+        response = product_detail(self.factory.get(request))
+        self.assertEqual(response.data["product_detail"]["title"], "Phone")
+
+        product.title = "Tablet"
+        product.save()
+        response = product_detail(self.factory.get(request))
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["product_detail"]["title"], "Tablet")
+
+        response = product_detail(self.factory.get("/?product_id=abc"))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_industries_list_follows_writes(self):
+        """
+        Test that creating an industry invalidates the cached list.
+        """
+        self.assertEqual(len(industries_list_show(self.factory.get("/")).data["industries"]), 0)
+        Industry.objects.create(name="Books")
+        self.assertEqual(len(industries_list_show(self.factory.get("/")).data["industries"]), 1)
+
+    def test_product_blogs_follow_blog_writes(self):
+        """
+        Test that a new blog shows up in the cached blog list of its product.
+        """
+        product = Product.objects.create(
+            title="Phone", descriptions="x", store_owner=self.store_owner
+        )
+        request = f"/?product_id={product.id}"
+        self.assertEqual(
+            len(blog_dependent_on_product(self.factory.get(request)).data["product_blogs"]), 0
+        )
+        Blog.objects.create(
+            title="Review",
+            description="x",
+            product=product,
+            content_file=SimpleUploadedFile("review.html", b"<p>x</p>"),
+        )
+        self.assertEqual(
+            len(blog_dependent_on_product(self.factory.get(request)).data["product_blogs"]), 1
+        )
+
+
+class ConditionalGetTest(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.store_owner = CustomUser.objects.create(
+            username="store_owner", phone_number="+989123456789", user_type="store_owner"
+        )
+        self.product = Product.objects.create(
+            title="Phone", descriptions="x", store_owner=self.store_owner
+        )
+
+    def _detail(self, **headers):
+        return product_detail(
+            self.factory.get(f"/?product_id={self.product.id}", **headers)
+        )
+
+    def test_etag_matches(self):
+        """
+        Test that If-None-Match lists are parsed and compared weakly.
+        """
+        request = self.factory.get("/", HTTP_IF_NONE_MATCH='"other", "abc"')
+        self.assertTrue(etag_matches(request, 'W/"abc"'))
+        self.assertFalse(etag_matches(self.factory.get("/"), 'W/"abc"'))
+
+    def test_not_modified_until_write(self):
+        """
+        Test that a matching If-None-Match gets an empty 304 without queries,
+        and that a product write changes the ETag.
+        """
+        etag = self._detail()["ETag"]
+        with self.assertNumQueries(0):
+            response = self._detail(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertIsNone(response.data)
+
+        self.product.title = "New phone"
+        self.product.save()
+        response = self._detail(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_no_etag_on_errors(self):
+        response = product_detail(self.factory.get("/?product_id=12345"))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(response.has_header("ETag"))
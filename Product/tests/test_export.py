@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+from unittest import mock
+
+from django.test import TestCase, RequestFactory
+from rest_framework import status
+from rest_framework.test import force_authenticate
+from Product.models import Industry, Product, ProductColor
+from Product.views import export_products
+from Product.services import export_service
+from Product.services.import_service import import_products
+from AuthenticationSystem.models import CustomUser
+
+
+class ProductExportTest(TestCase):
+    def setUp(self):
+        """
+        Set up a store owner with two products and another store's product.
+        """
+        self.factory = RequestFactory()
+        self.industry = Industry.objects.create(name="Technology")
+        self.red = ProductColor.objects.create(name="Red")
+        self.store_owner = CustomUser.objects.create(
+            username="store_owner", phone_number="+989123456789", user_type="store_owner"
+        )
+        other = CustomUser.objects.create(
+            username="other", phone_number="+989123456780", user_type="store_owner"
+        )
+        for number in range(2):
+            Product.objects.create(
+                title=f"Phone {number}",
+                descriptions="Test",
+                price=10,
+                length=1,
+                width=1,
+                color=self.red,
+                industry=self.industry,
+                store_owner=self.store_owner,
+            )
+        Product.objects.create(title="Other", descriptions="x", store_owner=other)
+
+    def _export(self, query=""):
+        request = self.factory.get(f"/products/export/{query}")
+        force_authenticate(request, user=self.store_owner)
+        with mock.patch(
+            "Product.views.get_user_from_token", return_value=(self.store_owner, None)
+        ):
+            response = export_products(request)
+        return response
+
+    def test_csv_export_is_streamed(self):
+        """
+        Test that the CSV export is streamed and holds only the owner's products.
+        """
+        response = self._export()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual([row["product_title"] for row in rows], ["Phone 0", "Phone 1"])
+        self.assertEqual(rows[0]["color"], "Red")
+        self.assertEqual(rows[0]["industry"], "Technology")
+
+        # The export can be imported back
+        result = import_products(io.BytesIO(content.encode()), "csv", self.store_owner)
+        self.assertEqual((result.created, result.errors), (2, []))
+
+    def test_jsonl_export_reads_in_chunks(self):
+        """
+        Test the JSONL export with rows fetched one at a time.
+        """
+        with mock.patch.object(export_service, "EXPORT_CHUNK_SIZE", 1):
+            response = self._export("?file_format=jsonl")
+            lines = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[1]["product_price"], "10.00")
+
+    def test_invalid_format(self):
+        self.assertEqual(
+            self._export("?file_format=xml").status_code, status.HTTP_400_BAD_REQUEST
+        )
@@ -0,0 +1,139 @@
+from io import StringIO
+
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase, RequestFactory
+from Product.models import Industry, Product, ProductColor, ProductFacetCount, TypeOfFile
+from Product.views import product_facets
+from Product.services.facet_service import bucket_range, price_bucket
+from AuthenticationSystem.models import CustomUser
+
+
+class ProductFacetsTest(TestCase):
+    def setUp(self):
+        """
+        Set up two industries, a color, a file type and a few products.
+        """
+        cache.clear()
+        caches["reference"].clear()
+        self.factory = RequestFactory()
+        self.tech = Industry.objects.create(name="Technology")
+        self.books = Industry.objects.create(name="Books")
+        self.red = ProductColor.objects.create(name="Red")
+        self.pdf = TypeOfFile.objects.create(name_of_type="PDF")
+        self.store_owner = CustomUser.objects.create(
+            username="store_owner", phone_number="+989123456789", user_type="store_owner"
+        )
+        self.phone = self._create(industry=self.tech, price=120, color=self.red)
+        self._create(industry=self.tech, price=5)
+        self._create(industry=self.books, price=20, product_type="Digital", type_of_file=self.pdf)
+
+    def _create(self, **fields):
+        return Product.objects.create(
+            title="Item", descriptions="Test", store_owner=self.store_owner, **fields
+        )
+
+    def _facets(self, query=""):
+        return product_facets(self.factory.get(f"/products/facets/{query}")).data
+
+    def _counts(self, data, facet):
+        return {item["value"]: item["count"] for item in data["facets"][facet]}
+
+    def test_price_buckets(self):
+        """
+        Test that prices fall into the right buckets.
+        """
+        self.assertEqual(price_bucket(0), 0)
+        self.assertEqual(price_bucket("9.99"), 0)
+        self.assertEqual(price_bucket(10), 1)
+        self.assertEqual(bucket_range(price_bucket(5000)), (1000, None))
+
+    def test_combination_without_industry_is_one_row(self):
+        """
+        Test that a combination with no industry / file type / color is stored once:
+        a second insert of it fails instead of creating a duplicate row.
+        """
+        ProductFacetCount.objects.all().delete()
+        self._create(price=20)
+        self._create(price=25)
+        row = ProductFacetCount.objects.get()
+        self.assertEqual((row.industry_id, row.color_id, row.count), (0, 0, 2))
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ProductFacetCount.objects.create(
+                product_type=row.product_type,
+                industry_id=row.industry_id,
+                type_of_file_id=row.type_of_file_id,
+                color_id=row.color_id,
+                price_bucket=row.price_bucket,
+            )
+        self.assertEqual(self._facets()["facets"]["industry"], [])
+
+    def test_counts_follow_product_writes(self):
+        """
+        Test that creating, updating, deactivating and deleting products moves the counts.
+        """
+        data = self._facets()
+        self.assertEqual(data["total"], 3)
+        self.assertEqual(self._counts(data, "industry"), {self.tech.id: 2, self.books.id: 1})
+        self.assertEqual(data["facets"]["industry"][0]["name"], "Technology")
+
+        self.phone.industry = self.books
+        self.phone.save()
+        data = self._facets()
+        self.assertEqual(self._counts(data, "industry"), {self.tech.id: 1, self.books.id: 2})
+
+        self.phone.active = False
+        self.phone.save()
+        self.assertEqual(self._facets()["total"], 2)
+
+        Product.objects.filter(industry=self.books).delete()
+        self.assertEqual(self._counts(self._facets(), "industry"), {self.tech.id: 1})
+
+    def test_uncounted_product_can_be_deactivated(self):
+        """
+        Test that a product missing from the counts (e.g. before the backfill) can
+        still be deactivated: its combination stays at 0 instead of failing the save.
+        """
+        ProductFacetCount.objects.update(count=0)
+        self.phone.active = False
+        self.phone.save()
+        self.assertFalse(ProductFacetCount.objects.filter(count__lt=0).exists())
+        self.assertEqual(self._facets()["total"], 0)
+
+    def test_facet_ignores_its_own_filter(self):
+        """
+        Test that a filter restricts the other facets but not its own.
+        """
+        data = self._facets(f"?industry={self.tech.id}")
+        self.assertEqual(data["total"], 2)
+        self.assertEqual(self._counts(data, "industry"), {self.tech.id: 2, self.books.id: 1})
+        self.assertEqual(self._counts(data, "product_type"), {"Physical": 2})
+        self.assertEqual(self._counts(data, "color"), {self.red.id: 1})
+
+    def test_constant_queries(self):
+        """
+        Test that the endpoint reads the aggregate only, whatever the number of products.
+        """
+        self._facets()  # Warm the reference names
+        for _ in range(10):
+            self._create(industry=self.tech, price=60)
+        with self.assertNumQueries(6):
+            self._facets(f"?industry={self.tech.id}")
+
+    def test_invalid_filter(self):
+        response = product_facets(self.factory.get("/products/facets/?price=99"))
+        self.assertEqual(response.status_code, 400)
+
+    def test_backfill_command(self):
+        """
+        Test that the backfill command rebuilds the same counts.
+        """
+        expected = sorted(ProductFacetCount.objects.values_list("product_type", "price_bucket", "count"))
+        ProductFacetCount.objects.all().delete()
+        call_command("backfill_product_facets", stdout=StringIO())
+        self.assertEqual(
+            sorted(ProductFacetCount.objects.values_list("product_type", "price_bucket", "count")),
+            expected,
+        )
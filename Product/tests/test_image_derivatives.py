@@ -0,0 +1,122 @@
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO, StringIO
+import multiprocessing
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from MVP.testing import TemporaryMediaMixin
+from PIL import Image
+from Product.models import Industry, MainImage, Product, ProductImage, ProductListing
+from Product.serializers import ProductListingSerializer
+from Product.services.image_derivatives import generate_derivatives
+from Product.services.image_processing import render_derivatives
+from Product.tasks import generate_image_derivatives
+from TaskQueue.models import Task
+from TaskQueue.queue import run_pending
+from AuthenticationSystem.models import CustomUser
+
+
+def png(width, height):
+    output = BytesIO()
+    Image.new("RGBA", (width, height), (200, 30, 30, 255)).save(output, "PNG")
+    return output.getvalue()
+
+
+class ImageDerivativesTest(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        """
+        Set up a product with one uploaded image as its main image.
+        """
+        cache.clear()
+        self.product = Product.objects.create(
+            title="Smartphone",
+            price=100,
+            industry=Industry.objects.create(name="Technology"),
+            store_owner=CustomUser.objects.create(
+                username="store_owner", phone_number="+989123456789", user_type="store_owner"
+            ),
+        )
+        self.image = ProductImage.objects.create(
+            product=self.product, image=SimpleUploadedFile("phone.png", png(2000, 1000))
+        )
+        MainImage.objects.create(product=self.product, product_image=self.image)
+
+    def test_render_keeps_aspect_ratio(self):
+        """
+        Test that every variant fits its box, keeps the aspect ratio and is never upscaled.
+        """
+        rendered = render_derivatives(png(2000, 1000))
+        self.assertEqual(rendered["thumbnail"][1:], (320, 160, "jpg"))
+        self.assertEqual(rendered["medium_webp"][1:], (1024, 512, "webp"))
+        self.assertEqual(Image.open(BytesIO(rendered["thumbnail_webp"][0])).format, "WEBP")
+
+        small = render_derivatives(png(100, 50))
+        self.assertEqual(small["medium_webp"][1:3], (100, 50))
+
+    def test_upload_queues_generation(self):
+        """
+        Test that a new image queues a task generating its variants, and that
+        the listing row and its serializer expose them.
+        """
+        task = Task.objects.get(name=generate_image_derivatives.task_name)
+        self.assertEqual(task.args, [self.image.pk])
+        with mock.patch("Product.tasks.generate_derivatives") as generate:
+            run_pending()
+        generate.assert_called_once_with(self.image.pk)
+
+        generate_derivatives(self.image.pk, pool=False)
+        self.image.refresh_from_db()
+        self.assertEqual(self.image.derivatives_status, ProductImage.DERIVATIVES_DONE)
+        self.assertEqual(self.image.derivatives["thumbnail"]["width"], 320)
+        self.assertTrue(default_storage.exists(self.image.derivatives["medium_webp"]["path"]))
+
+        listing = ProductListing.objects.get(pk=self.product.pk)
+        self.assertEqual(
+            listing.main_image_webp_url,
+            default_storage.url(self.image.derivatives["medium_webp"]["path"]),
+        )
+        self.assertEqual(
+            ProductListingSerializer(listing).data["main_image_thumbnail"],
+            default_storage.url(self.image.derivatives["thumbnail"]["path"]),
+        )
+
+    def test_unreadable_image_is_marked_failed(self):
+        """
+        Test that a file Pillow cannot read is marked failed and keeps no variants.
+        """
+        image = ProductImage.objects.create(
+            product=self.product, image=SimpleUploadedFile("fake.jpg", b"not an image")
+        )
+        generate_derivatives(image.pk, pool=False)
+        image.refresh_from_db()
+        self.assertEqual(image.derivatives_status, ProductImage.DERIVATIVES_FAILED)
+        self.assertEqual(image.derivatives, {})
+
+    def test_process_pool(self):
+        """
+        Test that the derivatives are rendered in a spawned worker process.
+        """
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            generate_derivatives(self.image.pk, pool=pool)
+        self.image.refresh_from_db()
+        self.assertEqual(
+            set(self.image.derivatives), {"thumbnail", "thumbnail_webp", "medium_webp"}
+        )
+
+    def test_backfill_command(self):
+        """
+        Test that the command processes the images without derivatives.
+        """
+        out = StringIO()
+        with self.settings(IMAGE_DERIVATIVE_WORKERS=1), mock.patch(
+            "Product.management.commands.generate_image_derivatives.generate_derivatives",
+            side_effect=lambda pk, pool: generate_derivatives(pk, pool=False),
+        ):
+            call_command("generate_image_derivatives", stdout=out)
+        self.assertIn("1 images processed", out.getvalue())
@@ -0,0 +1,74 @@
+from io import BytesIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from MVP.testing import TemporaryMediaMixin
+from PIL import Image
+from Product.models import MainImage, Product, ProductImage
+from Product.services.image_uploads import save_staged_images, stage_uploads
+from Product.tasks import save_product_images
+from TaskQueue.queue import run_pending
+from AuthenticationSystem.models import CustomUser
+
+
+def png(color):
+    output = BytesIO()
+    Image.new("RGB", (40, 20), color).save(output, "PNG")
+    return output.getvalue()
+
+
+class ProductImageUploadTest(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        """
+        Set up a product and two staged uploads.
+        """
+        cache.clear()
+        self.product = Product.objects.create(
+            title="Laptop",
+            descriptions="A gaming laptop",
+            store_owner=CustomUser.objects.create(
+                username="store_owner", phone_number="+989123456789", user_type="store_owner"
+            ),
+        )
+        self.staged_names = stage_uploads(
+            [
+                SimpleUploadedFile("front.png", png("red"), content_type="image/png"),
+                SimpleUploadedFile("back.png", png("blue"), content_type="image/png"),
+            ]
+        )
+
+    def test_images_are_saved_by_the_task(self):
+        """
+        Test that the task saves the staged uploads, the first one as the
+        main image, and deletes the staged files.
+        """
+        self.assertTrue(all(default_storage.exists(name) for name in self.staged_names))
+        save_product_images.enqueue(self.product.pk, self.staged_names)
+        with mock.patch("Product.tasks.generate_derivatives"):
+            run_pending()
+        self.assertEqual(self.product.images.count(), 2)
+        main_image = MainImage.objects.get(product=self.product).product_image
+        self.assertEqual(main_image.image.read(), png("red"))
+        self.assertFalse(any(default_storage.exists(name) for name in self.staged_names))
+
+    def test_run_after_commit_is_not_repeated(self):
+        """
+        Test that a retry of a run that already saved the images only deletes the staged files.
+        """
+        save_staged_images(self.product.pk, self.staged_names)
+        save_staged_images(self.product.pk, self.staged_names)
+        self.assertEqual(ProductImage.objects.count(), 2)
+        self.assertEqual(MainImage.objects.count(), 1)
+
+    def test_deleted_product_drops_the_uploads(self):
+        """
+        Test that the staged files of a product deleted before the run are removed.
+        """
+        product_id = self.product.pk
+        self.product.delete()
+        save_staged_images(product_id, self.staged_names)
+        self.assertFalse(ProductImage.objects.exists())
+        self.assertFalse(any(default_storage.exists(name) for name in self.staged_names))
@@ -0,0 +1,118 @@
+from io import BytesIO, StringIO
+import json
+import os
+import tempfile
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from Product.models import (
+    Industry,
+    Product,
+    ProductColor,
+    ProductFacetCount,
+    ProductListing,
+    TypeOfFile,
+)
+from Product.services.cache_service import INDUSTRY, get_generation
+from Product.services.import_service import import_products
+from AuthenticationSystem.models import CustomUser
+
+
+CSV = b"""product_title,product_price,description,product_type,length,width,color,size,type_of_file,industry
+Phone,100,A phone,physical,10,5,Red,,,Technology
+Ebook,5,,Digital,,,,12,PDF,Books
+Broken,abc,x,Physical,1,1,Red,,,
+Chair,20,A chair,Physical,1,1,Purple,,,
+"""
+
+
+class ProductImportTest(TestCase):
+    def setUp(self):
+        """
+        Set up the reference data and a store owner.
+        """
+        cache.clear()
+        self.tech = Industry.objects.create(name="Technology")
+        Industry.objects.create(name="Books")
+        ProductColor.objects.create(name="Red")
+        TypeOfFile.objects.create(name_of_type="PDF")
+        self.store_owner = CustomUser.objects.create(
+            username="store_owner", phone_number="+989123456789", user_type="store_owner"
+        )
+
+    def test_csv_import_reports_row_errors(self):
+        """
+        Test that valid rows are created and invalid ones reported with their row number.
+        """
+        generation = get_generation(INDUSTRY, self.tech.id)
+        result = import_products(BytesIO(CSV), "csv", self.store_owner, batch_size=1)
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual([error["row"] for error in result.errors], [3, 4])
+        self.assertIn("Invalid color", result.errors[1]["error"])
+        self.assertEqual(
+            set(Product.objects.values_list("title", flat=True)), {"Phone", "Ebook"}
+        )
+
+        # What the Product signals would have done
+        self.assertEqual(ProductListing.objects.get(title="Ebook").type_of_file_name, "PDF")
+        self.assertEqual(sum(ProductFacetCount.objects.values_list("count", flat=True)), 2)
+        self.assertNotEqual(get_generation(INDUSTRY, self.tech.id), generation)
+
+    def test_jsonl_import(self):
+        """
+        Test that JSONL lines are parsed one by one and bad lines reported.
+        """
+        row = {
+            "product_title": "Ebook",
+            "product_price": "9.5",
+            "product_type": "Digital",
+            "size": 3,
+            "type_of_file": "pdf",
+        }
+        stream = BytesIO(b"\n".join([json.dumps(row).encode(), b"{not json", b"[1]"]))
+        result = import_products(stream, "jsonl", self.store_owner)
+        self.assertEqual(result.created, 1)
+        self.assertEqual([error["row"] for error in result.errors], [2, 3])
+
+    def test_file_not_utf8_is_refused_before_insert(self):
+        """
+        Test that a cp1256 file is refused with the row of its first non-UTF-8 byte,
+        even past the first batch, and that nothing is inserted.
+        """
+        data = CSV + "کتاب,5,,Digital,,,,12,PDF,\n".encode("cp1256")
+        result = import_products(BytesIO(data), "csv", self.store_owner, batch_size=1)
+        self.assertEqual(result.created, 0)
+        self.assertEqual(result.file_error["row"], 5)
+        self.assertIn("not UTF-8", result.file_error["error"])
+        self.assertFalse(Product.objects.exists())
+
+    def test_csv_error_stops_at_its_row(self):
+        """
+        Test that a CSV syntax error stops the import at its row, keeping the rows before it.
+        """
+        data = CSV.replace(b"Chair", b"Chair" * 30000)  # Past csv.field_size_limit()
+        result = import_products(BytesIO(data), "csv", self.store_owner)
+        self.assertEqual(result.created, 2)
+        self.assertEqual(result.file_error["row"], 4)
+        self.assertIn("Invalid CSV", result.file_error["error"])
+
+    def test_command(self):
+        """
+        Test the import_products management command.
+        """
+        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as file:
+            file.write(CSV)
+        try:
+            output = StringIO()
+            call_command(
+                "import_products",
+                file.name,
+                store_owner=self.store_owner.id,
+                stdout=output,
+                stderr=StringIO(),
+            )
+        finally:
+            os.remove(file.name)
+        self.assertIn("2 products created, 2 rows rejected", output.getvalue())
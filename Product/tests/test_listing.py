@@ -0,0 +1,89 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, RequestFactory
+from MVP.testing import TemporaryMediaMixin
+from Product.models import Industry, MainImage, Product, ProductImage, ProductListing
+from Product.views import products_sort_show
+from AuthenticationSystem.models import CustomUser
+
+
+class ProductListingTest(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        """
+        Set up an industry, a store owner and one product.
+        """
+        cache.clear()
+        self.factory = RequestFactory()
+        self.industry = Industry.objects.create(name="Technology")
+        self.store_owner = CustomUser.objects.create(
+            username="store_owner", phone_number="+989123456789", user_type="store_owner"
+        )
+        self.product = Product.objects.create(
+            title="Smartphone",
+            descriptions="Test",
+            price=100,
+            industry=self.industry,
+            store_owner=self.store_owner,
+        )
+
+    def test_listing_follows_product_writes(self):
+        """
+        Test that the listing row is created, updated and deleted with its product.
+        """
+        listing = ProductListing.objects.get(pk=self.product.pk)
+        self.assertEqual(listing.title, "Smartphone")
+        self.assertEqual(listing.industry_name, "Technology")
+        self.assertEqual(listing.store_name, "store_owner")
+
+        self.product.title = "Phone"
+        self.product.save()
+        self.assertEqual(ProductListing.objects.get(pk=self.product.pk).title, "Phone")
+
+        self.product.delete()
+        self.assertFalse(ProductListing.objects.exists())
+
+    def test_listing_follows_main_image_and_renames(self):
+        """
+        Test that the main image URL and the industry name are copied to the row.
+        """
+        image = ProductImage.objects.create(
+            product=self.product, image=SimpleUploadedFile("phone.jpg", b"jpeg")
+        )
+        MainImage.objects.create(product=self.product, product_image=image)
+        self.industry.name = "Electronics"
+        self.industry.save()
+
+        listing = ProductListing.objects.get(pk=self.product.pk)
+        self.assertEqual(listing.main_image_url, image.image.url)
+        self.assertEqual(listing.industry_name, "Electronics")
+
+    def test_products_sort_show_reads_one_table(self):
+        """
+        Test that a product list is one query on the listing table, without joins.
+        """
+        request = self.factory.get(
+            f"/products/sort/?product_type=Physical&industry={self.industry.id}"
+        )
+        with self.assertNumQueries(1) as context:
+            response = products_sort_show(request)
+        sql = context.captured_queries[0]["sql"]
+        self.assertIn("Product_productlisting", sql)
+        self.assertNotIn("JOIN", sql)
+        self.assertEqual(response.data["products"][0]["industry_name"], "Technology")
+
+    def test_backfill_command(self):
+        """
+        Test that the backfill command rebuilds missing rows and drops stale ones.
+        """
+        ProductListing.objects.all().delete()
+        ProductListing.objects.create(
+            id=999, title="Gone", descriptions="", product_type="Physical",
+            created_at=self.product.created_at, store_owner=self.store_owner,
+        )
+        call_command("backfill_product_listings", batch_size=1, stdout=StringIO())
+        self.assertEqual(
+            list(ProductListing.objects.values_list("id", flat=True)), [self.product.pk]
+        )
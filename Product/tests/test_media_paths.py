@@ -0,0 +1,91 @@
+from io import StringIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from MVP.testing import TemporaryMediaMixin
+from Document.models import Blog
+from Product.models import Industry, MediaBlob, Product, ProductImage
+from Product.services.media_paths import is_sharded, shard, unsharded
+from AuthenticationSystem.models import CustomUser
+
+
+class MediaPathsTest(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        """
+        Set up a store owner and a product.
+        """
+        self.product = Product.objects.create(
+            title="Smartphone",
+            price=100,
+            industry=Industry.objects.create(name="Technology"),
+            store_owner=CustomUser.objects.create(
+                username="store_owner", phone_number="+989123456789", user_type="store_owner"
+            ),
+        )
+
+    def test_shard(self):
+        """
+        Test that names get two hashed subdirectories, derived from the file name or a digest.
+        """
+        name = shard("blog_content/post.pdf")
+        self.assertRegex(name, r"^blog_content/[0-9a-f]{2}/[0-9a-f]{2}/post\.pdf$")
+        self.assertEqual(shard("blog_content/post.pdf"), name)
+        self.assertEqual(shard("a/abcdef.jpg", "abcdef"), "a/ab/cd/abcdef.jpg")
+        self.assertTrue(is_sharded(name))
+        self.assertFalse(is_sharded("blog_content/post.pdf"))
+        self.assertEqual(unsharded(name), "blog_content/post.pdf")
+
+    def test_uploads_are_sharded(self):
+        """
+        Test that new product images and blog files are stored in hashed subdirectories.
+        """
+        image = ProductImage.objects.create(
+            product=self.product, image=SimpleUploadedFile("phone.jpg", b"bytes")
+        )
+        blog = Blog.objects.create(
+            title="Review",
+            description="Test",
+            product=self.product,
+            content_file=SimpleUploadedFile("review.pdf", b"pdf"),
+        )
+        self.assertTrue(is_sharded(image.image.name))
+        self.assertTrue(image.image.name.startswith("product_images/"))
+        self.assertTrue(is_sharded(blog.content_file.name))
+
+    def test_command_moves_flat_files(self):
+        """
+        Test that the command moves existing flat files, repoints the rows and
+        releases the old files.
+        """
+        old_blog_name = default_storage.save("blog_content/old.pdf", ContentFile(b"pdf"))
+        blog = Blog.objects.create(
+            title="Review", description="Test", product=self.product, content_file=old_blog_name
+        )
+        image = ProductImage.objects.create(
+            product=self.product, image=SimpleUploadedFile("phone.jpg", b"bytes")
+        )
+        # A blob stored flat, as before the fan-out
+        flat_name = unsharded(image.image.name)
+        default_storage.save(flat_name, ContentFile(b"bytes"))
+        MediaBlob.objects.filter(name=image.image.name).update(name=flat_name)
+        ProductImage.objects.filter(pk=image.pk).update(image=flat_name)
+
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("shard_media_files", batch_size=1, stdout=out)
+        self.assertIn("ProductImage.image: 1 files moved", out.getvalue())
+        self.assertIn("Blog.content_file: 1 files moved", out.getvalue())
+
+        blog.refresh_from_db()
+        image.refresh_from_db()
+        self.assertEqual(blog.content_file.name, shard(old_blog_name))
+        self.assertTrue(is_sharded(image.image.name))
+        self.assertFalse(default_storage.exists(old_blog_name))
+        self.assertFalse(default_storage.exists(flat_name))
+        self.assertEqual(
+            list(MediaBlob.objects.values_list("name", "references")),
+            [(image.image.name, 1)],
+        )
@@ -0,0 +1,163 @@
+from django.test import TestCase, RequestFactory
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.request import Request
+from Product.models import Product, Industry
+from Product.views import products_sort_show
+from Product.pagination import paginate_keyset, encode_cursor, decode_cursor
+from AuthenticationSystem.models import CustomUser
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        """
+        Create products, several of them sharing the same created_at value.
+        """
+        self.factory = RequestFactory()
+        self.industry = Industry.objects.create(name="Technology")
+        self.store_owner = CustomUser.objects.create(
+            username="store_owner", phone_number="+989123456789", user_type="store_owner"
+        )
+        for number in range(7):
+            Product.objects.create(
+                title=f"Product {number}",
+                descriptions="Test",
+                industry=self.industry,
+                store_owner=self.store_owner,
+            )
+        # Force ties so that the id column has to break them
+        Product.objects.filter(title__in=["Product 2", "Product 3", "Product 4"]).update(
+            created_at=timezone.now()
+        )
+        cache.clear()
+
+    def _request(self, path):
+        return Request(self.factory.get(path))
+
+    def test_cursor_round_trip(self):
+        """
+        Test that a cursor decodes back to typed values.
+        """
+        product = Product.objects.first()
+        cursor = encode_cursor([product.created_at, product.id])
+        self.assertEqual(
+            decode_cursor(cursor, Product, ["created_at", "id"]),
+            [product.created_at, product.id],
+        )
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-cursor", Product, ["created_at", "id"])
+
+    def test_pages_cover_every_row_once(self):
+        """
+        Test that walking all pages returns each product exactly once, newest first.
+        """
+        expected = list(
+            Product.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        seen = []
+        cursor = ""
+        while True:
+            page, error_response = paginate_keyset(
+                Product.objects.all(),
+                self._request(f"/products/?page_size=3&cursor={cursor}"),
+            )
+            self.assertIsNone(error_response)
+            seen.extend(product.id for product in page.items)
+            if page.next is None:
+                break
+            cursor = page.next
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor_returns_400(self):
+        """
+        Test that a malformed cursor is rejected.
+        """
+        page, error_response = paginate_keyset(
+            Product.objects.all(), self._request("/products/?cursor=abc")
+        )
+        self.assertIsNone(page)
+        self.assertEqual(error_response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_products_sort_show_is_paginated(self):
+        """
+        Test that products_sort_show returns a page and a next cursor.
+        """
+        request = self.factory.get(
+            f"/products/sort/?product_type=Physical&industry={self.industry.id}&page_size=5"
+        )
+        response = products_sort_show(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["products"]), 5)
+        self.assertIsNotNone(response.data["next"])
+
+        request = self.factory.get(
+            f"/products/sort/?product_type=Physical&industry={self.industry.id}"
+            f"&page_size=5&cursor={response.data['next']}"
+        )
+        response = products_sort_show(request)
+        self.assertEqual(len(response.data["products"]), 2)
+        self.assertIsNone(response.data["next"])
+
+
+class PriceSortTest(TestCase):
+    def setUp(self):
+        """
+        Create products with distinct and tied prices.
+        """
+        cache.clear()
+        self.factory = RequestFactory()
+        self.industry = Industry.objects.create(name="Technology")
+        self.store_owner = CustomUser.objects.create(
+            username="store_owner", phone_number="+989123456789", user_type="store_owner"
+        )
+        for number, price in enumerate([30, 10, 20, 20, 50, 5]):
+            Product.objects.create(
+                title=f"Product {number}",
+                descriptions="Test",
+                price=price,
+                industry=self.industry,
+                store_owner=self.store_owner,
+            )
+
+    def _walk(self, query):
+        """
+        Returns the prices of every page of products_sort_show, in order.
+        """
+        prices = []
+        cursor = ""
+        while True:
+            response = products_sort_show(
+                self.factory.get(
+                    f"/products/sort/?product_type=Physical&industry={self.industry.id}"
+                    f"&page_size=2{query}{cursor}"
+                )
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            prices += [int(float(item["price"])) for item in response.data["products"]]
+            if not response.data["next"]:
+                return prices
+            cursor = f"&cursor={response.data['next']}"
+
+    def test_sort_by_price(self):
+        """
+        Test that sort=price and sort=-price page through every product in price order.
+        """
+        self.assertEqual(self._walk("&sort=price"), [5, 10, 20, 20, 30, 50])
+        self.assertEqual(self._walk("&sort=-price"), [50, 30, 20, 20, 10, 5])
+
+    def test_price_range(self):
+        """
+        Test that min_price and max_price are inclusive, with every sort.
+        """
+        self.assertEqual(self._walk("&sort=price&min_price=10&max_price=30"), [10, 20, 20, 30])
+        self.assertEqual(sorted(self._walk("&min_price=20")), [20, 20, 30, 50])
+
+    def test_invalid_parameters(self):
+        for query in ("&sort=cheapest", "&min_price=abc", "&max_price=-1"):
+            response = products_sort_show(
+                self.factory.get(
+                    f"/products/sort/?product_type=Physical&industry={self.industry.id}{query}"
+                )
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,113 @@
+from django.test import TestCase, RequestFactory
+from MVP.testing import TemporaryMediaMixin
+from django.core.cache import cache, caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework import status
+from Product.models import Industry, MainImage, Product, ProductImage
+from Product.views import (
+    industries_list_show,
+    product_detail,
+    products_sort_show,
+    search_products,
+    show_products_by_store,
+)
+from AuthenticationSystem.models import CustomUser
+
+
+# Number of queries each endpoint may run on a cache miss, whatever the number of rows.
+# Raising one of them must be a deliberate change: a per-row query (N+1) fails these tests.
+QUERY_BUDGETS = {
+    "industries_list_show": 1,  # Industries
+    "products_sort_show": 1,  # Listing rows
+    "search_products": 2,  # Ranked ids from the full-text index, listing rows
+    "show_products_by_store": 2,  # Store owner, listing rows
+    "product_detail": 1,  # Product
+}
+
+
+class ProductQueryBudgetTest(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        """
+        Set up an industry and a store owner; products are added by each test.
+        """
+        self.factory = RequestFactory()
+        self.industry = Industry.objects.create(name="Technology")
+        self.store_owner = CustomUser.objects.create(
+            username="store_owner", phone_number="+989123456789", user_type="store_owner"
+        )
+
+    def add_products(self, count):
+        """
+        Adds products with images, so relations that are not eager-loaded show up.
+        """
+        for number in range(count):
+            Industry.objects.create(name=f"Industry {number}")
+            product = Product.objects.create(
+                title=f"Phone {number}",
+                descriptions="Test",
+                industry=self.industry,
+                store_owner=self.store_owner,
+            )
+            image = ProductImage.objects.create(
+                product=product, image=SimpleUploadedFile(f"phone{number}.jpg", b"jpeg")
+            )
+            MainImage.objects.create(product=product, product_image=image)
+
+    def assertQueryBudget(self, name, view, path, count):
+        """
+        Calls the view with an empty cache and checks the query count and result size.
+        """
+        cache.clear()
+        caches["reference"].clear()
+        with self.assertNumQueries(QUERY_BUDGETS[name]):
+            response = view(self.factory.get(path))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def check_constant(self, name, view, path, results):
+        """
+        Checks the budget with one row and with many rows.
+        """
+        for count in (1, 10):
+            self.add_products(count if count == 1 else count - 1)
+            response = self.assertQueryBudget(name, view, path, count)
+            self.assertEqual(len(results(response.data)), count)
+
+    def test_industries_list_show(self):
+        self.check_constant(
+            "industries_list_show",
+            industries_list_show,
+            "/",
+            lambda data: data["industries"][1:],  # Without the shared industry
+        )
+
+    def test_products_sort_show(self):
+        self.check_constant(
+            "products_sort_show",
+            products_sort_show,
+            f"/?product_type=Physical&industry={self.industry.id}",
+            lambda data: data["products"],
+        )
+
+    def test_search_products(self):
+        self.check_constant(
+            "search_products",
+            search_products,
+            "/?q=phone",
+            lambda data: data["products"],
+        )
+
+    def test_show_products_by_store(self):
+        self.check_constant(
+            "show_products_by_store",
+            show_products_by_store,
+            f"/?store_owner_id={self.store_owner.id}",
+            lambda data: data["products"],
+        )
+
+    def test_product_detail(self):
+        self.add_products(1)
+        product = Product.objects.get()
+        self.assertQueryBudget(
+            "product_detail", product_detail, f"/?product_id={product.id}", 1
+        )
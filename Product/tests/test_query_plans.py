@@ -0,0 +1,28 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from Product.management.commands.explain_product_queries import SQLITE_FULL_SCAN
+
+
+class QueryPlanTest(TestCase):
+    def test_full_scan_detection(self):
+        """
+        Test that only plain table scans are reported as full scans.
+        """
+        self.assertTrue(SQLITE_FULL_SCAN.search("2 0 0 SCAN Product_product"))
+        self.assertFalse(
+            SQLITE_FULL_SCAN.search("2 0 0 SCAN Product_product USING INDEX some_idx")
+        )
+        self.assertFalse(
+            SQLITE_FULL_SCAN.search("19 17 0 SCAN Product_product_fts VIRTUAL TABLE INDEX 0:M2")
+        )
+
+    def test_view_querysets_use_indexes(self):
+        """
+        Test that every Product view queryset is served by an index.
+        """
+        output = StringIO()
+        call_command("explain_product_queries", stdout=output)
+        self.assertNotIn("FULL SCAN", output.getvalue())
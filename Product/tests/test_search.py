@@ -0,0 +1,86 @@
+from django.test import TestCase, RequestFactory
+from rest_framework import status
+from Product.models import Product, Industry
+from Product.views import search_products
+from Product.services.search_service import (
+    build_fts5_query,
+    filter_by_text,
+    ranked_product_ids,
+)
+from AuthenticationSystem.models import CustomUser
+
+
+class SearchServiceTest(TestCase):
+    def setUp(self):
+        """
+        Set up a few products to search through.
+        """
+        self.factory = RequestFactory()
+        self.industry = Industry.objects.create(name="Technology")
+        self.store_owner = CustomUser.objects.create(
+            username="store_owner", phone_number="+989123456789", user_type="store_owner"
+        )
+        self.phone = self._create("Smartphone X", "A high-end phone with a great camera")
+        self.laptop = self._create("Gaming Laptop", "Fast laptop, works as a smartphone dock")
+        self.hidden = self._create("Smartphone Old", "Inactive listing", active=False)
+
+    def _create(self, title, descriptions, active=True):
+        return Product.objects.create(
+            title=title,
+            descriptions=descriptions,
+            industry=self.industry,
+            store_owner=self.store_owner,
+            active=active,
+        )
+
+    def test_build_fts5_query_quotes_tokens(self):
+        """
+        Test that user input is turned into quoted prefix terms.
+        """
+        self.assertEqual(build_fts5_query('smart "pho'), '"smart"* "pho"*')
+        self.assertEqual(build_fts5_query("  "), "")
+
+    def test_ranked_ids_prefers_title_matches(self):
+        """
+        Test that title matches rank above description matches and inactive products are skipped.
+        """
+        ids = ranked_product_ids("smartphone")
+        self.assertEqual(ids, [self.phone.id, self.laptop.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        """
+        Test that the index is kept in sync on save and delete.
+        """
+        self.laptop.title = "Gaming Notebook"
+        self.laptop.descriptions = "Fast notebook"
+        self.laptop.save()
+        self.assertEqual(ranked_product_ids("laptop"), [])
+        self.assertEqual(ranked_product_ids("notebook"), [self.laptop.id])
+
+        self.laptop.delete()
+        self.assertEqual(ranked_product_ids("notebook"), [])
+
+    def test_filter_by_text(self):
+        """
+        Test that filter_by_text narrows an existing queryset.
+        """
+        queryset = filter_by_text(Product.objects.filter(active=True), "smart")
+        self.assertEqual(
+            set(queryset.values_list("id", flat=True)), {self.phone.id, self.laptop.id}
+        )
+        self.assertFalse(filter_by_text(Product.objects.all(), "!!").exists())
+
+    def test_search_products_view(self):
+        """
+        Test the search_products view returns ranked results and validates input.
+        """
+        request = self.factory.get("/products/search/?q=camera")
+        response = search_products(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in response.data["products"]], [self.phone.id]
+        )
+
+        request = self.factory.get("/products/search/")
+        response = search_products(request)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,85 @@
+from unittest import mock
+
+from django.test import TestCase, RequestFactory
+from django.core.cache import cache, caches
+from Product.models import Industry, ProductColor
+from Product.views import industries_list_show
+from Product.services.tiered_cache import TwoTierCache
+from Product.services.reference_data import get_reference_object
+
+
+def make_tier(location, **options):
+    params = {"OPTIONS": {"L2": "default", "VERSION_CHECK_INTERVAL": 0, **options}}
+    return TwoTierCache(location, params)
+
+
+class TwoTierCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["reference"].clear()
+        self.factory = RequestFactory()
+
+    def test_l1_serves_without_l2(self):
+        """
+        Test that a value read once is served from local memory.
+        """
+        tier = make_tier("test_l1", VERSION_CHECK_INTERVAL=60)
+        tier.set("colors", ["red"])
+        with mock.patch.object(cache, "get", side_effect=AssertionError("L2 was read")):
+            self.assertEqual(tier.get("colors"), ["red"])
+
+    def test_clear_invalidates_other_workers(self):
+        """
+        Test that clear() on one worker drops the L1 entries of another one.
+        """
+        worker_a = make_tier("test_shared")
+        worker_a.set("colors", ["red"])
+        # A second worker: same L2, its own L1
+        worker_b = make_tier("test_shared")
+        worker_b._l1 = type(worker_a._l1)(16)
+        self.assertEqual(worker_b.get("colors"), ["red"])
+
+        worker_a.clear()
+        self.assertIsNone(worker_b.get("colors"))
+        self.assertIsNone(worker_a.get("colors"))
+
+    def test_l1_is_bounded(self):
+        """
+        Test that L1 evicts the least recently used entries.
+        """
+        tier = make_tier("test_lru", MAX_ENTRIES=2)
+        tier.set("a", 1)
+        tier.set("b", 2)
+        tier.get("a")
+        tier.set("c", 3)
+        self.assertEqual(list(tier._l1.entries), [tier.make_key("a"), tier.make_key("c")])
+        # Evicted from L1 only: still in L2
+        self.assertEqual(tier.get("b"), 2)
+
+    def test_reference_lookup_is_cached(self):
+        """
+        Test that reference objects and missing ones are looked up once, until a write.
+        """
+        ProductColor.objects.create(name="Red")
+        self.assertEqual(get_reference_object(ProductColor, name="Red").name, "Red")
+        self.assertIsNone(get_reference_object(ProductColor, name="Blue"))
+        with self.assertNumQueries(0):
+            get_reference_object(ProductColor, name="Red")
+            self.assertIsNone(get_reference_object(ProductColor, name="Blue"))
+
+        ProductColor.objects.create(name="Blue")
+        self.assertEqual(get_reference_object(ProductColor, name="Blue").name, "Blue")
+
+    def test_industries_list_from_l1(self):
+        """
+        Test that the industries list is served without queries, and follows writes.
+        """
+        Industry.objects.create(name="Books")
+        industries_list_show(self.factory.get("/"))
+        with self.assertNumQueries(0):
+            response = industries_list_show(self.factory.get("/"))
+        self.assertEqual(response["X-Cache"], "HIT")
+
+        Industry.objects.create(name="Music")
+        response = industries_list_show(self.factory.get("/"))
+        self.assertEqual(len(response.data["industries"]), 2)
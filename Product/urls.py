@@ -2,8 +2,13 @@ from django.urls import path
 from .views import (
     industries_list_show,
     products_sort_show,
+    search_products,
+    product_facets,
     product_detail,
+    product_batch,
     create_product,
+    import_products_file,
+    export_products,
     show_products_by_store,
     delete_product,
 )
@@ -13,10 +18,20 @@ urlpatterns = [
     path("industries/", industries_list_show, name="industries-list"),
     # Retrieve sorted products based on filters
     path("products/sort/", products_sort_show, name="products-sort"),
+    # Full-text search over product titles and descriptions
+    path("products/search/", search_products, name="products-search"),
+    # Product counts per facet value for the catalog filter sidebar
+    path("products/facets/", product_facets, name="products-facets"),
     # Retrieve details of a specific product
     path("product/detail/", product_detail, name="product-detail"),
+    # Retrieve the details of several products at once
+    path("products/batch/", product_batch, name="products-batch"),
     # Create a new product (store owners only)
     path("product/create/", create_product, name="create-product"),
+    # Create many products from a CSV/JSONL file (store owners only)
+    path("products/import/", import_products_file, name="import-products"),
+    # Download the catalog of the store owner as CSV/JSONL
+    path("products/export/", export_products, name="export-products"),
     # Retrieve all products of a specific store owner
     path("products/store/", show_products_by_store, name="store-products"),
     # Delete a product (only for store owners or admins)
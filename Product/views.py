@@ -8,21 +8,53 @@ from rest_framework.decorators import (
     permission_classes,
 )
 from uuid import UUID
+from django.http import StreamingHttpResponse
 from rest_framework.authentication import SessionAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
-from .models import Product, ProductImage, MainImage, ProductColor, TypeOfFile, Industry
+from .models import (
+    Product,
+    ProductColor,
+    TypeOfFile,
+    Industry,
+    ProductListing,
+)
 from AuthenticationSystem.models import CustomUser
 from .serializers import (
     ProductSerializerFull,
-    ProductSerializerShow,
+    ProductListingSerializer,
     IndustrySerializer,
 )
-from django.core import cache
+from .pagination import paginate_keyset
+from .services.cache_service import (
+    INDUSTRY,
+    PRODUCT,
+    STORE,
+    cached_view,
+    catalog_stale_ttl,
+    list_cache_timeout,
+    query_id,
+)
+from .services.facet_service import PRICE_BUCKETS, facet_counts
+from .services.batch_lookup import MAX_BATCH_SIZE, get_products
+from .services.export_service import CONTENT_TYPES, stream_export
+from .services.image_uploads import stage_uploads
+from .services.import_service import FORMATS, detect_format, import_products
+from .services.reference_data import REFERENCE_CACHE, get_reference_object
+from .services.search_service import ranked_product_ids
+from .queries import SORT_ORDERINGS, sorted_products_queryset, store_products_queryset
+from .tasks import save_product_images
 
 
 @api_view(["GET"])
+@cached_view(
+    "industries_list",
+    timeout=list_cache_timeout(),
+    params=[],
+    # Served from the in-process L1 of the two-tier cache, cleared on Industry writes
+    using=REFERENCE_CACHE,
+)
 def industries_list_show(request):
     """
     Retrieves and returns the list of all industries.
@@ -30,24 +62,39 @@ def industries_list_show(request):
     """
     industies_list = Industry.objects.all()
     serialized_data = IndustrySerializer(industies_list, many=True)
-    cache_key = "industries_list"  # A key for this cache
-    cached_data = cache.get(cache_key)  # Find cached_data deppent on cache_key
-    if cached_data:
-        return Response({"industries": cached_data}, status=200)
-
-    cache.set(
-        cache_key, serialized_data.data, timeout=600
-    )  # Set a cache with cache_key
 
     # Returns the serialized data of all industries with a status code 200 (OK)
     return Response({"industries": serialized_data.data}, status=200)
 
 
 @api_view(["GET"])
+@cached_view(
+    "products_sort",
+    timeout=list_cache_timeout(),
+    stale_while_revalidate=catalog_stale_ttl(),
+    # The industry generation changes on every product write in that industry
+    tags=lambda request: [(INDUSTRY, query_id(request, "industry"))],
+    etag=True,
+    params=[
+        "product_type",
+        "industry",
+        "title",
+        "type_of_file",
+        "min_price",
+        "max_price",
+        "sort",
+        "cursor",
+        "page_size",
+    ],
+)
 def products_sort_show(request):
     """
     Retrieves and returns a list of products filtered by product_type and industry.
     The query parameters 'product_type' and 'industry' are required.
+    'min_price'/'max_price' are optional inclusive price bounds and 'sort' is one of
+    'newest' (default), 'price' or '-price'.
+    Results are paginated by keyset: pass the returned 'next' value as 'cursor'
+    to get the following page, 'page_size' is optional.
     Returns a JSON response with the filtered list of products.
     """
     # Extract query parameters
@@ -55,95 +102,128 @@ def products_sort_show(request):
     industry = request.query_params.get("industry")
     title = request.query_params.get("title")
     type_of_file = request.query_params.get("type_of_file")
+    sort = request.query_params.get("sort") or "newest"
 
-    # Generate unique cache key based on parameters
-    cache_key = f"products_sort_{str(product_type).lower()}_{industry}_{title or ''}_{type_of_file or ''}"
-
-    # Check cache first
-    cached_data = cache.get(cache_key)
-    if cached_data:
-        return Response({"products": cached_data}, status=200)
-
-    # Original logic remains unchanged below
-    if all([product_type, industry, title]):
-        if str(product_type).lower() == "physical":
-            products_list = Product.objects.filter(
-                product_type=product_type,
-                industry=industry,
-                title__icontains=title,
-                active=True,
-            )
-            serialized_data = ProductSerializerShow(products_list, many=True)
-            # Cache results for 10 minutes
-            cache.set(cache_key, serialized_data.data, timeout=600)
-            return Response({"products": serialized_data.data}, status=200)
-
-        elif str(product_type).lower() == "digital":
-            products_list = Product.objects.filter(
-                product_type=product_type,
-                industry=industry,
-                type_of_file=type_of_file,
-                title__icontains=title,
-            )
-            serialized_data = ProductSerializerShow(products_list, many=True)
-            # Cache results for 10 minutes
-            cache.set(cache_key, serialized_data.data, timeout=600)
-            return Response({"products": serialized_data.data}, status=200)
-
-        else:
-            return Response(
-                {"error": "Invalid 'product_type'. Must be 'Physical' or 'Digital'."},
-                status=400,
-            )
+    if not (product_type and industry):
+        return Response(
+            {"error": "'product_type' and 'industry' are required parameters."},
+            status=400,
+        )
 
-    elif product_type and industry:
-        if str(product_type).lower() == "physical":
-            products_list = Product.objects.filter(
-                product_type=product_type, industry=industry
-            )
-            serialized_data = ProductSerializerShow(products_list, many=True)
-            # Cache results for 10 minutes
-            cache.set(cache_key, serialized_data.data, timeout=600)
-            return Response({"products": serialized_data.data}, status=200)
-
-        elif str(product_type).lower() == "digital":
-            products_list = Product.objects.filter(
-                product_type=product_type,
-                industry=industry,
-                type_of_file=type_of_file,
-            )
-            serialized_data = ProductSerializerShow(products_list, many=True)
-            # Cache results for 10 minutes
-            cache.set(cache_key, serialized_data.data, timeout=600)
-            return Response({"products": serialized_data.data}, status=200)
+    if sort not in SORT_ORDERINGS:
+        return Response(
+            {"error": "Invalid 'sort'. Must be one of: " + ", ".join(SORT_ORDERINGS)},
+            status=400,
+        )
 
-        else:
-            return Response(
-                {"error": "Invalid 'product_type'. Must be 'Physical' or 'Digital'."},
-                status=400,
-            )
-    else:
+    # Optional price bounds
+    prices = {}
+    for name in ("min_price", "max_price"):
+        value = request.query_params.get(name)
+        if not value:
+            continue
+        try:
+            prices[name] = Decimal(value)
+        except ArithmeticError:
+            return Response({"error": f"'{name}' must be a number."}, status=400)
+        if not prices[name].is_finite() or prices[name] < 0:
+            return Response({"error": f"'{name}' must be a number."}, status=400)
+
+    products_list = sorted_products_queryset(
+        product_type,
+        industry,
+        title=title,
+        type_of_file=type_of_file,
+        sort=sort,
+        **prices,
+    )
+    if products_list is None:
         return Response(
-            {"error": "'product_type' and 'industry' are required parameters."},
+            {"error": "Invalid 'product_type'. Must be 'Physical' or 'Digital'."},
             status=400,
         )
 
+    page, error_response = paginate_keyset(
+        products_list, request, ordering=SORT_ORDERINGS[sort]
+    )
+    if error_response:
+        return error_response
+
+    serialized_data = ProductListingSerializer(page.items, many=True)
+    return Response({"products": serialized_data.data, "next": page.next}, status=200)
+
+
+@api_view(["GET"])
+def search_products(request):
+    """
+    Full-text search over product titles and descriptions.
+    The query parameter 'q' is required, 'limit' is optional (default 20, max 100).
+    Returns active products ordered by relevance (title matches rank higher).
+    """
+    query = request.query_params.get("q", "").strip()
+    if not query:
+        return Response({"error": "'q' is a required parameter."}, status=400)
+
+    try:
+        limit = min(max(int(request.query_params.get("limit", 20)), 1), 100)
+    except ValueError:
+        return Response({"error": "'limit' must be an integer."}, status=400)
+
+    # Ranked ids come straight from the full-text index
+    product_ids = ranked_product_ids(query, limit=limit)
+
+    # Load the listing rows and keep the ranking order
+    products_by_id = ProductListing.objects.in_bulk(product_ids)
+    products_list = [products_by_id[pk] for pk in product_ids if pk in products_by_id]
+
+    serialized_data = ProductListingSerializer(products_list, many=True)
+    return Response({"products": serialized_data.data}, status=200)
+
+
+@api_view(["GET"])
+def product_facets(request):
+    """
+    Counts of active products per industry, product type, file type, color and
+    price bucket for the current filter, read from the ProductFacetCount aggregate.
+    Optional filters: 'product_type', 'industry', 'type_of_file', 'color' (ids)
+    and 'price' (bucket index). Each facet ignores its own filter.
+    """
+    filters = {}
+    product_type = request.query_params.get("product_type")
+    if product_type:
+        filters["product_type"] = product_type
+
+    for name in ("industry", "type_of_file", "color", "price"):
+        value = request.query_params.get(name)
+        if not value:
+            continue
+        try:
+            filters[name] = int(value)
+        except ValueError:
+            return Response({"error": f"'{name}' must be an integer."}, status=400)
+
+    if "price" in filters and not 0 <= filters["price"] < len(PRICE_BUCKETS):
+        return Response({"error": "Invalid 'price' bucket."}, status=400)
+
+    facets, total = facet_counts(filters)
+    return Response({"facets": facets, "total": total}, status=200)
+
 
 @api_view(["GET"])  # Defines a GET API endpoint
+@cached_view(
+    "product_detail",
+    timeout=list_cache_timeout(),
+    stale_while_revalidate=catalog_stale_ttl(),
+    tags=lambda request: [(PRODUCT, query_id(request, "product_id"))],
+    params=["product_id"],
+    etag=True,
+)
 def product_detail(request):
     product_id = request.query_params.get(
         "product_id"
     )  # Retrieves product_id from query parameters
 
     if product_id:
-        # Generate cache key
-        cache_key = f"product_detail_{product_id}"
-
-        # Check cache first
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response({"product_detail": cached_data}, status=200)
-
         product_detail = Product.objects.filter(
             id=product_id
         ).first()  # Fetches the product by ID
@@ -152,9 +232,6 @@ def product_detail(request):
                 product_detail
             )  # Serializes product data
 
-            # Cache the serialized data for 10 minutes
-            cache.set(cache_key, product_detail_serialized.data, timeout=600)
-
             return Response(
                 {"product_detail": product_detail_serialized.data}, status=200
             )  # Returns product details
@@ -168,6 +245,38 @@ def product_detail(request):
     )  # Returns error if product_id is missing
 
 
+@api_view(["GET"])
+def product_batch(request):
+    """
+    Returns the details of several products at once ('ids': comma-separated,
+    at most MAX_BATCH_SIZE), in the requested order. Unknown ids are returned
+    as {"id": <id>, "not_found": true}.
+    """
+    raw_ids = [value.strip() for value in request.query_params.get("ids", "").split(",")]
+    raw_ids = [value for value in raw_ids if value]
+    if not raw_ids:
+        return Response({"error": "ids is required"}, status=400)
+    if len(raw_ids) > MAX_BATCH_SIZE:
+        return Response(
+            {"error": f"At most {MAX_BATCH_SIZE} ids per request"}, status=400
+        )
+    try:
+        product_ids = [int(value) for value in raw_ids]
+    except ValueError:
+        return Response({"error": "ids must be integers"}, status=400)
+
+    products = get_products(product_ids)
+    return Response(
+        {
+            "products": [
+                data if data is not None else {"id": product_id, "not_found": True}
+                for product_id, data in zip(product_ids, products)
+            ]
+        },
+        status=200,
+    )
+
+
 def get_user_from_token(request):
     token = request.headers.get("Authorization")
     if not token:
@@ -234,10 +343,9 @@ def create_product(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Ensure the color exists in the database
-        try:
-            color = ProductColor.objects.get(name=color_name)
-        except ProductColor.DoesNotExist:
+        # Ensure the color exists (looked up through the reference data cache)
+        color = get_reference_object(ProductColor, name=color_name)
+        if color is None:
             return Response(
                 {"error": "Invalid color"},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -262,10 +370,9 @@ def create_product(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Ensure the file type exists in the database
-        try:
-            type_of_file = TypeOfFile.objects.get(name_of_type=type_of_file)
-        except TypeOfFile.DoesNotExist:
+        # Ensure the file type exists (looked up through the reference data cache)
+        type_of_file = get_reference_object(TypeOfFile, name_of_type=type_of_file)
+        if type_of_file is None:
             return Response(
                 {"error": "Invalid file type"},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -294,28 +401,131 @@ def create_product(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    # Save the first image and set it as the main image
-    first_image = ProductImage.objects.create(product=product, image=images[0])
-    MainImage.objects.create(product=product, product_image=first_image)
+    # The images are saved by a task, the first one as the main image:
+    # the request only copies the uploads to the staging directory
+    save_product_images.enqueue(product.pk, stage_uploads(images))
 
-    # Save the rest of the uploaded images (excluding the first one)
-    for image in images[1:]:
-        ProductImage.objects.create(product=product, image=image)
-
-    # Clear cache for product-related views
-    cache.delete("all_products_cache")  # Clear cache for all products
-    cache.delete(
-        f"product_detail_{product.id}"
-    )  # Clear cache for this product's detail
+    # Cached lists and details are invalidated by the Product signals
+    # (generation counters of the product's industry and store)
 
     return Response(ProductSerializerFull(product).data, status=status.HTTP_201_CREATED)
 
 
+# Maximum number of row errors returned by import_products_file
+MAX_REPORTED_ERRORS = 1000
+
+
+@api_view(["POST"])
+@authentication_classes([SessionAuthentication])
+@permission_classes([IsAuthenticated])
+def import_products_file(request):
+    """
+    Creates many products of the store owner from one CSV or JSONL file ('file').
+    'format' is optional ('csv' or 'jsonl', default from the file extension).
+    Invalid rows are skipped and reported with their row number.
+    """
+    user, error_response = get_user_from_token(request)
+    if error_response:
+        return error_response
+    if user.user_type != "store_owner":
+        return Response(
+            {"error": "Only store owners can create products"},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    uploaded_file = request.FILES.get("file")
+    if not uploaded_file:
+        return Response(
+            {"error": "file is required"}, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    file_format = request.data.get("format") or detect_format(uploaded_file.name)
+    if file_format not in FORMATS:
+        return Response(
+            {"error": "format must be one of: " + ", ".join(FORMATS)},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    # The file is parsed as a stream and inserted in batches
+    result = import_products(uploaded_file.file, file_format, store_owner=user)
+    if result.file_error:
+        # Nothing after this row was read; the rows before it were imported
+        return Response(
+            {**result.file_error, "created": result.created},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    return Response(
+        {
+            "created": result.created,
+            "error_count": len(result.errors),
+            "errors": result.errors[:MAX_REPORTED_ERRORS],
+        },
+        status=status.HTTP_200_OK,
+    )
+
+
 @api_view(["GET"])
+@authentication_classes([SessionAuthentication])
+@permission_classes([IsAuthenticated])
+def export_products(request):
+    """
+    Streams the catalog of the store owner as a CSV or JSONL file
+    ('file_format' query parameter, default 'csv'; 'format' is taken by DRF).
+    The file has the import columns, so it can be edited and imported back.
+    """
+    user, error_response = get_user_from_token(request)
+    if error_response:
+        return error_response
+    if user.user_type != "store_owner":
+        return Response(
+            {"error": "Only store owners can export products"},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    file_format = request.query_params.get("file_format", "csv")
+    if file_format not in FORMATS:
+        return Response(
+            {"error": "file_format must be one of: " + ", ".join(FORMATS)},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    # Rows are read in chunks and sent as they come: constant memory, whatever the store size
+    response = StreamingHttpResponse(
+        stream_export(user, file_format), content_type=CONTENT_TYPES[file_format]
+    )
+    response["Content-Disposition"] = f'attachment; filename="products.{file_format}"'
+    return response
+
+
+def is_store_owner_request(request):
+    """
+    Returns True if the request is made by the store owner given in 'store_owner_id'.
+    """
+    user, _ = get_user_from_token(request)
+    return bool(
+        user
+        and user.user_type == "store_owner"
+        and user.id == query_id(request, "store_owner_id")
+    )
+
+
+@api_view(["GET"])
+@cached_view(
+    "store_products",
+    timeout=list_cache_timeout(),
+    # The store generation changes on every product write of the store
+    tags=lambda request: [(STORE, query_id(request, "store_owner_id"))],
+    params=["store_owner_id", "cursor", "page_size"],
+    # The owner's own view includes inactive products, so it is cached separately
+    vary=lambda request: "owner" if is_store_owner_request(request) else "public",
+)
 def show_products_by_store(request):
     """
     API endpoint to retrieve all products of a specific store owner.
     Only users with user_type='store_owner' are considered valid store owners.
+    The owner sees inactive products too, everyone else only active ones.
+    Results are paginated by keyset ('cursor' and 'page_size' query parameters).
     """
     store_owner_id = request.query_params.get(
         "store_owner_id"
@@ -324,14 +534,6 @@ def show_products_by_store(request):
     if not store_owner_id:
         return Response({"error": "store_owner_id is required."}, status=400)
 
-    # Generate cache key
-    cache_key = f"store_products_{store_owner_id}"
-
-    # Check cache first
-    cached_data = cache.get(cache_key)
-    if cached_data:
-        return Response({"products": cached_data}, status=200)
-
     store_owner = CustomUser.objects.filter(
         id=store_owner_id, user_type="store_owner"
     ).first()
@@ -341,23 +543,24 @@ def show_products_by_store(request):
             {"error": "No store owner found with the given ID."}, status=404
         )
 
-    user = get_user_from_token(request)
-    if (user.user_type == "store_owner") and (user.id == UUID(store_owner_id)):
-        products_list = store_owner.products.all()
-    else:
-        products_list = store_owner.products.filter(active=True)
+    products_list = store_products_queryset(
+        store_owner, is_owner=is_store_owner_request(request)
+    )
+
+    page, error_response = paginate_keyset(products_list, request)
+    if error_response:
+        return error_response
 
-    if not products_list.exists():
+    # An empty first page means the store has no (visible) products at all
+    if not page.items and not request.query_params.get("cursor"):
         return Response(
             {"error": "No products found for this store owner."}, status=404
         )
 
-    serialized_products = ProductSerializerShow(products_list, many=True)
-
-    # Cache the serialized data for 10 minutes
-    cache.set(cache_key, serialized_products.data, timeout=600)
-
-    return Response({"products": serialized_products.data}, status=200)
+    serialized_products = ProductListingSerializer(page.items, many=True)
+    return Response(
+        {"products": serialized_products.data, "next": page.next}, status=200
+    )
 
 
 @api_view(["DELETE"])
@@ -386,16 +589,8 @@ def delete_product(request):
     target_product = Product.objects.filter(id=UUID(product_id)).first()
 
     # Delete the product from the database
+    # (the Product signals invalidate its detail and the industry/store lists)
     target_product.delete()
 
-    # Clear cache for product-related views
-    cache.delete("all_products_cache")  # Clear cache for all products
-    cache.delete(
-        f"product_detail_{product_id}"
-    )  # Clear cache for this product's detail
-    cache.delete(
-        f"store_products_{user.id}"
-    )  # Clear cache for the store owner's products
-
     # Return a successful response after deleting the product
     return Response({"product deleted"}, status=status.HTTP_200_OK)
@@ -0,0 +1,52 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from TaskQueue.queue import autodiscover
+from TaskQueue.worker import Worker
+
+
+class Command(BaseCommand):
+    help = "Runs the background tasks stored in the database (TaskQueue)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=getattr(settings, "TASK_WORKER_CONCURRENCY", 4),
+            help="Tasks run at the same time (threads).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=getattr(settings, "TASK_POLL_INTERVAL", 1.0),
+            help="Seconds between two looks at an empty queue.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no task is due instead of waiting for new ones.",
+        )
+
+    def handle(self, *args, **options):
+        autodiscover()
+        worker = Worker(
+            concurrency=max(options["concurrency"], 1),
+            poll_interval=options["poll_interval"],
+            burst=options["burst"],
+        )
+
+        # Ctrl+C / SIGTERM (deploys): finish the running tasks, then exit
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: worker.stop())
+
+        self.stdout.write(
+            f"Worker {worker.name} started with {worker.concurrency} threads"
+        )
+        worker.run()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{worker.processed} tasks run, {worker.failed} failed"
+            )
+        )
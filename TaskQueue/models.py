@@ -0,0 +1,43 @@
+from django.db import models
+from django.utils import timezone
+
+
+# A unit of background work, stored in the main database (no broker needed).
+# Workers (manage.py runworker) claim queued rows, run the registered function and
+# delete the row on success; failures are retried with exponential backoff, then kept
+# as failed with their last error. See TaskQueue/queue.py.
+class Task(models.Model):
+    QUEUED = "queued"
+    RUNNING = "running"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (FAILED, "Failed"),
+    ]
+
+    name = models.CharField(max_length=150)  # Registered name of the task function
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    priority = models.SmallIntegerField(default=0)  # Higher runs first
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)  # Runs started so far
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)  # Not claimed before this time
+    locked_until = models.DateTimeField(
+        null=True, blank=True
+    )  # A running task not finished by then is given to another worker
+    worker = models.CharField(max_length=100, blank=True)  # Worker running it
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+    class Meta:
+        indexes = [
+            # Claim query: next queued tasks, highest priority and oldest first
+            models.Index(
+                fields=["status", "-priority", "run_at", "id"], name="task_claim_idx"
+            ),
+        ]
@@ -0,0 +1,203 @@
+import importlib
+import importlib.util
+import logging
+import random
+import traceback
+from datetime import timedelta
+from functools import wraps
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+
+
+logger = logging.getLogger(__name__)
+
+# Registered task functions, by name
+_registry = {}
+
+
+def lock_timeout():
+    # Seconds a worker owns a task; a longer task is given to another worker
+    return getattr(settings, "TASK_LOCK_TIMEOUT", 60 * 5)
+
+
+def task(name=None, priority=0, max_attempts=5):
+    """
+    Registers a function as a task and adds an enqueue() method to it:
+
+        @task(priority=10)
+        def send_sms(phone_number, text): ...
+
+        send_sms.enqueue("+989123456789", "Hello")
+
+    Arguments must be JSON serializable: pass ids, not model instances.
+    """
+
+    def decorator(function):
+        task_name = name or f"{function.__module__}.{function.__qualname__}"
+        _registry[task_name] = function
+
+        @wraps(function)
+        def enqueue_task(*args, **kwargs):
+            return enqueue(task_name, args, kwargs, priority=priority, max_attempts=max_attempts)
+
+        function.task_name = task_name
+        function.enqueue = enqueue_task
+        return function
+
+    return decorator
+
+
+def enqueue(name, args=(), kwargs=None, priority=0, max_attempts=5, delay=0):
+    """
+    Stores a task to be run by a worker, in the current transaction: a task enqueued
+    by a write that is rolled back is never run, and workers only see it after commit.
+    """
+    return Task.objects.create(
+        name=name,
+        args=list(args),
+        kwargs=kwargs or {},
+        priority=priority,
+        max_attempts=max_attempts,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def autodiscover():
+    """
+    Imports the `tasks` module of every installed app, which registers its tasks.
+    """
+    for app_config in apps.get_app_configs():
+        if importlib.util.find_spec(f"{app_config.name}.tasks") is not None:
+            importlib.import_module(f"{app_config.name}.tasks")
+
+
+def retry_delay(attempts):
+    """
+    Seconds before the next attempt: exponential backoff with jitter, bounded.
+    """
+    base = getattr(settings, "TASK_RETRY_BASE_DELAY", 5)
+    maximum = getattr(settings, "TASK_RETRY_MAX_DELAY", 60 * 60)
+    delay = min(maximum, base * 2 ** (attempts - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def requeue_expired():
+    """
+    Gives the tasks of dead workers (running past their lock) back to the queue, or
+    marks them failed if that run was their last attempt. Returns the number re-queued.
+    """
+    expired = Task.objects.filter(status=Task.RUNNING, locked_until__lt=timezone.now())
+    expired.filter(attempts__gte=F("max_attempts")).update(
+        status=Task.FAILED,
+        worker="",
+        locked_until=None,
+        last_error="Lock expired: the worker died or ran past TASK_LOCK_TIMEOUT",
+    )
+    return expired.update(status=Task.QUEUED, worker="", locked_until=None)
+
+
+def claim(worker, limit=1):
+    """
+    Marks up to `limit` due tasks as running for `worker` and returns them.
+
+    On PostgreSQL the candidates are locked with SKIP LOCKED, so concurrent workers
+    never wait on each other. Elsewhere (SQLite) each candidate is taken with an
+    UPDATE that only matches while it is still queued, so a task is claimed once.
+    """
+    now = timezone.now()
+    due = Task.objects.filter(status=Task.QUEUED, run_at__lte=now).order_by(
+        "-priority", "run_at", "id"
+    )
+    claimed = {
+        "status": Task.RUNNING,
+        "worker": worker,
+        "locked_until": now + timedelta(seconds=lock_timeout()),
+        "attempts": F("attempts") + 1,
+    }
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(
+                due.select_for_update(skip_locked=True).values_list("id", flat=True)[:limit]
+            )
+            Task.objects.filter(id__in=ids).update(**claimed)
+    else:
+        ids = []
+        for task_id in due.values_list("id", flat=True)[: limit * 2]:
+            if Task.objects.filter(id=task_id, status=Task.QUEUED).update(**claimed):
+                ids.append(task_id)
+                if len(ids) == limit:
+                    break
+
+    return list(Task.objects.filter(id__in=ids).order_by("-priority", "run_at", "id"))
+
+
+def run_task(task_row):
+    """
+    Runs a claimed task. Success deletes it; a failure re-queues it with backoff,
+    or marks it failed once max_attempts runs have failed.
+    Returns True if the task succeeded.
+    """
+    function = _registry.get(task_row.name)
+    # The row is only changed while this claim still holds it: past its lock the
+    # task may have been re-queued and claimed again, maybe by the same worker
+    mine = Task.objects.filter(
+        pk=task_row.pk,
+        status=Task.RUNNING,
+        worker=task_row.worker,
+        locked_until=task_row.locked_until,
+    )
+    try:
+        if function is None:
+            raise LookupError(f"Unknown task {task_row.name!r}")
+        function(*task_row.args, **task_row.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning("Task %s failed (attempt %s)", task_row, task_row.attempts)
+        if function is not None and task_row.attempts < task_row.max_attempts:
+            mine.update(
+                status=Task.QUEUED,
+                worker="",
+                locked_until=None,
+                last_error=error,
+                run_at=timezone.now() + timedelta(seconds=retry_delay(task_row.attempts)),
+            )
+        else:
+            mine.update(status=Task.FAILED, locked_until=None, last_error=error)
+        return False
+
+    # Finished tasks are not kept: the table only holds pending and failed work
+    if not mine.delete()[0]:
+        logger.warning("Task %s finished after its lock expired", task_row)
+    return True
+
+
+def run_pending(worker="inline", limit=100):
+    """
+    Runs the due tasks in the current thread, up to `limit`; for tests and scripts.
+    Returns the number of tasks run.
+    """
+    count = 0
+    while count < limit:
+        tasks = claim(worker)
+        if not tasks:
+            break
+        run_task(tasks[0])
+        count += 1
+    return count
+
+
+def retry_failed(queryset=None):
+    """
+    Puts failed tasks back in the queue with a fresh attempt budget.
+    """
+    queryset = Task.objects.all() if queryset is None else queryset
+    return queryset.filter(status=Task.FAILED).update(
+        status=Task.QUEUED, attempts=0, run_at=timezone.now(), last_error=""
+    )
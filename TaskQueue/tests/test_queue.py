@@ -0,0 +1,187 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from AuthenticationSystem.models import CustomUser
+from AuthenticationSystem.tasks import send_temporary_code_sms
+from TaskQueue.models import Task
+from TaskQueue.queue import (
+    claim,
+    enqueue,
+    requeue_expired,
+    retry_delay,
+    retry_failed,
+    run_pending,
+    run_task,
+    task,
+)
+
+
+calls = []
+
+
+@task()
+def record(value):
+    calls.append(value)
+
+
+@task(max_attempts=2)
+def explode():
+    raise RuntimeError("boom")
+
+
+class TaskQueueTest(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_and_run(self):
+        """
+        Test that tasks run by priority, then in order, and are deleted once done.
+        """
+        record.enqueue("low")
+        enqueue(record.task_name, ["high"], priority=5)
+        record.enqueue("later")
+
+        self.assertEqual(run_pending(), 3)
+        self.assertEqual(calls, ["high", "low", "later"])
+        self.assertFalse(Task.objects.exists())
+
+    def test_delayed_task_waits(self):
+        """
+        Test that a task is not claimed before its run_at.
+        """
+        enqueue(record.task_name, ["soon"], delay=60)
+        self.assertEqual(claim("worker"), [])
+
+    def test_claim_is_exclusive(self):
+        """
+        Test that a claimed task is not given to another worker.
+        """
+        record.enqueue("once")
+        first = claim("worker-1")
+        self.assertEqual(len(first), 1)
+        self.assertEqual(first[0].attempts, 1)
+        self.assertEqual(claim("worker-2"), [])
+
+    @override_settings(TASK_RETRY_BASE_DELAY=10)
+    def test_failure_backoff_then_failed(self):
+        """
+        Test that a failed task is retried later, then kept as failed with its error.
+        """
+        explode.enqueue()
+        row = claim("worker")[0]
+        self.assertFalse(run_task(row))
+        row.refresh_from_db()
+        self.assertEqual(row.status, Task.QUEUED)
+        self.assertGreater(row.run_at, timezone.now() + timedelta(seconds=4))
+        self.assertIn("RuntimeError: boom", row.last_error)
+
+        Task.objects.update(run_at=timezone.now())
+        run_task(claim("worker")[0])
+        row.refresh_from_db()
+        self.assertEqual(row.status, Task.FAILED)
+        self.assertEqual(row.attempts, 2)
+
+        self.assertEqual(retry_failed(), 1)
+        self.assertEqual(Task.objects.get().attempts, 0)
+
+    @override_settings(TASK_RETRY_BASE_DELAY=10, TASK_RETRY_MAX_DELAY=60)
+    def test_retry_delay_is_exponential_and_bounded(self):
+        """
+        Test the backoff: base * 2^(attempt - 1), with jitter in its upper half, capped.
+        """
+        with mock.patch("TaskQueue.queue.random.uniform", side_effect=lambda a, b: b):
+            self.assertEqual([retry_delay(n) for n in (1, 2, 3, 4, 5)], [10, 20, 40, 60, 60])
+
+    def test_expired_lock_is_requeued(self):
+        """
+        Test that the task of a worker that died is given back to the queue.
+        """
+        record.enqueue("again")
+        claim("dead-worker")
+        Task.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(requeue_expired(), 1)
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(calls, ["again"])
+
+    def test_expired_last_attempt_is_failed(self):
+        """
+        Test that a task whose last attempt lost its lock is marked failed, not re-queued.
+        """
+        enqueue(record.task_name, ["once"], max_attempts=1)
+        claim("dead-worker")
+        Task.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(requeue_expired(), 0)
+        row = Task.objects.get()
+        self.assertEqual((row.status, row.worker), (Task.FAILED, ""))
+        self.assertIn("Lock expired", row.last_error)
+
+    def test_late_worker_leaves_the_new_claim_alone(self):
+        """
+        Test that a run finishing after its lock expired does not delete or update
+        the task claimed again, even by the same worker.
+        """
+        record.enqueue("slow")
+        late = claim("worker")[0]
+        Task.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        requeue_expired()
+        current = claim("worker")[0]
+
+        self.assertTrue(run_task(late))
+        self.assertEqual(Task.objects.get().status, Task.RUNNING)
+        self.assertTrue(run_task(current))
+        self.assertFalse(Task.objects.exists())
+
+        explode.enqueue()
+        late = claim("worker")[0]
+        Task.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        requeue_expired()
+        current = claim("worker")[0]
+        self.assertFalse(run_task(late))
+        row = Task.objects.get()
+        self.assertEqual((row.status, row.locked_until), (Task.RUNNING, current.locked_until))
+
+    def test_unknown_task_fails(self):
+        """
+        Test that a task whose function is not registered is marked failed at once.
+        """
+        enqueue("missing.task")
+        run_pending()
+        self.assertEqual(Task.objects.get().status, Task.FAILED)
+
+    def test_runworker_burst(self):
+        """
+        Test that runworker --burst runs the due tasks and exits.
+        """
+        record.enqueue("from worker")
+        out = StringIO()
+        call_command("runworker", burst=True, concurrency=1, stdout=out)
+        self.assertEqual(calls, ["from worker"])
+        self.assertIn("1 tasks run, 0 failed", out.getvalue())
+
+    def test_create_admin_queues_sms(self):
+        """
+        Test that creating an admin queues the SMS instead of calling the SMS gateway
+        in the request, and that the password is made by the task, not stored in it.
+        """
+        with mock.patch("AuthenticationSystem.tasks.send_temporary_code") as send:
+            user = CustomUser.objects.create_admin(
+                first_name="Ali",
+                last_name="Rezaei",
+                phone_number="+989123456789",
+                username="admin",
+            )
+            send.assert_not_called()
+            self.assertFalse(user.has_usable_password())
+            row = Task.objects.get(name=send_temporary_code_sms.task_name)
+            self.assertEqual(row.priority, 10)
+            self.assertEqual(row.kwargs, {"user_id": user.pk})
+            run_pending()
+
+        code = send.call_args.kwargs["code"]
+        user.refresh_from_db()
+        self.assertTrue(user.check_password(code))
+        send.assert_called_once_with(phone_number="+989123456789", code=code)
@@ -0,0 +1,62 @@
+import os
+import socket
+import threading
+
+from django.db import close_old_connections, connections
+
+from .queue import claim, requeue_expired, run_task
+
+
+class Worker:
+    """
+    Runs queued tasks in `concurrency` threads until stop() is called.
+    Threads suit the queued work (SMS, LLM and storage calls wait on the network);
+    CPU bound tasks hand their work to a process pool themselves.
+    """
+
+    def __init__(self, concurrency=4, poll_interval=1.0, burst=False, name=None):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.burst = burst  # Exit once the queue is empty instead of waiting for work
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = threading.Event()
+        self.processed = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def stop(self):
+        # Running tasks are finished, no new task is claimed
+        self.stopping.set()
+
+    def run(self):
+        if self.concurrency == 1:
+            self._loop(0)
+            return
+        threads = [
+            threading.Thread(target=self._loop, args=(index,), daemon=True)
+            for index in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _loop(self, index):
+        worker_name = f"{self.name}/{index}"
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                if index == 0:
+                    requeue_expired()
+                tasks = claim(worker_name)
+                if not tasks:
+                    if self.burst:
+                        break
+                    self.stopping.wait(self.poll_interval)
+                    continue
+                succeeded = run_task(tasks[0])
+                with self._lock:
+                    self.processed += 1
+                    self.failed += not succeeded
+        finally:
+            connections.close_all()